@@ -7,11 +7,15 @@ import asyncio
 import logging
 import json
 import uuid
+import hashlib
 import statistics
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict, Counter
 
+# Database
+import aiosqlite
+
 # Data analysis
 import pandas as pd
 import numpy as np
@@ -26,6 +30,13 @@ from bs4 import BeautifulSoup
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+# Optional GIL-free SQLite driver (aiosqlite-compatible API)
+try:
+    from rapsqlite import Connection as RapSQLiteConnection
+    RAPSQLITE_AVAILABLE = True
+except ImportError:
+    RAPSQLITE_AVAILABLE = False
+
 # Internal modules
 from modules.base import BaseModule
 import sys
@@ -35,9 +46,118 @@ from database_extensions import DatabaseExtensions
 
 logger = logging.getLogger(__name__)
 
+# Connection API the research writer relies on; rapsqlite builds missing any fall back to aiosqlite
+_RESEARCH_WRITER_API = ("__aenter__", "__aexit__", "execute", "executemany", "commit")
+
+# One-time storage tuning for market_research_data (WAL + lookup index; id is already the primary key)
+_RESEARCH_STORAGE_TUNING_SQL = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    CREATE INDEX IF NOT EXISTS idx_mrd_niche_date ON market_research_data(niche_id, research_date);
+"""
+
+# Content-addressed store for serialized report columns. Deduplication is per whole
+# column payload: two reports share a blob only when a column serializes identically.
+_BLOB_STORE_SQL = "CREATE TABLE IF NOT EXISTS blob_store (sha256 TEXT PRIMARY KEY, payload TEXT NOT NULL)"
+
+# JSON columns holding this prefix reference a deduplicated payload in blob_store
+_BLOB_REF_PREFIX = "sha256:"
+
+# market_research_data columns that hold blob_store references
+_BLOB_REF_COLUMNS = (
+    "market_size_data", "audience_demographics", "behavior_patterns", "content_preferences",
+    "monetization_data", "growth_trends", "competitive_landscape_snapshot", "recommendations"
+)
+
+# Delete blobs no research row references any more (left behind by replaced reports)
+_PRUNE_BLOB_STORE_SQL = (
+    "DELETE FROM blob_store WHERE ? || sha256 NOT IN ("
+    + " UNION ".join(f"SELECT {column} FROM market_research_data" for column in _BLOB_REF_COLUMNS)
+    + ")"
+)
+
+# Research columns loaded into the cache, in report order
+_CACHED_RESEARCH_COLUMNS = (
+    "market_size_data", "audience_demographics", "content_preferences", "monetization_data",
+    "growth_trends", "competitive_landscape_snapshot", "recommendations"
+)
+
+def _resolved_column(index: int, column: str) -> str:
+    """SQL for a column with its blob_store reference (if any) replaced by the payload"""
+    return (
+        f"CASE WHEN substr(m.{column}, 1, {len(_BLOB_REF_PREFIX)}) = '{_BLOB_REF_PREFIX}' "
+        f"THEN b{index}.payload ELSE m.{column} END"
+    )
+
+# Newer research rows with blob references resolved by one indexed join per column,
+# so the load never binds a variable per referenced blob
+_LOAD_RESEARCH_SQL = (
+    "SELECT m.id, m.niche_id, m.research_date, "
+    + ", ".join(_resolved_column(i, column) for i, column in enumerate(_CACHED_RESEARCH_COLUMNS))
+    + ", m.data_quality_score FROM market_research_data m "
+    + " ".join(
+        f"LEFT JOIN blob_store b{i} ON b{i}.sha256 = substr(m.{column}, {len(_BLOB_REF_PREFIX) + 1})"
+        for i, column in enumerate(_CACHED_RESEARCH_COLUMNS)
+    )
+    + " WHERE m.research_date > ? ORDER BY m.research_date"
+)
+
+def _serialize_report(research_report: Dict[str, Any]) -> Tuple[str, ...]:
+    """Serialize the JSON columns of a research report"""
+    get = research_report.get
+    dumps = json.dumps
+    audience = get("audience_analysis", {})
+    return (
+        dumps(get("market_size_analysis", {})),
+        dumps(audience),
+        dumps(audience.get("behavioral_patterns", {})),
+        dumps(get("content_analysis", {})),
+        dumps(get("monetization_analysis", {})),
+        dumps(get("growth_analysis", {})),
+        dumps(get("competitive_analysis", {})),
+        dumps(get("strategic_recommendations", []))
+    )
+
+def _report_exceeds(research_report: Dict[str, Any], limit: int) -> bool:
+    """Rough check whether a report serializes to more than limit bytes
+    
+    Walks the report tallying string lengths and a fixed cost per other value,
+    stopping as soon as the budget is spent, so the check itself stays cheap.
+    """
+    budget = limit
+    stack = [research_report]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            budget -= sum(len(key) + 4 if isinstance(key, str) else 8 for key in value)
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            budget -= len(value) + 2
+            stack.extend(value)
+        elif isinstance(value, str):
+            budget -= len(value) + 2
+        else:
+            budget -= 8
+        if budget < 0:
+            return True
+    return False
+
+def _intern_report_blobs(research_report: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Serialize a research report into content-addressed (sha256, payload) pairs"""
+    sha256 = hashlib.sha256
+    return [
+        (sha256(payload.encode("utf-8")).hexdigest(), payload)
+        for payload in _serialize_report(research_report)
+    ]
+
 class MarketResearchEngine(BaseModule):
     """Automated market research system for YouTube niches"""
     
+    # Database paths already tuned (or whose tuning failed) in this process
+    _tuned_db_paths = set()
+    
     def __init__(self):
         super().__init__()
         self.module_name = "market_research"
@@ -126,10 +246,34 @@ class MarketResearchEngine(BaseModule):
         
         # Database extensions
         self.db_ext = None
+        self.use_rapsqlite = False
+        # Reports estimated above this size are serialized in an executor
+        self.executor_serialize_threshold = 100 * 1024  # bytes
         
         # Research cache
         self.research_cache = {}
         self.last_research_update = None
+        self._cache_watermark: Optional[str] = None  # max research_date cached
+        
+        # Subscribers notified with (topic, niche_id) after successful database commits
+        self._research_subscribers: List[Callable[[str, str], None]] = []
+    
+    def subscribe_research_events(self, callback: Callable[[str, str], None]):
+        """Call callback(topic, niche_id) whenever research is committed"""
+        self._research_subscribers.append(callback)
+    
+    def unsubscribe_research_events(self, callback: Callable[[str, str], None]):
+        """Stop notifying a research event subscriber"""
+        if callback in self._research_subscribers:
+            self._research_subscribers.remove(callback)
+    
+    def _publish_research_event(self, topic: str, niche_id: str):
+        """Notify subscribers synchronously, so nothing queues up between commits"""
+        for callback in list(self._research_subscribers):
+            try:
+                callback(topic, niche_id)
+            except Exception as e:
+                logger.error(f"Research event subscriber failed for {niche_id}: {str(e)}")
     
     async def _setup_module(self):
         """Initialize the market research engine"""
@@ -139,6 +283,15 @@ class MarketResearchEngine(BaseModule):
             # Initialize database extensions
             self.db_ext = DatabaseExtensions()
             
+            # rapsqlite research writes are opt-in, and only used when installed
+            self.use_rapsqlite = RAPSQLITE_AVAILABLE and self.config.get("use_rapsqlite", False)
+            if self.use_rapsqlite:
+                logger.info("Using rapsqlite for market research writes")
+            
+            # Research writes require the blob store; tuning is best effort
+            await self._ensure_blob_store()
+            await self._tune_research_storage()
+            
             # Initialize YouTube API
             youtube_api_key = self.config.get("youtube_api_key")
             if youtube_api_key:
@@ -157,6 +310,38 @@ class MarketResearchEngine(BaseModule):
             logger.error(f"Failed to initialize Market Research Engine: {str(e)}")
             raise
     
+    async def _ensure_blob_store(self):
+        """Create blob_store, then drop blobs orphaned by replaced reports"""
+        async with aiosqlite.connect(self.db_ext.db_path) as db:
+            await db.execute(_BLOB_STORE_SQL)
+            await db.commit()
+            
+            try:
+                cursor = await db.execute(_PRUNE_BLOB_STORE_SQL, (_BLOB_REF_PREFIX,))
+                await db.commit()
+                if cursor.rowcount > 0:
+                    logger.info(f"Pruned {cursor.rowcount} unreferenced market research blobs")
+            except Exception as e:
+                logger.warning(f"Failed to prune market research blobs: {str(e)}")
+    
+    async def _tune_research_storage(self):
+        """Apply PRAGMA tuning and indexes for market_research_data once per process"""
+        db_path = self.db_ext.db_path
+        if db_path in MarketResearchEngine._tuned_db_paths:
+            return
+        
+        # Attempt once per process: tuning is optional, so a failure is not retried on every init
+        MarketResearchEngine._tuned_db_paths.add(db_path)
+        try:
+            async with aiosqlite.connect(db_path) as db:
+                await db.executescript(_RESEARCH_STORAGE_TUNING_SQL)
+                await db.commit()
+            
+            logger.info("Market research storage tuned (WAL, indexes)")
+            
+        except Exception as e:
+            logger.warning(f"Failed to tune market research storage, continuing untuned: {str(e)}")
+    
     async def _initialize_research_apis(self):
         """Initialize external research APIs and data sources"""
         try:
@@ -217,29 +402,29 @@ class MarketResearchEngine(BaseModule):
             )
             
             # Step 6: Growth Trends and Future Projections
-            growth_analysis = await self._analyze_growth_trends_and_projections(
+            growth_analysis = self._analyze_growth_trends_and_projections(
                 niche_id, config
             )
             
             # Step 7: Threats and Challenges Analysis
-            risk_analysis = await self._analyze_threats_and_challenges(
+            risk_analysis = self._analyze_threats_and_challenges(
                 niche_id, config
             )
             
             # Step 8: Custom Research Questions (if provided)
             custom_insights = {}
             if custom_research_questions:
-                custom_insights = await self._research_custom_questions(
+                custom_insights = self._research_custom_questions(
                     niche_id, custom_research_questions, config
                 )
             
             # Step 9: Cross-Platform Market Analysis
-            cross_platform_analysis = await self._analyze_cross_platform_market(
+            cross_platform_analysis = self._analyze_cross_platform_market(
                 niche_id, config
             )
             
             # Step 10: Emerging Opportunities Analysis
-            opportunity_analysis = await self._identify_emerging_opportunities(
+            opportunity_analysis = self._identify_emerging_opportunities(
                 niche_id, config, market_size_data, competitive_analysis
             )
             
@@ -251,7 +436,7 @@ class MarketResearchEngine(BaseModule):
                 "research_date": research_start,
                 "geographic_focus": geographic_focus or ["global"],
                 "demographic_segments": demographic_segments or ["all"],
-                "executive_summary": await self._generate_executive_summary({
+                "executive_summary": self._generate_executive_summary({
                     "market_size": market_size_data,
                     "audience": audience_analysis,
                     "competition": competitive_analysis,
@@ -267,13 +452,13 @@ class MarketResearchEngine(BaseModule):
                 "cross_platform_analysis": cross_platform_analysis,
                 "opportunity_analysis": opportunity_analysis,
                 "custom_insights": custom_insights,
-                "strategic_recommendations": await self._generate_strategic_recommendations({
+                "strategic_recommendations": self._generate_strategic_recommendations({
                     "market": market_size_data,
                     "audience": audience_analysis,
                     "competition": competitive_analysis,
                     "opportunities": opportunity_analysis
                 }),
-                "action_plan": await self._create_action_plan({
+                "action_plan": self._create_action_plan({
                     "opportunities": opportunity_analysis,
                     "risks": risk_analysis,
                     "market": market_size_data
@@ -300,11 +485,10 @@ class MarketResearchEngine(BaseModule):
                 }
             }
             
-            # Save research to database
-            await self._save_research_to_database(research_report)
-            
-            # Update research cache
-            self._update_research_cache(research_report)
+            # Save research to database; only cache and publish committed reports
+            if await self._save_research_to_database(research_report):
+                self._update_research_cache(research_report)
+                self._publish_research_event("research", niche_id)
             
             await self.log_activity("market_research_completed", {
                 "niche_id": niche_id,
@@ -338,37 +522,37 @@ class MarketResearchEngine(BaseModule):
             )
             
             # Cross-platform market estimation
-            cross_platform_market = await self._estimate_cross_platform_market(
+            cross_platform_market = self._estimate_cross_platform_market(
                 niche_name, youtube_market
             )
             
             # Total Addressable Market (TAM) calculation
-            tam_analysis = await self._calculate_total_addressable_market(
+            tam_analysis = self._calculate_total_addressable_market(
                 youtube_market, cross_platform_market
             )
             
             # Serviceable Addressable Market (SAM) calculation
-            sam_analysis = await self._calculate_serviceable_addressable_market(
+            sam_analysis = self._calculate_serviceable_addressable_market(
                 tam_analysis, geographic_focus
             )
             
             # Serviceable Obtainable Market (SOM) calculation
-            som_analysis = await self._calculate_serviceable_obtainable_market(
+            som_analysis = self._calculate_serviceable_obtainable_market(
                 sam_analysis, config
             )
             
             # Market growth rate analysis
-            growth_rate_analysis = await self._analyze_market_growth_rate(
+            growth_rate_analysis = self._analyze_market_growth_rate(
                 niche_name, config
             )
             
             # Market maturity assessment
-            maturity_assessment = await self._assess_market_maturity(
+            maturity_assessment = self._assess_market_maturity(
                 youtube_market, growth_rate_analysis
             )
             
             # Revenue potential analysis
-            revenue_potential = await self._analyze_revenue_potential(
+            revenue_potential = self._analyze_revenue_potential(
                 som_analysis, niche_name
             )
             
@@ -387,10 +571,10 @@ class MarketResearchEngine(BaseModule):
                     "growth_rate": growth_rate_analysis.get("annual_growth_rate", 0),
                     "market_stage": maturity_assessment.get("stage", "unknown")
                 },
-                "geographic_distribution": await self._analyze_geographic_market_distribution(
+                "geographic_distribution": self._analyze_geographic_market_distribution(
                     youtube_market, geographic_focus
                 ),
-                "market_concentration": await self._analyze_market_concentration(
+                "market_concentration": self._analyze_market_concentration(
                     youtube_market
                 )
             }
@@ -412,47 +596,47 @@ class MarketResearchEngine(BaseModule):
             niche_name = niche_info.get("niche_name", "unknown")
             
             # Demographic analysis
-            demographic_data = await self._analyze_audience_demographics(
+            demographic_data = self._analyze_audience_demographics(
                 niche_name, config, demographic_segments
             )
             
             # Behavioral pattern analysis
-            behavioral_data = await self._analyze_audience_behavior_patterns(
+            behavioral_data = self._analyze_audience_behavior_patterns(
                 niche_name, config
             )
             
             # Content consumption patterns
-            consumption_patterns = await self._analyze_content_consumption_patterns(
+            consumption_patterns = self._analyze_content_consumption_patterns(
                 niche_name, config
             )
             
             # Engagement behavior analysis
-            engagement_patterns = await self._analyze_engagement_behavior(
+            engagement_patterns = self._analyze_engagement_behavior(
                 niche_name, config
             )
             
             # Platform usage patterns
-            platform_usage = await self._analyze_platform_usage_patterns(
+            platform_usage = self._analyze_platform_usage_patterns(
                 niche_name, config
             )
             
             # Purchase intent and conversion analysis
-            purchase_behavior = await self._analyze_purchase_behavior(
+            purchase_behavior = self._analyze_purchase_behavior(
                 niche_name, config
             )
             
             # Audience segmentation
-            audience_segments = await self._perform_audience_segmentation(
+            audience_segments = self._perform_audience_segmentation(
                 demographic_data, behavioral_data, consumption_patterns
             )
             
             # Persona development
-            audience_personas = await self._develop_audience_personas(
+            audience_personas = self._develop_audience_personas(
                 audience_segments, demographic_data, behavioral_data
             )
             
             # Journey mapping
-            customer_journey = await self._map_customer_journey(
+            customer_journey = self._map_customer_journey(
                 niche_name, behavioral_data, engagement_patterns
             )
             
@@ -472,7 +656,7 @@ class MarketResearchEngine(BaseModule):
                     "engagement_drivers": engagement_patterns.get("primary_drivers", []),
                     "conversion_factors": purchase_behavior.get("conversion_drivers", [])
                 },
-                "targeting_recommendations": await self._generate_targeting_recommendations(
+                "targeting_recommendations": self._generate_targeting_recommendations(
                     audience_segments, demographic_data
                 )
             }
@@ -493,40 +677,40 @@ class MarketResearchEngine(BaseModule):
             niche_name = niche_info.get("niche_name", "unknown")
             
             # Identify key competitors
-            competitors = await self._identify_key_competitors(niche_name, config)
+            competitors = self._identify_key_competitors(niche_name, config)
             
             # Competitive benchmarking
-            benchmarking_data = await self._perform_competitive_benchmarking(
+            benchmarking_data = self._perform_competitive_benchmarking(
                 competitors, config
             )
             
             # Market positioning analysis
-            positioning_analysis = await self._analyze_market_positioning(
+            positioning_analysis = self._analyze_market_positioning(
                 competitors, benchmarking_data
             )
             
             # Competitive strategy analysis
-            strategy_analysis = await self._analyze_competitive_strategies(
+            strategy_analysis = self._analyze_competitive_strategies(
                 competitors, config
             )
             
             # Market share analysis
-            market_share_analysis = await self._analyze_market_share(
+            market_share_analysis = self._analyze_market_share(
                 competitors, benchmarking_data
             )
             
             # Competitive advantages and weaknesses
-            swot_analysis = await self._perform_competitive_swot_analysis(
+            swot_analysis = self._perform_competitive_swot_analysis(
                 competitors, benchmarking_data
             )
             
             # Competitive gaps and opportunities
-            gap_analysis = await self._identify_competitive_gaps(
+            gap_analysis = self._identify_competitive_gaps(
                 competitors, positioning_analysis
             )
             
             # Threat assessment
-            threat_assessment = await self._assess_competitive_threats(
+            threat_assessment = self._assess_competitive_threats(
                 competitors, strategy_analysis
             )
             
@@ -545,7 +729,7 @@ class MarketResearchEngine(BaseModule):
                     "key_threats": threat_assessment.get("high_priority_threats", []),
                     "opportunities": gap_analysis.get("high_opportunity_gaps", [])
                 },
-                "competitive_recommendations": await self._generate_competitive_recommendations(
+                "competitive_recommendations": self._generate_competitive_recommendations(
                     gap_analysis, positioning_analysis, threat_assessment
                 )
             }
@@ -566,31 +750,31 @@ class MarketResearchEngine(BaseModule):
             niche_name = niche_info.get("niche_name", "unknown")
             
             # Content format analysis
-            format_analysis = await self._analyze_content_formats(niche_name, config)
+            format_analysis = self._analyze_content_formats(niche_name, config)
             
             # Performance metrics analysis
-            performance_analysis = await self._analyze_content_performance_metrics(
+            performance_analysis = self._analyze_content_performance_metrics(
                 niche_name, config
             )
             
             # Content theme analysis
-            theme_analysis = await self._analyze_content_themes(niche_name, config)
+            theme_analysis = self._analyze_content_themes(niche_name, config)
             
             # Optimal content characteristics
-            optimal_characteristics = await self._identify_optimal_content_characteristics(
+            optimal_characteristics = self._identify_optimal_content_characteristics(
                 performance_analysis, format_analysis
             )
             
             # Content trends analysis
-            content_trends = await self._analyze_content_trends(niche_name, config)
+            content_trends = self._analyze_content_trends(niche_name, config)
             
             # Audience preferences
-            preference_analysis = await self._analyze_audience_content_preferences(
+            preference_analysis = self._analyze_audience_content_preferences(
                 niche_name, config
             )
             
             # Content gaps and opportunities
-            content_opportunities = await self._identify_content_opportunities(
+            content_opportunities = self._identify_content_opportunities(
                 format_analysis, theme_analysis, performance_analysis
             )
             
@@ -608,7 +792,7 @@ class MarketResearchEngine(BaseModule):
                     "best_posting_times": optimal_characteristics.get("timing", {}),
                     "trending_themes": content_trends.get("trending_themes", [])
                 },
-                "content_recommendations": await self._generate_content_recommendations(
+                "content_recommendations": self._generate_content_recommendations(
                     optimal_characteristics, content_opportunities, preference_analysis
                 )
             }
@@ -629,35 +813,35 @@ class MarketResearchEngine(BaseModule):
             niche_name = niche_info.get("niche_name", "unknown")
             
             # Revenue stream analysis
-            revenue_streams = await self._analyze_revenue_streams(niche_name, config)
+            revenue_streams = self._analyze_revenue_streams(niche_name, config)
             
             # Monetization method effectiveness
-            monetization_effectiveness = await self._analyze_monetization_effectiveness(
+            monetization_effectiveness = self._analyze_monetization_effectiveness(
                 niche_name, config
             )
             
             # Brand partnership opportunities
-            brand_partnerships = await self._analyze_brand_partnership_opportunities(
+            brand_partnerships = self._analyze_brand_partnership_opportunities(
                 niche_name, config
             )
             
             # Product/service opportunities
-            product_opportunities = await self._analyze_product_service_opportunities(
+            product_opportunities = self._analyze_product_service_opportunities(
                 niche_name, config
             )
             
             # Affiliate marketing potential
-            affiliate_potential = await self._analyze_affiliate_marketing_potential(
+            affiliate_potential = self._analyze_affiliate_marketing_potential(
                 niche_name, config
             )
             
             # Subscription/membership potential
-            subscription_potential = await self._analyze_subscription_potential(
+            subscription_potential = self._analyze_subscription_potential(
                 niche_name, config
             )
             
             # Revenue optimization strategies
-            optimization_strategies = await self._develop_revenue_optimization_strategies(
+            optimization_strategies = self._develop_revenue_optimization_strategies(
                 revenue_streams, monetization_effectiveness
             )
             
@@ -675,7 +859,7 @@ class MarketResearchEngine(BaseModule):
                     "top_opportunities": product_opportunities.get("high_potential", []),
                     "implementation_timeline": optimization_strategies.get("timeline", {})
                 },
-                "monetization_roadmap": await self._create_monetization_roadmap(
+                "monetization_roadmap": self._create_monetization_roadmap(
                     optimization_strategies, product_opportunities
                 )
             }
@@ -689,8 +873,6 @@ class MarketResearchEngine(BaseModule):
     async def _get_niche_information(self, niche_id: str) -> Dict[str, Any]:
         """Get niche information from database"""
         try:
-            import aiosqlite
-            
             async with aiosqlite.connect(self.db_ext.db_path) as db:
                 async with db.execute(
                     "SELECT * FROM niche_intelligence WHERE id = ?",
@@ -774,12 +956,27 @@ class MarketResearchEngine(BaseModule):
             logger.error(f"YouTube market analysis failed: {str(e)}")
             return youtube_market
     
-    async def _save_research_to_database(self, research_report: Dict[str, Any]):
-        """Save market research report to database"""
+    async def _save_research_to_database(self, research_report: Dict[str, Any]) -> bool:
+        """Save market research report to database, returning True on commit"""
         try:
-            import aiosqlite
+            # Small reports serialize faster inline than an executor hop; large
+            # ones are serialized off the event loop
+            if _report_exceeds(research_report, self.executor_serialize_threshold):
+                blobs = await asyncio.get_running_loop().run_in_executor(
+                    None, _intern_report_blobs, research_report
+                )
+            else:
+                blobs = _intern_report_blobs(research_report)
+            blob_refs = [_BLOB_REF_PREFIX + digest for digest, _ in blobs]
             
-            async with aiosqlite.connect(self.db_ext.db_path) as db:
+            quality_score = research_report.get("metadata", {}).get("research_quality_score", 0.7)
+            
+            async with self._connect_research_writer() as db:
+                # Shared sub-blobs are stored once and referenced by hash
+                await db.executemany(
+                    "INSERT OR IGNORE INTO blob_store (sha256, payload) VALUES (?, ?)",
+                    blobs
+                )
                 await db.execute("""
                     INSERT OR REPLACE INTO market_research_data (
                         id, niche_id, research_type, data_source, research_date,
@@ -794,42 +991,89 @@ class MarketResearchEngine(BaseModule):
                     "comprehensive_research",
                     "automated_engine",
                     research_report["research_date"],
-                    json.dumps(research_report.get("market_size_analysis", {})),
-                    json.dumps(research_report.get("audience_analysis", {})),
-                    json.dumps(research_report.get("audience_analysis", {}).get("behavioral_patterns", {})),
-                    json.dumps(research_report.get("content_analysis", {})),
-                    json.dumps(research_report.get("monetization_analysis", {})),
-                    json.dumps(research_report.get("growth_analysis", {})),
-                    json.dumps(research_report.get("competitive_analysis", {})),
-                    json.dumps(research_report.get("strategic_recommendations", [])),
-                    research_report.get("metadata", {}).get("research_quality_score", 0.7),
-                    research_report.get("metadata", {}).get("research_quality_score", 0.7)
+                    *blob_refs,
+                    quality_score,
+                    quality_score
                 ))
                 await db.commit()
+            
+            return True
                 
         except Exception as e:
             logger.error(f"Failed to save research to database: {str(e)}")
+            return False
+    
+    def _connect_research_writer(self):
+        """Open a connection for research writes (rapsqlite, falling back to aiosqlite)"""
+        if self.use_rapsqlite:
+            try:
+                connection = RapSQLiteConnection(self.db_ext.db_path)
+                missing = [
+                    name for name in _RESEARCH_WRITER_API if not hasattr(connection, name)
+                ]
+                if not missing:
+                    return connection
+                logger.warning(
+                    f"rapsqlite connection lacks {', '.join(missing)}; using aiosqlite for research writes"
+                )
+            except Exception as e:
+                logger.warning(f"rapsqlite unavailable, using aiosqlite for research writes: {str(e)}")
+            self.use_rapsqlite = False
+        
+        return aiosqlite.connect(self.db_ext.db_path)
     
     def _update_research_cache(self, research_report: Dict[str, Any]):
         """Update research cache with new report"""
         self.research_cache[research_report["niche_id"]] = research_report
+        self._advance_cache_watermark(str(research_report["research_date"]))
         self.last_research_update = datetime.utcnow()
     
+    def _advance_cache_watermark(self, research_date: str):
+        """Move the cache watermark forward to the given research date"""
+        if self._cache_watermark is None or research_date > self._cache_watermark:
+            self._cache_watermark = research_date
+    
     async def _load_research_cache(self):
-        """Load existing research from cache"""
-        self.research_cache = {}
+        """Incrementally load research newer than the cache watermark"""
+        try:
+            async with aiosqlite.connect(self.db_ext.db_path) as db:
+                async with db.execute(_LOAD_RESEARCH_SQL, (self._cache_watermark or "",)) as cursor:
+                    rows = await cursor.fetchall()
+            
+            def load(value, default):
+                return json.loads(value) if value else default
+            
+            # Later rows overwrite earlier ones, leaving the newest report per niche
+            for row in rows:
+                research_date = str(row[2])
+                self.research_cache[row[1]] = {
+                    "research_id": row[0],
+                    "niche_id": row[1],
+                    "research_date": research_date,
+                    "market_size_analysis": load(row[3], {}),
+                    "audience_analysis": load(row[4], {}),
+                    "content_analysis": load(row[5], {}),
+                    "monetization_analysis": load(row[6], {}),
+                    "growth_analysis": load(row[7], {}),
+                    "competitive_analysis": load(row[8], {}),
+                    "strategic_recommendations": load(row[9], []),
+                    "metadata": {"research_quality_score": row[10]}
+                }
+                self._advance_cache_watermark(research_date)
+            
+            if rows:
+                logger.info(f"Loaded {len(rows)} new market research records into cache")
+            
+        except Exception as e:
+            logger.warning(f"Failed to load research cache: {str(e)}")
+        
         self.last_research_update = datetime.utcnow()
     
     def _calculate_research_confidence(self, config: Dict[str, Any]) -> float:
         """Calculate research confidence level"""
-        sample_size = config.get("sample_size", 0)
-        time_range = config.get("time_range_days", 0)
-        
         # Simple confidence calculation based on sample size and time range
-        sample_confidence = min(sample_size / 500, 1.0)
-        time_confidence = min(time_range / 180, 1.0)
-        
-        return (sample_confidence + time_confidence) / 2
+        get = config.get
+        return (min(get("sample_size", 0) / 500, 1.0) + min(get("time_range_days", 0) / 180, 1.0)) * 0.5
     
     def _count_data_points_analyzed(self, analysis_data: Dict[str, Any]) -> int:
         """Count total data points analyzed"""
@@ -848,161 +1092,162 @@ class MarketResearchEngine(BaseModule):
         return min(completeness_score, 1.0)
     
     # Placeholder methods for comprehensive analysis
-    # These would be implemented with actual data sources and analysis logic
+    # These would be implemented with actual data sources and analysis logic.
+    # They are synchronous until backed by real I/O; re-add async then.
     
-    async def _estimate_cross_platform_market(self, niche_name: str, youtube_market: Dict) -> Dict[str, Any]:
+    def _estimate_cross_platform_market(self, niche_name: str, youtube_market: Dict) -> Dict[str, Any]:
         return {"estimated_total_market": youtube_market.get("market_value_estimate", 0) * 3}
     
-    async def _calculate_total_addressable_market(self, youtube_market: Dict, cross_platform: Dict) -> Dict[str, Any]:
+    def _calculate_total_addressable_market(self, youtube_market: Dict, cross_platform: Dict) -> Dict[str, Any]:
         return {"tam_estimate": cross_platform.get("estimated_total_market", 0)}
     
-    async def _calculate_serviceable_addressable_market(self, tam: Dict, geographic_focus: List) -> Dict[str, Any]:
+    def _calculate_serviceable_addressable_market(self, tam: Dict, geographic_focus: List) -> Dict[str, Any]:
         return {"sam_estimate": tam.get("tam_estimate", 0) * 0.3}
     
-    async def _calculate_serviceable_obtainable_market(self, sam: Dict, config: Dict) -> Dict[str, Any]:
+    def _calculate_serviceable_obtainable_market(self, sam: Dict, config: Dict) -> Dict[str, Any]:
         return {"som_estimate": sam.get("sam_estimate", 0) * 0.1, "audience_size": 10000}
     
-    async def _analyze_market_growth_rate(self, niche_name: str, config: Dict) -> Dict[str, Any]:
+    def _analyze_market_growth_rate(self, niche_name: str, config: Dict) -> Dict[str, Any]:
         return {"annual_growth_rate": 0.15, "trend": "growing"}
     
-    async def _assess_market_maturity(self, youtube_market: Dict, growth_rate: Dict) -> Dict[str, Any]:
+    def _assess_market_maturity(self, youtube_market: Dict, growth_rate: Dict) -> Dict[str, Any]:
         return {"stage": "growth", "maturity_level": "medium"}
     
-    async def _analyze_revenue_potential(self, som: Dict, niche_name: str) -> Dict[str, Any]:
+    def _analyze_revenue_potential(self, som: Dict, niche_name: str) -> Dict[str, Any]:
         return {"annual_potential": som.get("som_estimate", 0) * 0.05}
     
-    async def _analyze_geographic_market_distribution(self, market: Dict, focus: List) -> Dict[str, Any]:
+    def _analyze_geographic_market_distribution(self, market: Dict, focus: List) -> Dict[str, Any]:
         return {"global_distribution": {"US": 30, "EU": 25, "Asia": 35, "Other": 10}}
     
-    async def _analyze_market_concentration(self, market: Dict) -> Dict[str, Any]:
+    def _analyze_market_concentration(self, market: Dict) -> Dict[str, Any]:
         return {"concentration_level": "medium", "hhi_index": 0.15}
     
-    async def _analyze_audience_demographics(self, niche: str, config: Dict, segments: List) -> Dict[str, Any]:
+    def _analyze_audience_demographics(self, niche: str, config: Dict, segments: List) -> Dict[str, Any]:
         return {"primary_segment": {"age": "25-34", "gender": "mixed", "location": "global"}}
     
-    async def _analyze_audience_behavior_patterns(self, niche: str, config: Dict) -> Dict[str, Any]:
+    def _analyze_audience_behavior_patterns(self, niche: str, config: Dict) -> Dict[str, Any]:
         return {"key_patterns": ["regular_viewing", "high_engagement", "social_sharing"]}
     
-    async def _analyze_content_consumption_patterns(self, niche: str, config: Dict) -> Dict[str, Any]:
+    def _analyze_content_consumption_patterns(self, niche: str, config: Dict) -> Dict[str, Any]:
         return {"peak_hours": "7-9 PM", "preferred_length": "10-15 minutes"}
     
-    async def _analyze_engagement_behavior(self, niche: str, config: Dict) -> Dict[str, Any]:
+    def _analyze_engagement_behavior(self, niche: str, config: Dict) -> Dict[str, Any]:
         return {"primary_drivers": ["quality_content", "consistency", "community"]}
     
-    async def _analyze_platform_usage_patterns(self, niche: str, config: Dict) -> Dict[str, Any]:
+    def _analyze_platform_usage_patterns(self, niche: str, config: Dict) -> Dict[str, Any]:
         return {"primary_platform": "YouTube", "cross_platform_usage": ["TikTok", "Instagram"]}
     
-    async def _analyze_purchase_behavior(self, niche: str, config: Dict) -> Dict[str, Any]:
+    def _analyze_purchase_behavior(self, niche: str, config: Dict) -> Dict[str, Any]:
         return {"conversion_drivers": ["trust", "recommendations", "value_demonstration"]}
     
-    async def _perform_audience_segmentation(self, demo: Dict, behavior: Dict, consumption: Dict) -> List[Dict[str, Any]]:
+    def _perform_audience_segmentation(self, demo: Dict, behavior: Dict, consumption: Dict) -> List[Dict[str, Any]]:
         return [{"segment": "primary", "size": 60, "characteristics": ["engaged", "frequent_viewers"]}]
     
-    async def _develop_audience_personas(self, segments: List, demo: Dict, behavior: Dict) -> List[Dict[str, Any]]:
+    def _develop_audience_personas(self, segments: List, demo: Dict, behavior: Dict) -> List[Dict[str, Any]]:
         return [{"persona": "engaged_learner", "characteristics": ["curious", "active", "loyal"]}]
     
-    async def _map_customer_journey(self, niche: str, behavior: Dict, engagement: Dict) -> Dict[str, Any]:
+    def _map_customer_journey(self, niche: str, behavior: Dict, engagement: Dict) -> Dict[str, Any]:
         return {"stages": ["awareness", "consideration", "conversion", "retention"]}
     
-    async def _generate_targeting_recommendations(self, segments: List, demographics: Dict) -> List[str]:
+    def _generate_targeting_recommendations(self, segments: List, demographics: Dict) -> List[str]:
         return ["Target 25-34 age group", "Focus on educational content", "Emphasize community building"]
     
-    async def _identify_key_competitors(self, niche: str, config: Dict) -> List[Dict[str, Any]]:
+    def _identify_key_competitors(self, niche: str, config: Dict) -> List[Dict[str, Any]]:
         return [{"name": "Competitor A", "subscribers": 100000, "niche_overlap": 0.8}]
     
-    async def _perform_competitive_benchmarking(self, competitors: List, config: Dict) -> Dict[str, Any]:
+    def _perform_competitive_benchmarking(self, competitors: List, config: Dict) -> Dict[str, Any]:
         return {"benchmarks": {"avg_subscribers": 50000, "avg_views": 10000}}
     
-    async def _analyze_market_positioning(self, competitors: List, benchmarking: Dict) -> Dict[str, Any]:
+    def _analyze_market_positioning(self, competitors: List, benchmarking: Dict) -> Dict[str, Any]:
         return {"positioning_map": {"quality_vs_price": {"high_quality": ["Competitor A"]}}}
     
-    async def _analyze_competitive_strategies(self, competitors: List, config: Dict) -> Dict[str, Any]:
+    def _analyze_competitive_strategies(self, competitors: List, config: Dict) -> Dict[str, Any]:
         return {"common_strategies": ["consistent_posting", "community_engagement"]}
     
-    async def _analyze_market_share(self, competitors: List, benchmarking: Dict) -> Dict[str, Any]:
+    def _analyze_market_share(self, competitors: List, benchmarking: Dict) -> Dict[str, Any]:
         return {"leader": {"name": "Competitor A", "market_share": 15}}
     
-    async def _perform_competitive_swot_analysis(self, competitors: List, benchmarking: Dict) -> Dict[str, Any]:
+    def _perform_competitive_swot_analysis(self, competitors: List, benchmarking: Dict) -> Dict[str, Any]:
         return {"industry_strengths": ["growing_market"], "threats": ["increasing_competition"]}
     
-    async def _identify_competitive_gaps(self, competitors: List, positioning: Dict) -> Dict[str, Any]:
+    def _identify_competitive_gaps(self, competitors: List, positioning: Dict) -> Dict[str, Any]:
         return {"high_opportunity_gaps": [{"gap": "tutorial_content", "opportunity_score": 0.8}]}
     
-    async def _assess_competitive_threats(self, competitors: List, strategy: Dict) -> Dict[str, Any]:
+    def _assess_competitive_threats(self, competitors: List, strategy: Dict) -> Dict[str, Any]:
         return {"high_priority_threats": [{"threat": "large_channel_entry", "probability": 0.3}]}
     
-    async def _generate_competitive_recommendations(self, gaps: Dict, positioning: Dict, threats: Dict) -> List[str]:
+    def _generate_competitive_recommendations(self, gaps: Dict, positioning: Dict, threats: Dict) -> List[str]:
         return ["Focus on unique value proposition", "Build strong community", "Innovate content formats"]
     
-    async def _analyze_content_formats(self, niche: str, config: Dict) -> Dict[str, Any]:
+    def _analyze_content_formats(self, niche: str, config: Dict) -> Dict[str, Any]:
         return {"top_formats": ["tutorial", "review", "vlog"], "performance": {"tutorial": 0.8}}
     
-    async def _analyze_content_performance_metrics(self, niche: str, config: Dict) -> Dict[str, Any]:
+    def _analyze_content_performance_metrics(self, niche: str, config: Dict) -> Dict[str, Any]:
         return {"avg_metrics": {"views": 10000, "engagement_rate": 0.05}}
     
-    async def _analyze_content_themes(self, niche: str, config: Dict) -> Dict[str, Any]:
+    def _analyze_content_themes(self, niche: str, config: Dict) -> Dict[str, Any]:
         return {"trending_themes": ["beginner_guides", "advanced_techniques"]}
     
-    async def _identify_optimal_content_characteristics(self, performance: Dict, format: Dict) -> Dict[str, Any]:
+    def _identify_optimal_content_characteristics(self, performance: Dict, format: Dict) -> Dict[str, Any]:
         return {"length": {"optimal": "10-15 minutes"}, "timing": {"best_days": ["Tuesday", "Thursday"]}}
     
-    async def _analyze_content_trends(self, niche: str, config: Dict) -> Dict[str, Any]:
+    def _analyze_content_trends(self, niche: str, config: Dict) -> Dict[str, Any]:
         return {"trending_themes": ["AI_integration", "sustainability"]}
     
-    async def _analyze_audience_content_preferences(self, niche: str, config: Dict) -> Dict[str, Any]:
+    def _analyze_audience_content_preferences(self, niche: str, config: Dict) -> Dict[str, Any]:
         return {"preferences": ["educational", "entertaining", "actionable"]}
     
-    async def _identify_content_opportunities(self, format: Dict, theme: Dict, performance: Dict) -> List[Dict[str, Any]]:
+    def _identify_content_opportunities(self, format: Dict, theme: Dict, performance: Dict) -> List[Dict[str, Any]]:
         return [{"opportunity": "AI_tutorials", "potential_score": 0.9}]
     
-    async def _generate_content_recommendations(self, optimal: Dict, opportunities: List, preferences: Dict) -> List[str]:
+    def _generate_content_recommendations(self, optimal: Dict, opportunities: List, preferences: Dict) -> List[str]:
         return ["Create more tutorial content", "Focus on 10-15 minute videos", "Post on Tuesdays and Thursdays"]
     
     # Additional placeholder methods for comprehensive market research
-    async def _analyze_growth_trends_and_projections(self, niche_id: str, config: Dict) -> Dict[str, Any]:
+    def _analyze_growth_trends_and_projections(self, niche_id: str, config: Dict) -> Dict[str, Any]:
         return {"growth_projections": {"1_year": 25, "3_year": 75, "5_year": 150}}
     
-    async def _analyze_threats_and_challenges(self, niche_id: str, config: Dict) -> Dict[str, Any]:
+    def _analyze_threats_and_challenges(self, niche_id: str, config: Dict) -> Dict[str, Any]:
         return {"major_threats": ["platform_algorithm_changes", "increasing_competition"]}
     
-    async def _research_custom_questions(self, niche_id: str, questions: List[str], config: Dict) -> Dict[str, Any]:
+    def _research_custom_questions(self, niche_id: str, questions: List[str], config: Dict) -> Dict[str, Any]:
         return {"custom_insights": [{"question": q, "answer": "Analysis pending"} for q in questions]}
     
-    async def _analyze_cross_platform_market(self, niche_id: str, config: Dict) -> Dict[str, Any]:
+    def _analyze_cross_platform_market(self, niche_id: str, config: Dict) -> Dict[str, Any]:
         return {"platforms": {"YouTube": 60, "TikTok": 25, "Instagram": 15}}
     
-    async def _identify_emerging_opportunities(self, niche_id: str, config: Dict, market: Dict, competition: Dict) -> Dict[str, Any]:
+    def _identify_emerging_opportunities(self, niche_id: str, config: Dict, market: Dict, competition: Dict) -> Dict[str, Any]:
         return {"emerging_opportunities": [{"opportunity": "mobile_first_content", "score": 0.8}]}
     
-    async def _generate_executive_summary(self, data: Dict) -> Dict[str, Any]:
+    def _generate_executive_summary(self, data: Dict) -> Dict[str, Any]:
         return {"summary": "Market shows strong growth potential with moderate competition"}
     
-    async def _generate_strategic_recommendations(self, data: Dict) -> List[Dict[str, Any]]:
+    def _generate_strategic_recommendations(self, data: Dict) -> List[Dict[str, Any]]:
         return [{"recommendation": "Focus on educational content", "priority": "high"}]
     
-    async def _create_action_plan(self, data: Dict) -> Dict[str, Any]:
+    def _create_action_plan(self, data: Dict) -> Dict[str, Any]:
         return {"phases": [{"phase": "market_entry", "timeline": "1-3 months"}]}
     
-    async def _analyze_revenue_streams(self, niche: str, config: Dict) -> Dict[str, Any]:
+    def _analyze_revenue_streams(self, niche: str, config: Dict) -> Dict[str, Any]:
         return {"primary_streams": ["ad_revenue", "sponsorships", "affiliate"], "total_potential": 50000}
     
-    async def _analyze_monetization_effectiveness(self, niche: str, config: Dict) -> Dict[str, Any]:
+    def _analyze_monetization_effectiveness(self, niche: str, config: Dict) -> Dict[str, Any]:
         return {"effectiveness": {"ad_revenue": 0.7, "sponsorships": 0.9}}
     
-    async def _analyze_brand_partnership_opportunities(self, niche: str, config: Dict) -> Dict[str, Any]:
+    def _analyze_brand_partnership_opportunities(self, niche: str, config: Dict) -> Dict[str, Any]:
         return {"opportunities": [{"brand": "Tech Company A", "potential": "high"}]}
     
-    async def _analyze_product_service_opportunities(self, niche: str, config: Dict) -> Dict[str, Any]:
+    def _analyze_product_service_opportunities(self, niche: str, config: Dict) -> Dict[str, Any]:
         return {"high_potential": [{"product": "online_course", "demand_score": 0.8}]}
     
-    async def _analyze_affiliate_marketing_potential(self, niche: str, config: Dict) -> Dict[str, Any]:
+    def _analyze_affiliate_marketing_potential(self, niche: str, config: Dict) -> Dict[str, Any]:
         return {"potential_score": 0.7, "top_programs": ["Amazon Associates"]}
     
-    async def _analyze_subscription_potential(self, niche: str, config: Dict) -> Dict[str, Any]:
+    def _analyze_subscription_potential(self, niche: str, config: Dict) -> Dict[str, Any]:
         return {"potential_score": 0.6, "pricing_range": "$5-15/month"}
     
-    async def _develop_revenue_optimization_strategies(self, streams: Dict, effectiveness: Dict) -> Dict[str, Any]:
+    def _develop_revenue_optimization_strategies(self, streams: Dict, effectiveness: Dict) -> Dict[str, Any]:
         return {"strategies": [{"strategy": "diversify_revenue", "impact": "high"}]}
     
-    async def _create_monetization_roadmap(self, strategies: Dict, opportunities: Dict) -> Dict[str, Any]:
+    def _create_monetization_roadmap(self, strategies: Dict, opportunities: Dict) -> Dict[str, Any]:
         return {"timeline": {"month_1": "setup_ad_revenue", "month_3": "launch_sponsorships"}}
\ No newline at end of file
@@ -3,9 +3,10 @@ Niche Intelligence Engine
 Unified interface for market research and niche analysis
 """
 
-import asyncio
+import copy
 import logging
-from typing import Dict, Any, Optional, List
+import time
+from typing import Dict, Any, Optional, List, Tuple
 
 from modules.base import BaseModule
 from .market_researcher import MarketResearchEngine
@@ -20,6 +21,11 @@ class NicheIntelligenceEngine(BaseModule):
         self.module_name = "niche_intelligence_engine"
         self.market_researcher = None
         
+        # Niche analyses: niche_id -> (monotonic time, analysis), dropped when new
+        # research for the niche is committed and expired after cache_ttl
+        self.cache_ttl = 3600  # seconds
+        self.trend_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        
     async def _setup(self):
         """Setup niche intelligence engine"""
         try:
@@ -27,25 +33,47 @@ class NicheIntelligenceEngine(BaseModule):
             self.market_researcher = MarketResearchEngine()
             await self.market_researcher.initialize()
             
+            # Subscribe to research commit events for cache invalidation
+            self.market_researcher.subscribe_research_events(self._on_research_event)
+            
             logger.info("Niche intelligence engine setup complete")
             
         except Exception as e:
             logger.error(f"Failed to setup niche intelligence engine: {str(e)}")
             raise
     
-    async def analyze_niche(self, niche: str) -> Dict[str, Any]:
-        """Analyze a specific niche"""
+    def _on_research_event(self, topic: str, niche_id: str):
+        """Invalidate the cached analysis of a niche whose research was committed"""
+        if topic == "research":
+            self.trend_cache.pop(niche_id, None)
+    
+    async def cleanup(self):
+        """Stop listening for research events and drop cached analyses"""
+        if self.market_researcher:
+            self.market_researcher.unsubscribe_research_events(self._on_research_event)
+        self.trend_cache.clear()
+    
+    async def analyze_niche(self, niche_id: str) -> Dict[str, Any]:
+        """Analyze a specific niche by the ID its research is committed under"""
         try:
             if not self.market_researcher:
                 raise RuntimeError("Market researcher not initialized")
             
-            # Use market researcher for analysis
-            analysis = await self.market_researcher.analyze_market_trends(niche)
+            # Serve from cache until it expires or a research commit for the same
+            # niche_id invalidates it
+            cached = self.trend_cache.get(niche_id)
+            if cached and time.monotonic() - cached[0] < self.cache_ttl:
+                analysis = cached[1]
+            else:
+                # Use market researcher for analysis
+                analysis = await self.market_researcher.analyze_market_trends(niche_id)
+                self.trend_cache[niche_id] = (time.monotonic(), analysis)
             
+            # Callers own the returned analysis, so hand out a copy of the cached one
             return {
                 "status": "success",
-                "niche": niche,
-                "analysis": analysis,
+                "niche": niche_id,
+                "analysis": copy.deepcopy(analysis),
                 "recommendation": "High potential niche"
             }
             
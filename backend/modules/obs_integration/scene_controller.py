@@ -4,9 +4,20 @@ Handles dynamic scene switching, overlay management, and visual automation
 """
 
 import asyncio
+import heapq
 import json
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+import random
+import sys
+import time
+import uuid
+from array import array
+from bisect import bisect_right
+from functools import partial
+from itertools import islice
+from typing import Dict, List, Any, Optional, Tuple, Deque, Mapping, Callable, Awaitable, Set, Iterable
+from collections import deque, defaultdict
+from types import MappingProxyType
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
@@ -15,6 +26,49 @@ from ..base import BaseModule
 
 logger = logging.getLogger(__name__)
 
+# Upper bound (seconds) for retry backoff after repeated OBS failures
+_MAX_RETRY_DELAY = 60
+
+# (position, scale, rotation) of an untransformed scene item
+_IDENTITY_TRANSFORM = (0, 0, 1.0, 1.0, 0)  # positionX, positionY, scaleX, scaleY, rotation
+_UNRESOLVED_ITEM_ID = -1
+
+# Requests sent as pre-serialized frames when the manager supports raw sends,
+# mapped to the payload field their cached template is keyed on
+_RAW_FRAME_REQUESTS = {
+    "SetCurrentSceneTransition": "transitionName",
+    "SetCurrentSceneTransitionDuration": "transitionDuration"
+}
+
+# Marks overlays with no content confirmed written to OBS
+_UNWRITTEN = object()
+
+def _consume_exception(future: asyncio.Future):
+    """Done callback marking a future's exception as retrieved, for fire-and-forget writes"""
+    if not future.cancelled():
+        future.exception()
+
+def _build_request_template(request_type: str, request_data: Dict[str, Any]) -> Tuple[bytes, bytes]:
+    """Pre-serialize an obs-websocket v5 Request (op 6) message around its requestId
+    
+    Returns the bytes before and after the requestId value; requestId is serialized
+    last, so its empty placeholder is the final '""' in the message.
+    """
+    prefix, _, suffix = json.dumps({
+        "op": 6,
+        "d": {"requestType": request_type, "requestData": request_data, "requestId": ""}
+    }).rpartition('""')
+    return prefix.encode("utf-8"), suffix.encode("utf-8")
+
+def _new_request_id() -> str:
+    """Unique obs-websocket requestId, so responses never match a stale request"""
+    return uuid.uuid4().hex
+
+def _fill_request_template(template: Tuple[bytes, bytes]) -> bytes:
+    """Complete a pre-serialized request with a fresh requestId"""
+    prefix, suffix = template
+    return b"%s\"%s\"%s" % (prefix, _new_request_id().encode("ascii"), suffix)
+
 class SceneTransition(Enum):
     """Scene transition types"""
     CUT = "Cut"
@@ -23,9 +77,9 @@ class SceneTransition(Enum):
     STINGER = "Stinger"
     WIPE = "Wipe"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SceneItem:
-    """Scene item configuration"""
+    """Scene item configuration (immutable, so scene arrays and as_dict never go stale)"""
     name: str
     source_name: str
     visible: bool = True
@@ -33,21 +87,51 @@ class SceneItem:
     scale: Tuple[float, float] = (1.0, 1.0)
     rotation: float = 0
     opacity: float = 100
-    crop: Dict[str, int] = field(default_factory=dict)
-    filters: List[str] = field(default_factory=list)
+    crop: Tuple[Tuple[str, int], ...] = ()  # (side, pixels) pairs, kept hashable
+    filters: Tuple[str, ...] = ()
+    _cached_dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Serialized item (cached)"""
+        if self._cached_dict is None:
+            object.__setattr__(self, "_cached_dict", {
+                "name": self.name,
+                "source_name": self.source_name,
+                "visible": self.visible,
+                "position": self.position,
+                "scale": self.scale,
+                "rotation": self.rotation,
+                "opacity": self.opacity
+            })
+        return self._cached_dict
 
-@dataclass
+@dataclass(slots=True)
 class Scene:
     """Scene configuration"""
     name: str
-    items: List[SceneItem] = field(default_factory=list)
+    items: Tuple[SceneItem, ...] = ()
     transition: SceneTransition = SceneTransition.FADE
     transition_duration: int = 300  # milliseconds
     auto_switch_after: Optional[int] = None  # seconds
     next_scene: Optional[str] = None
     triggers: List[str] = field(default_factory=list)  # Event triggers
+    # Parallel per-item arrays (positions/scales are interleaved x, y) for batched transforms
+    _names: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+    _positions: array = field(default_factory=lambda: array("d"), init=False, repr=False, compare=False)
+    _scales: array = field(default_factory=lambda: array("d"), init=False, repr=False, compare=False)
+    _rotations: array = field(default_factory=lambda: array("d"), init=False, repr=False, compare=False)
+    _item_ids: array = field(default_factory=lambda: array("i"), init=False, repr=False, compare=False)
+    
+    def pack_items(self):
+        """Freeze items and rebuild the parallel item arrays from them"""
+        items = self.items = tuple(self.items)
+        self._names = [item.name for item in items]
+        self._positions = array("d", (value for item in items for value in item.position))
+        self._scales = array("d", (value for item in items for value in item.scale))
+        self._rotations = array("d", (item.rotation for item in items))
+        self._item_ids = array("i", [_UNRESOLVED_ITEM_ID]) * len(items)  # OBS sceneItemIds, resolved lazily
 
-@dataclass
+@dataclass(slots=True)
 class OverlayElement:
     """Overlay element configuration"""
     name: str
@@ -60,6 +144,94 @@ class OverlayElement:
     animation: Optional[str] = None
     auto_hide_after: Optional[int] = None
     update_frequency: Optional[int] = None  # seconds
+    _cached_dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Serialized overlay (cached; reset _cached_dict after mutating)"""
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "name": self.name,
+                "type": self.type,
+                "source_name": self.source_name,
+                "content": self.content,
+                "position": self.position,
+                "size": self.size,
+                "visible": self.visible,
+                "animation": self.animation,
+                "auto_hide_after": self.auto_hide_after,
+                "update_frequency": self.update_frequency
+            }
+        return self._cached_dict
+
+class TimedScheduler:
+    """Run coroutines at deadlines from a single consumer task on a heap"""
+    
+    def __init__(self):
+        self._heap: List[Tuple[float, int, Callable[[], Awaitable[Any]]]] = []
+        self._pending: Set[int] = set()
+        self._seq = 0
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()  # Started jobs, referenced until done
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    def __contains__(self, handle: Optional[int]) -> bool:
+        return handle in self._pending
+    
+    def schedule(self, coro_factory: Callable[[], Awaitable[Any]], deadline: float) -> int:
+        """Schedule a coroutine factory to run at a loop.time() deadline; returns a handle"""
+        self._seq += 1
+        heapq.heappush(self._heap, (deadline, self._seq, coro_factory))
+        self._pending.add(self._seq)
+        
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._wake.set()
+        return self._seq
+    
+    def cancel(self, handle: Optional[int]):
+        """Cancel a scheduled entry (lazily dropped when it reaches the top of the heap)"""
+        self._pending.discard(handle)
+    
+    def stop(self):
+        """Stop the consumer task, cancel running jobs and drop all pending entries"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        for task in self._running:
+            task.cancel()
+        self._running.clear()
+        self._heap.clear()
+        self._pending.clear()
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        heap = self._heap
+        
+        while True:
+            now = loop.time()
+            while heap and heap[0][0] <= now:
+                _, seq, coro_factory = heapq.heappop(heap)
+                if seq not in self._pending:
+                    continue
+                self._pending.discard(seq)
+                task = asyncio.ensure_future(coro_factory())
+                self._running.add(task)
+                task.add_done_callback(self._job_done)
+            
+            self._wake.clear()
+            timeout = max(heap[0][0] - loop.time(), 0) if heap else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+    
+    def _job_done(self, task: asyncio.Task):
+        self._running.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error(f"Scheduled task failed: {str(task.exception())}")
 
 class SceneController(BaseModule):
     """Advanced scene and overlay management"""
@@ -72,17 +244,66 @@ class SceneController(BaseModule):
         # Scene management
         self.scenes: Dict[str, Scene] = {}
         self.current_scene: Optional[str] = None
-        self.scene_history: List[Tuple[str, datetime]] = []
-        self.scene_timers: Dict[str, asyncio.Task] = {}
+        self.scene_history: Deque[Tuple[str, float]] = deque(maxlen=1024)  # (scene, monotonic time)
+        self.scene_switch_count = 0
+        
+        # Every timer (auto-switch, auto-hide, return-to-scene, overlay updates and
+        # debounced overlay writes) runs on one scheduler
+        self._timed_scheduler = TimedScheduler()
+        self._auto_switch_handle: Optional[int] = None
+        self._hide_handles: Dict[str, int] = {}
+        self._return_handle: Optional[int] = None
+        self._scene_item_id_cache: Dict[Tuple[str, str], int] = {}  # (scene, source) -> id
+        self._last_applied_transform: Dict[Tuple[str, str], Tuple] = {}  # (scene, item) -> signature
+        
+        # Event trigger -> scene names and source -> (scene, item), rebuilt lazily after scene changes
+        self._trigger_to_scenes: Dict[str, List[str]] = defaultdict(list)
+        self._source_to_scene_items: Dict[str, List[Tuple[str, SceneItem]]] = defaultdict(list)
+        self._scene_item_sources: Dict[Tuple[str, int], str] = {}  # (scene, item id) -> source
+        self._scene_indexes_dirty = True
         
         # Overlay management
         self.overlay_elements: Dict[str, OverlayElement] = {}
         self.active_overlays: Dict[str, bool] = {}
-        self.overlay_update_tasks: Dict[str, asyncio.Task] = {}
+        self._source_to_overlay: Dict[str, OverlayElement] = {}
+        
+        # Periodic overlay updates: overlay name -> scheduler handle of its next run
+        self._overlay_update_handles: Dict[str, int] = {}
+        self._overlay_failures: Dict[str, int] = {}  # consecutive update failures
+        
+        # Cached read-only views for get_scenes/get_overlays, reset on mutation
+        self._scenes_snapshot: Optional[Mapping[str, Dict[str, Any]]] = None
+        self._overlays_snapshot: Optional[Mapping[str, Dict[str, Any]]] = None
+        
+        # OBS writes are funneled through one queue and coalesced per target; failed
+        # batches are retried a bounded number of times before their writes are dropped
+        self._obs_queue: asyncio.Queue = asyncio.Queue()
+        self._obs_writer_task: Optional[asyncio.Task] = None
+        self.obs_write_max_retries = 2
+        self.obs_write_retry_delay = 0.5  # seconds, doubled per retry
+        
+        # Trailing-edge debounce of overlay content writes to OBS; every update in a
+        # window waits on the same future, resolved once the coalesced write is sent
+        self.overlay_write_debounce = 0.05  # seconds
+        self._pending_overlay_writes: Dict[str, int] = {}
+        self._overlay_write_waiters: Dict[str, asyncio.Future] = {}
+        # Content last confirmed written to OBS, used to skip no-op writes
+        self._written_overlay_content: Dict[str, Any] = {}
+        
+        # Dynamic overlay content generators
+        self._stream_start = time.monotonic()
+        self._stream_start_wall = datetime.utcnow()
+        self._content_generators: Dict[str, Callable[[], Awaitable[str]]] = {
+            "subscriber_count": self._gen_subscriber_count,
+            "stream_timer": self._gen_stream_timer,
+            "recent_follower": self._gen_recent_follower
+        }
         
         # Transition settings
         self.default_transition = SceneTransition.FADE
         self.default_transition_duration = 500
+        # (request type, setting) -> serialized request template for raw OBS sends
+        self._request_frame_cache: Dict[Tuple[str, Any], Tuple[bytes, bytes]] = {}
         
         # Auto-switch rules
         self.auto_switch_rules = {
@@ -101,16 +322,63 @@ class SceneController(BaseModule):
                 "raid": {"scene": "raid_celebration", "duration": 30}
             }
         }
+        self._compile_auto_switch_rules()
         
         # Pre-defined scene templates
         self._setup_default_scenes()
         self._setup_default_overlays()
     
+    def set_auto_switch_rules(self, rules: Dict[str, Any]):
+        """Replace auto-switch rules and rebuild the lookup tables"""
+        self.auto_switch_rules = rules
+        self._compile_auto_switch_rules()
+    
+    def _compile_auto_switch_rules(self):
+        """Flatten auto-switch rules into direct lookup tables"""
+        # event_type -> (scene_name, duration)
+        self._event_scene_table: Dict[str, Tuple[str, Optional[int]]] = {
+            event_type: (rule["scene"], rule.get("duration"))
+            for event_type, rule in self.auto_switch_rules.get("event_triggered", {}).items()
+        }
+        
+        # Viewer count rules split by direction and sorted by threshold for bisect lookups.
+        # A rule applies "below" its threshold or "above" (at or above) it; without an
+        # explicit direction, low_viewers is a "below" rule and every other rule "above".
+        below_rules, above_rules = [], []
+        for rule_name, rule in self.auto_switch_rules.get("viewer_count_threshold", {}).items():
+            direction = rule.get("direction", "below" if rule_name == "low_viewers" else "above")
+            if direction not in ("below", "above"):
+                raise ValueError(f"Invalid direction for viewer rule {rule_name}: {direction}")
+            (below_rules if direction == "below" else above_rules).append((rule["threshold"], rule["scene"]))
+        
+        below_rules.sort()
+        above_rules.sort()
+        self._viewer_below_thresholds: List[int] = [threshold for threshold, _ in below_rules]
+        self._viewer_below_scenes: List[str] = [scene for _, scene in below_rules]
+        self._viewer_above_thresholds: List[int] = [threshold for threshold, _ in above_rules]
+        self._viewer_above_scenes: List[str] = [scene for _, scene in above_rules]
+    
+    def scene_for_viewer_count(self, viewer_count: int) -> Optional[str]:
+        """Get the auto-switch scene for a viewer count"""
+        # The highest "above" threshold reached wins; otherwise the lowest
+        # "below" threshold still above the count applies
+        index = bisect_right(self._viewer_above_thresholds, viewer_count) - 1
+        if index >= 0:
+            return self._viewer_above_scenes[index]
+        
+        index = bisect_right(self._viewer_below_thresholds, viewer_count)
+        if index < len(self._viewer_below_thresholds):
+            return self._viewer_below_scenes[index]
+        return None
+    
     async def _setup_module(self):
         """Initialize scene controller"""
         await super()._setup_module()
         
         try:
+            self._stream_start = time.monotonic()
+            self._stream_start_wall = datetime.utcnow()
+            
             # Initialize overlay update tasks
             await self._start_overlay_updates()
             
@@ -123,152 +391,233 @@ class SceneController(BaseModule):
     def _setup_default_scenes(self):
         """Setup default scene configurations"""
         # Starting/Intro Scene
-        self.scenes["intro"] = Scene(
-            name="intro",
-            items=[
-                SceneItem("webcam", "Webcam", position=(100, 100)),
-                SceneItem("intro_overlay", "Intro Overlay"),
-                SceneItem("starting_soon", "Starting Soon Text"),
-                SceneItem("social_media", "Social Media Links", position=(50, 400))
+        self._register_scene(self._build_scene("intro", {
+            "items": [
+                {"name": "webcam", "source_name": "Webcam", "position": (100, 100)},
+                {"name": "intro_overlay", "source_name": "Intro Overlay"},
+                {"name": "starting_soon", "source_name": "Starting Soon Text"},
+                {"name": "social_media", "source_name": "Social Media Links", "position": (50, 400)}
             ],
-            transition=SceneTransition.FADE,
-            auto_switch_after=30,
-            next_scene="main"
-        )
+            "transition": "Fade",
+            "transition_duration": 300,
+            "auto_switch_after": 30,
+            "next_scene": "main"
+        }))
         
         # Main streaming scene
-        self.scenes["main"] = Scene(
-            name="main",
-            items=[
-                SceneItem("webcam", "Webcam", position=(50, 50)),
-                SceneItem("screen_capture", "Screen Capture", position=(300, 50)),
-                SceneItem("chat_overlay", "Chat Overlay", position=(800, 100)),
-                SceneItem("recent_follower", "Recent Follower", position=(50, 400)),
-                SceneItem("subscriber_count", "Subscriber Count", position=(50, 450))
+        self._register_scene(self._build_scene("main", {
+            "items": [
+                {"name": "webcam", "source_name": "Webcam", "position": (50, 50)},
+                {"name": "screen_capture", "source_name": "Screen Capture", "position": (300, 50)},
+                {"name": "chat_overlay", "source_name": "Chat Overlay", "position": (800, 100)},
+                {"name": "recent_follower", "source_name": "Recent Follower", "position": (50, 400)},
+                {"name": "subscriber_count", "source_name": "Subscriber Count", "position": (50, 450)}
             ],
-            transition=SceneTransition.FADE
-        )
+            "transition": "Fade",
+            "transition_duration": 300
+        }))
         
         # Break scene
-        self.scenes["break"] = Scene(
-            name="break",
-            items=[
-                SceneItem("break_screen", "Break Screen"),
-                SceneItem("break_timer", "Break Timer", position=(400, 300)),
-                SceneItem("music_info", "Now Playing", position=(50, 450)),
-                SceneItem("social_links", "Social Links", position=(50, 500))
+        self._register_scene(self._build_scene("break", {
+            "items": [
+                {"name": "break_screen", "source_name": "Break Screen"},
+                {"name": "break_timer", "source_name": "Break Timer", "position": (400, 300)},
+                {"name": "music_info", "source_name": "Now Playing", "position": (50, 450)},
+                {"name": "social_links", "source_name": "Social Links", "position": (50, 500)}
             ],
-            transition=SceneTransition.SLIDE,
-            auto_switch_after=300,
-            next_scene="main"
-        )
+            "transition": "Slide",
+            "transition_duration": 300,
+            "auto_switch_after": 300,
+            "next_scene": "main"
+        }))
         
         # Celebration scene (for follows, donations, etc.)
-        self.scenes["celebration"] = Scene(
-            name="celebration",
-            items=[
-                SceneItem("webcam", "Webcam", position=(100, 100)),
-                SceneItem("celebration_overlay", "Celebration Overlay"),
-                SceneItem("confetti_effect", "Confetti Effect"),
-                SceneItem("thank_you_text", "Thank You Text", position=(200, 200))
+        self._register_scene(self._build_scene("celebration", {
+            "items": [
+                {"name": "webcam", "source_name": "Webcam", "position": (100, 100)},
+                {"name": "celebration_overlay", "source_name": "Celebration Overlay"},
+                {"name": "confetti_effect", "source_name": "Confetti Effect"},
+                {"name": "thank_you_text", "source_name": "Thank You Text", "position": (200, 200)}
             ],
-            transition=SceneTransition.STINGER,
-            auto_switch_after=10,
-            next_scene="main"
-        )
+            "transition": "Stinger",
+            "transition_duration": 300,
+            "auto_switch_after": 10,
+            "next_scene": "main"
+        }))
         
         # Outro scene
-        self.scenes["outro"] = Scene(
-            name="outro",
-            items=[
-                SceneItem("webcam", "Webcam", position=(100, 100)),
-                SceneItem("outro_overlay", "Outro Overlay"),
-                SceneItem("social_links", "Social Links", position=(200, 300)),
-                SceneItem("subscribe_reminder", "Subscribe Reminder", position=(200, 350))
+        self._register_scene(self._build_scene("outro", {
+            "items": [
+                {"name": "webcam", "source_name": "Webcam", "position": (100, 100)},
+                {"name": "outro_overlay", "source_name": "Outro Overlay"},
+                {"name": "social_links", "source_name": "Social Links", "position": (200, 300)},
+                {"name": "subscribe_reminder", "source_name": "Subscribe Reminder", "position": (200, 350)}
             ],
-            transition=SceneTransition.FADE,
-            auto_switch_after=60,
-            next_scene=None  # End stream
-        )
+            "transition": "Fade",
+            "transition_duration": 300,
+            "auto_switch_after": 60,
+            "next_scene": None  # End stream
+        }))
     
     def _setup_default_overlays(self):
         """Setup default overlay elements"""
         # Chat overlay
-        self.overlay_elements["chat"] = OverlayElement(
-            name="chat",
-            type="browser_source",
-            source_name="Chat Overlay",
-            position=(800, 100),
-            size=(400, 600),
-            update_frequency=5
-        )
+        self._register_overlay(self._build_overlay("chat", {
+            "type": "browser_source",
+            "source_name": "Chat Overlay",
+            "position": (800, 100),
+            "size": (400, 600),
+            "update_frequency": 5
+        }))
         
         # Recent follower
-        self.overlay_elements["recent_follower"] = OverlayElement(
-            name="recent_follower",
-            type="text",
-            source_name="Recent Follower",
-            content="Welcome new follower!",
-            position=(50, 400),
-            size=(300, 30),
-            animation="slide_in",
-            auto_hide_after=10
-        )
+        self._register_overlay(self._build_overlay("recent_follower", {
+            "type": "text",
+            "source_name": "Recent Follower",
+            "content": "Welcome new follower!",
+            "position": (50, 400),
+            "size": (300, 30),
+            "animation": "slide_in",
+            "auto_hide_after": 10
+        }))
         
         # Subscriber count
-        self.overlay_elements["subscriber_count"] = OverlayElement(
-            name="subscriber_count",
-            type="text",
-            source_name="Subscriber Count",
-            content="Subscribers: 0",
-            position=(50, 450),
-            size=(200, 30),
-            update_frequency=60
-        )
+        self._register_overlay(self._build_overlay("subscriber_count", {
+            "type": "text",
+            "source_name": "Subscriber Count",
+            "content": "Subscribers: 0",
+            "position": (50, 450),
+            "size": (200, 30),
+            "update_frequency": 60
+        }))
         
         # Donation alert
-        self.overlay_elements["donation_alert"] = OverlayElement(
-            name="donation_alert",
-            type="browser_source",
-            source_name="Donation Alert",
-            position=(400, 200),
-            size=(400, 200),
-            visible=False,
-            animation="bounce_in",
-            auto_hide_after=15
-        )
+        self._register_overlay(self._build_overlay("donation_alert", {
+            "type": "browser_source",
+            "source_name": "Donation Alert",
+            "position": (400, 200),
+            "size": (400, 200),
+            "visible": False,
+            "animation": "bounce_in",
+            "auto_hide_after": 15
+        }))
         
         # Stream timer
-        self.overlay_elements["stream_timer"] = OverlayElement(
-            name="stream_timer",
-            type="text",
-            source_name="Stream Timer",
-            content="Stream Time: 00:00:00",
-            position=(700, 50),
-            size=(200, 30),
-            update_frequency=1
+        self._register_overlay(self._build_overlay("stream_timer", {
+            "type": "text",
+            "source_name": "Stream Timer",
+            "content": "Stream Time: 00:00:00",
+            "position": (700, 50),
+            "size": (200, 30),
+            "update_frequency": 1
+        }))
+    
+    def _intern_source(self, source_name: str) -> str:
+        """Share one string object per OBS source name across scenes and overlays"""
+        return sys.intern(source_name)
+    
+    def _build_scene(self, scene_name: str, scene_config: Dict[str, Any]) -> Scene:
+        """Build a scene from its configuration dict"""
+        items = tuple(
+            SceneItem(
+                name=item_config["name"],
+                source_name=self._intern_source(item_config["source_name"]),
+                visible=item_config.get("visible", True),
+                position=tuple(item_config.get("position", (0, 0))),
+                scale=tuple(item_config.get("scale", (1.0, 1.0))),
+                rotation=item_config.get("rotation", 0),
+                opacity=item_config.get("opacity", 100)
+            )
+            for item_config in scene_config.get("items", [])
         )
+        
+        return Scene(
+            name=scene_name,
+            items=items,
+            transition=SceneTransition(scene_config.get("transition", "Fade")),
+            transition_duration=scene_config.get("transition_duration", 500),
+            auto_switch_after=scene_config.get("auto_switch_after"),
+            next_scene=scene_config.get("next_scene"),
+            triggers=list(scene_config.get("triggers", []))
+        )
+    
+    def _register_scene(self, scene: Scene):
+        """Add or replace a scene and invalidate derived state"""
+        scene.pack_items()
+        for request_type, payload in self._transition_requests(scene.transition, scene.transition_duration):
+            self._request_template(request_type, payload)
+        self.scenes[scene.name] = scene
+        self._scenes_snapshot = None
+        self._scene_indexes_dirty = True
+    
+    def _build_overlay(self, overlay_name: str, overlay_config: Dict[str, Any]) -> OverlayElement:
+        """Build an overlay element from its configuration dict"""
+        return OverlayElement(
+            name=overlay_name,
+            type=overlay_config["type"],
+            source_name=self._intern_source(overlay_config["source_name"]),
+            content=overlay_config.get("content"),
+            position=tuple(overlay_config.get("position", (0, 0))),
+            size=tuple(overlay_config.get("size", (100, 50))),
+            visible=overlay_config.get("visible", True),
+            animation=overlay_config.get("animation"),
+            auto_hide_after=overlay_config.get("auto_hide_after"),
+            update_frequency=overlay_config.get("update_frequency")
+        )
+    
+    def _register_overlay(self, overlay: OverlayElement):
+        """Add or replace an overlay and keep the source index in sync"""
+        previous = self.overlay_elements.get(overlay.name)
+        if previous and self._source_to_overlay.get(previous.source_name) is previous:
+            del self._source_to_overlay[previous.source_name]
+        
+        self.overlay_elements[overlay.name] = overlay
+        self._source_to_overlay[overlay.source_name] = overlay
+        self._overlays_snapshot = None
     
     async def _start_overlay_updates(self):
-        """Start automatic overlay update tasks"""
+        """Schedule automatic overlay updates"""
         for name, overlay in self.overlay_elements.items():
             if overlay.update_frequency:
-                task = asyncio.create_task(
-                    self._update_overlay_loop(name, overlay.update_frequency)
-                )
-                self.overlay_update_tasks[name] = task
+                self._schedule_overlay_update(name)
     
-    async def _update_overlay_loop(self, overlay_name: str, frequency: int):
-        """Continuously update overlay element"""
-        while True:
-            try:
-                await self.update_overlay_content(overlay_name)
-                await asyncio.sleep(frequency)
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                self.logger.error(f"Error updating overlay {overlay_name}: {str(e)}")
-                await asyncio.sleep(frequency)
+    @staticmethod
+    def _backoff_delay(base: float, fail_count: int) -> float:
+        """Exponential backoff with jitter, capped at _MAX_RETRY_DELAY"""
+        return min(base * (2 ** fail_count), _MAX_RETRY_DELAY) + random.uniform(0, base * 0.1)
+    
+    def _schedule_overlay_update(self, overlay_name: str, delay: float = 0, start: Optional[float] = None):
+        """Schedule an overlay's next update, replacing any pending one"""
+        scheduler = self._timed_scheduler
+        scheduler.cancel(self._overlay_update_handles.get(overlay_name))
+        
+        start = asyncio.get_running_loop().time() if start is None else start
+        self._overlay_update_handles[overlay_name] = scheduler.schedule(
+            partial(self._run_overlay_update, overlay_name), start + delay
+        )
+    
+    async def _run_overlay_update(self, overlay_name: str):
+        """Refresh one periodic overlay and schedule its next update"""
+        overlay = self.overlay_elements.get(overlay_name)
+        if overlay is None or not overlay.update_frequency:
+            self._overlay_update_handles.pop(overlay_name, None)
+            return
+        
+        start = asyncio.get_running_loop().time()
+        frequency = overlay.update_frequency
+        try:
+            await self._refresh_overlay_content(overlay_name)
+            self._overlay_failures.pop(overlay_name, None)
+            delay = frequency
+        except Exception as e:
+            # Back off while updates keep failing; only the first failure is a warning
+            fail_count = self._overlay_failures.get(overlay_name, 0)
+            self._overlay_failures[overlay_name] = fail_count + 1
+            log = self.logger.warning if fail_count == 0 else self.logger.debug
+            log(f"Error updating overlay {overlay_name} (failure {fail_count + 1}): {str(e)}")
+            delay = self._backoff_delay(frequency, fail_count)
+        
+        self._schedule_overlay_update(overlay_name, delay, start)
     
     async def switch_scene(
         self,
@@ -284,16 +633,20 @@ class SceneController(BaseModule):
             
             scene = self.scenes[scene_name]
             
+            # Resolve OBS scene item IDs the first time a scene is used
+            await self._resolve_scene_item_ids(scene)
+            
             # Use scene-specific or provided transition settings
             trans = transition or scene.transition or self.default_transition
             duration = transition_duration or scene.transition_duration or self.default_transition_duration
             
             # Set transition
-            if self.livestream_manager:
+            lm = self.livestream_manager
+            if lm:
                 await self._set_transition(trans, duration)
                 
                 # Switch scene
-                success = await self.livestream_manager.switch_scene(scene_name)
+                success = await lm.switch_scene(scene_name)
                 
                 if success:
                     # Update current scene
@@ -301,23 +654,31 @@ class SceneController(BaseModule):
                     self.current_scene = scene_name
                     
                     # Add to history
-                    self.scene_history.append((scene_name, datetime.utcnow()))
+                    self.scene_history.append((scene_name, time.monotonic()))
+                    self.scene_switch_count += 1
                     
                     # Cancel old scene timer
-                    if old_scene and old_scene in self.scene_timers:
-                        self.scene_timers[old_scene].cancel()
-                        del self.scene_timers[old_scene]
+                    self._timed_scheduler.cancel(self._auto_switch_handle)
+                    self._auto_switch_handle = None
                     
                     # Setup auto-switch timer
                     if scene.auto_switch_after and scene.next_scene:
-                        timer_task = asyncio.create_task(
-                            self._auto_switch_timer(scene.auto_switch_after, scene.next_scene)
+                        self._auto_switch_handle = self._timed_scheduler.schedule(
+                            partial(self.switch_scene, scene.next_scene),
+                            asyncio.get_running_loop().time() + scene.auto_switch_after
                         )
-                        self.scene_timers[scene_name] = timer_task
                     
                     # Apply scene configuration
                     await self._apply_scene_configuration(scene)
                     
+                    # Refresh dynamic overlays shown in the new scene
+                    scene_sources = {item.source_name for item in scene.items}
+                    await self.warm_overlays(
+                        name for name, overlay in self.overlay_elements.items()
+                        if overlay.source_name in scene_sources
+                        and (overlay.update_frequency or name in self._content_generators)
+                    )
+                    
                     await self.log_activity("scene_switched", {
                         "from_scene": old_scene,
                         "to_scene": scene_name,
@@ -334,79 +695,287 @@ class SceneController(BaseModule):
             self.logger.error(f"Error switching scene: {str(e)}")
             return False
     
-    async def _set_transition(self, transition: SceneTransition, duration: int):
-        """Set OBS transition"""
+    async def _obs_call(self, request_type: str, payload: Dict[str, Any], lm=None) -> Any:
+        """Send a single OBS request, logging (not raising) failures"""
+        lm = lm or self.livestream_manager
+        if not lm:
+            return None
         try:
-            if not self.livestream_manager:
-                return
-            
-            # Set transition type
-            await self.livestream_manager._send_obs_request("SetCurrentSceneTransition", {
-                "transitionName": transition.value
-            })
-            
-            # Set transition duration
-            await self.livestream_manager._send_obs_request("SetCurrentSceneTransitionDuration", {
-                "transitionDuration": duration
-            })
-            
+            return await lm._send_obs_request(request_type, payload)
         except Exception as e:
-            self.logger.error(f"Error setting transition: {str(e)}")
+            self.logger.error(f"OBS {request_type} failed: {str(e)}")
+            return None
+    
+    async def _enqueue_obs_write(self, request_type: str, payload: Dict[str, Any]) -> asyncio.Future:
+        """Queue an OBS write for the single writer task
+        
+        Returns a future resolved once the write is sent, or failed with the send error.
+        """
+        done = asyncio.get_running_loop().create_future()
+        done.add_done_callback(_consume_exception)
+        if not self.livestream_manager:
+            done.set_result(None)
+            return done
+        
+        if self._obs_writer_task is None or self._obs_writer_task.done():
+            self._obs_writer_task = asyncio.create_task(self._obs_writer_loop())
+        await self._obs_queue.put((request_type, payload, done))
+        return done
+    
+    @staticmethod
+    def _obs_write_key(request_type: str, payload: Dict[str, Any]) -> Tuple:
+        """Coalescing key: later writes to the same target replace earlier ones"""
+        return (
+            request_type,
+            payload.get("inputName") or (payload.get("sceneName"), payload.get("sceneItemId"))
+        )
+    
+    async def _obs_writer_loop(self):
+        """Drain queued OBS writes, dropping stale ones, and send them as a batch
+        
+        Failed batches are retried with backoff, merged with newer writes; callers
+        wait for the final outcome, and writes still failing after the last retry
+        are dropped so they can never land after their callers saw the failure.
+        """
+        lm = self.livestream_manager
+        queue = self._obs_queue
+        # key -> (request type, payload, futures of every write coalesced into it)
+        pending: Dict[Tuple, Tuple[str, Dict[str, Any], List[asyncio.Future]]] = {}
+        fail_count = 0
+        
+        def add_write(request_type, payload, done):
+            key = self._obs_write_key(request_type, payload)
+            previous = pending.pop(key, None)
+            waiters = previous[2] if previous else []
+            waiters.append(done)
+            pending[key] = (request_type, payload, waiters)
+        
+        while True:
+            try:
+                if not pending:
+                    add_write(*await queue.get())
+                
+                for _ in range(queue.qsize()):
+                    add_write(*queue.get_nowait())
+                
+                error = None
+                try:
+                    await self._send_obs_writes(lm, [
+                        (request_type, payload) for request_type, payload, _ in pending.values()
+                    ])
+                except Exception as e:
+                    if fail_count < self.obs_write_max_retries:
+                        log = self.logger.warning if fail_count == 0 else self.logger.debug
+                        log(f"OBS write batch failed (failure {fail_count + 1}), retrying: {str(e)}")
+                        await asyncio.sleep(self._backoff_delay(self.obs_write_retry_delay, fail_count))
+                        fail_count += 1
+                        continue
+                    
+                    self.logger.error(
+                        f"Dropping {len(pending)} OBS writes after {fail_count + 1} failed attempts: {str(e)}"
+                    )
+                    error = e
+                
+                for _, _, waiters in pending.values():
+                    for done in waiters:
+                        if done.done():
+                            continue
+                        if error is None:
+                            done.set_result(None)
+                        else:
+                            done.set_exception(error)
+                pending = {}
+                fail_count = 0
+                
+            except asyncio.CancelledError:
+                break
     
-    async def _auto_switch_timer(self, delay: int, next_scene: str):
-        """Auto-switch timer for scene transitions"""
+    async def _send_obs_writes(self, lm, writes: List[Tuple[str, Dict[str, Any]]]):
+        """Send coalesced writes, as pre-serialized frames where the manager supports them"""
+        send_raw = getattr(lm, "_send_obs_raw", None)
+        if send_raw is not None:
+            batched = []
+            for request_type, payload in writes:
+                template = self._request_template(request_type, payload)
+                if template is None:
+                    batched.append((request_type, payload))
+                    continue
+                try:
+                    await send_raw(_fill_request_template(template))
+                except Exception as e:
+                    # Fall back to the regular request API for this write
+                    self.logger.error(f"OBS raw {request_type} frame failed: {str(e)}")
+                    batched.append((request_type, payload))
+            writes = batched
+        
+        await self._send_obs_batch(lm, [
+            {"requestType": request_type, "requestData": payload} for request_type, payload in writes
+        ])
+    
+    def _request_template(self, request_type: str, payload: Dict[str, Any]) -> Optional[Tuple[bytes, bytes]]:
+        """Serialized template for requests sent as raw frames (cached per setting), else None"""
+        field_name = _RAW_FRAME_REQUESTS.get(request_type)
+        if field_name is None:
+            return None
+        key = (request_type, payload[field_name])
+        template = self._request_frame_cache.get(key)
+        if template is None:
+            template = self._request_frame_cache[key] = _build_request_template(request_type, payload)
+        return template
+    
+    @staticmethod
+    def _transition_requests(transition: SceneTransition, duration: int) -> List[Tuple[str, Dict[str, Any]]]:
+        """OBS requests setting the transition type and duration"""
+        return [
+            ("SetCurrentSceneTransition", {"transitionName": transition.value}),
+            ("SetCurrentSceneTransitionDuration", {"transitionDuration": duration})
+        ]
+    
+    async def _set_transition(self, transition: SceneTransition, duration: int):
+        """Set OBS transition type and duration through the writer queue"""
+        writes = [
+            await self._enqueue_obs_write(request_type, payload)
+            for request_type, payload in self._transition_requests(transition, duration)
+        ]
         try:
-            await asyncio.sleep(delay)
-            await self.switch_scene(next_scene)
-        except asyncio.CancelledError:
-            pass
+            await asyncio.gather(*writes)
         except Exception as e:
-            self.logger.error(f"Error in auto-switch timer: {str(e)}")
+            self.logger.error(f"Error setting transition: {str(e)}")
     
     async def _apply_scene_configuration(self, scene: Scene):
-        """Apply scene item configurations"""
+        """Apply scene item configurations through the writer queue, sent as one batch"""
         try:
-            for item in scene.items:
+            if self.livestream_manager is None:
+                return
+            
+            scene_name = scene.name
+            last_applied = self._last_applied_transform
+            requests = []
+            applied_transforms = {}
+            positions, scales = scene._positions, scene._scales
+            for item, name, item_id, signature in zip(
+                scene.items, scene._names, scene._item_ids,
+                zip(positions[0::2], positions[1::2], scales[0::2], scales[1::2], scene._rotations)
+            ):
+                if item_id == _UNRESOLVED_ITEM_ID:
+                    self.logger.warning(f"No OBS item ID for {item.source_name} in scene {scene_name}")
+                    continue
+                
                 # Update item visibility
-                if self.livestream_manager:
-                    await self._set_scene_item_enabled(scene.name, item.name, item.visible)
-                    
-                    # Update item transform
-                    if item.position != (0, 0) or item.scale != (1.0, 1.0):
-                        await self._set_scene_item_transform(scene.name, item.name, {
-                            "positionX": item.position[0],
-                            "positionY": item.position[1],
-                            "scaleX": item.scale[0],
-                            "scaleY": item.scale[1],
-                            "rotation": item.rotation
-                        })
+                requests.append({
+                    "requestType": "SetSceneItemEnabled",
+                    "requestData": {
+                        "sceneName": scene_name,
+                        "sceneItemId": item_id,
+                        "sceneItemEnabled": item.visible
+                    }
+                })
+                
+                # Update item transform (identity or already-applied transforms are skipped)
+                key = (scene_name, name)
+                if last_applied.get(key, _IDENTITY_TRANSFORM) != signature:
+                    applied_transforms[key] = signature
+                    position_x, position_y, scale_x, scale_y, rotation = signature
+                    requests.append({
+                        "requestType": "SetSceneItemTransform",
+                        "requestData": {
+                            "sceneName": scene_name,
+                            "sceneItemId": item_id,
+                            "sceneItemTransform": {
+                                "positionX": position_x,
+                                "positionY": position_y,
+                                "scaleX": scale_x,
+                                "scaleY": scale_y,
+                                "rotation": rotation
+                            }
+                        }
+                    })
+            
+            writes = [
+                await self._enqueue_obs_write(request["requestType"], request["requestData"])
+                for request in requests
+            ]
+            await asyncio.gather(*writes)
+            last_applied.update(applied_transforms)
             
         except Exception as e:
             self.logger.error(f"Error applying scene configuration: {str(e)}")
     
-    async def _set_scene_item_enabled(self, scene_name: str, item_name: str, enabled: bool):
-        """Set scene item visibility"""
-        try:
-            if self.livestream_manager:
-                await self.livestream_manager._send_obs_request("SetSceneItemEnabled", {
-                    "sceneName": scene_name,
-                    "sceneItemId": item_name,  # This should be the actual item ID
-                    "sceneItemEnabled": enabled
-                })
-        except Exception as e:
-            self.logger.error(f"Error setting scene item enabled: {str(e)}")
+    @staticmethod
+    async def _send_obs_batch(lm, requests: List[Dict[str, Any]]):
+        """Send OBS requests in one round-trip (RequestBatch) when supported"""
+        if not requests or lm is None:
+            return
+        
+        send_batch = getattr(lm, "_send_obs_batch", None)
+        if send_batch is not None:
+            await send_batch([{**request, "requestId": _new_request_id()} for request in requests])
+        else:
+            # Fall back to issuing the requests concurrently
+            send_request = lm._send_obs_request
+            await asyncio.gather(*(
+                send_request(request["requestType"], request["requestData"])
+                for request in requests
+            ))
     
-    async def _set_scene_item_transform(self, scene_name: str, item_name: str, transform: Dict[str, Any]):
-        """Set scene item transform properties"""
+    async def _resolve_scene_item_ids(self, scene: Scene):
+        """Resolve OBS scene item IDs for a scene with one GetSceneItemList request"""
         try:
-            if self.livestream_manager:
-                await self.livestream_manager._send_obs_request("SetSceneItemTransform", {
-                    "sceneName": scene_name,
-                    "sceneItemId": item_name,  # This should be the actual item ID
-                    "sceneItemTransform": transform
-                })
+            if _UNRESOLVED_ITEM_ID not in scene._item_ids:
+                return
+            
+            cache = self._scene_item_id_cache
+            if any((scene.name, item.source_name) not in cache for item in scene.items):
+                if not self.livestream_manager:
+                    return
+                
+                response = await self._obs_call("GetSceneItemList", {"sceneName": scene.name})
+                for scene_item in (response or {}).get("sceneItems", []):
+                    cache[(scene.name, scene_item["sourceName"])] = scene_item["sceneItemId"]
+                    self._scene_item_sources[(scene.name, scene_item["sceneItemId"])] = scene_item["sourceName"]
+            
+            item_ids = scene._item_ids
+            for index, item in enumerate(scene.items):
+                item_ids[index] = cache.get((scene.name, item.source_name), _UNRESOLVED_ITEM_ID)
+                
         except Exception as e:
-            self.logger.error(f"Error setting scene item transform: {str(e)}")
+            self.logger.error(f"Error resolving scene item IDs: {str(e)}")
+    
+    def _invalidate_scene_item_ids(self):
+        """Forget resolved scene item IDs (e.g. after a scene collection change)"""
+        self._scene_item_id_cache.clear()
+        self._scene_item_sources.clear()
+        self._last_applied_transform.clear()
+        for scene in self.scenes.values():
+            scene._item_ids = array("i", [_UNRESOLVED_ITEM_ID]) * len(scene.items)
+    
+    async def handle_obs_event(self, event_type: str, event_data: Dict[str, Any] = None):
+        """Handle events reported by OBS"""
+        event_data = event_data or {}
+        
+        if event_type == "CurrentSceneCollectionChanged":
+            self._invalidate_scene_item_ids()
+            self._written_overlay_content.clear()
+        elif event_type == "SceneItemEnableStateChanged":
+            # Reflect visibility changes made in OBS on the matching overlay
+            scene_name = event_data.get("sceneName")
+            source_name = self._scene_item_sources.get((scene_name, event_data.get("sceneItemId")))
+            overlay = self._source_to_overlay.get(source_name)
+            if overlay and scene_name == self.current_scene:
+                self.active_overlays[overlay.name] = bool(event_data.get("sceneItemEnabled"))
+                self._overlays_snapshot = None
+    
+    async def _set_scene_item_enabled(self, scene_name: str, item: SceneItem, enabled: bool):
+        """Set scene item visibility"""
+        item_id = self._scene_item_id_cache.get((scene_name, item.source_name))
+        if item_id is None:
+            self.logger.warning(f"No OBS item ID for {item.source_name} in scene {scene_name}")
+            return
+        await self._enqueue_obs_write("SetSceneItemEnabled", {
+            "sceneName": scene_name,
+            "sceneItemId": item_id,
+            "sceneItemEnabled": enabled
+        })
     
     async def show_overlay(self, overlay_name: str, duration: Optional[int] = None) -> bool:
         """Show overlay element"""
@@ -422,11 +991,16 @@ class SceneController(BaseModule):
                 await self._set_source_visibility(overlay.source_name, True)
             
             self.active_overlays[overlay_name] = True
+            self._overlays_snapshot = None
             
             # Auto-hide timer
             hide_duration = duration or overlay.auto_hide_after
+            self._timed_scheduler.cancel(self._hide_handles.pop(overlay_name, None))
             if hide_duration:
-                asyncio.create_task(self._auto_hide_overlay(overlay_name, hide_duration))
+                self._hide_handles[overlay_name] = self._timed_scheduler.schedule(
+                    partial(self.hide_overlay, overlay_name),
+                    asyncio.get_running_loop().time() + hide_duration
+                )
             
             # Apply animation
             if overlay.animation:
@@ -447,11 +1021,14 @@ class SceneController(BaseModule):
             
             overlay = self.overlay_elements[overlay_name]
             
+            self._timed_scheduler.cancel(self._hide_handles.pop(overlay_name, None))
+            
             # Set overlay invisible
             if self.livestream_manager:
                 await self._set_source_visibility(overlay.source_name, False)
             
             self.active_overlays[overlay_name] = False
+            self._overlays_snapshot = None
             
             self.logger.info(f"Hid overlay: {overlay_name}")
             return True
@@ -460,25 +1037,28 @@ class SceneController(BaseModule):
             self.logger.error(f"Error hiding overlay: {str(e)}")
             return False
     
-    async def _auto_hide_overlay(self, overlay_name: str, delay: int):
-        """Auto-hide overlay after delay"""
-        try:
-            await asyncio.sleep(delay)
-            await self.hide_overlay(overlay_name)
-        except Exception as e:
-            self.logger.error(f"Error in auto-hide overlay: {str(e)}")
-    
     async def _set_source_visibility(self, source_name: str, visible: bool):
         """Set source visibility in current scene"""
-        try:
-            if self.livestream_manager and self.current_scene:
-                await self.livestream_manager._send_obs_request("SetSceneItemEnabled", {
-                    "sceneName": self.current_scene,
-                    "sceneItemId": source_name,  # This should be the actual item ID
-                    "sceneItemEnabled": visible
-                })
-        except Exception as e:
-            self.logger.error(f"Error setting source visibility: {str(e)}")
+        if not self.current_scene:
+            return
+        if self._scene_indexes_dirty:
+            self._rebuild_scene_indexes()
+        
+        item = next((
+            item for scene_name, item in self._source_to_scene_items.get(source_name, ())
+            if scene_name == self.current_scene
+        ), None)
+        if item is None:
+            self.logger.warning(f"No item for {source_name} in scene {self.current_scene}")
+            return
+        await self._set_scene_item_enabled(self.current_scene, item, visible)
+    
+    async def hide_overlay_by_source(self, source_name: str) -> bool:
+        """Hide the overlay bound to an OBS source"""
+        overlay = self._source_to_overlay.get(source_name)
+        if overlay is None:
+            return False
+        return await self.hide_overlay(overlay.name)
     
     async def _apply_overlay_animation(self, overlay_name: str, animation: str):
         """Apply animation to overlay element"""
@@ -513,82 +1093,168 @@ class SceneController(BaseModule):
         # Implementation would depend on OBS filter capabilities
         pass
     
-    async def update_overlay_content(self, overlay_name: str, content: Any = None):
-        """Update overlay element content"""
+    async def update_overlay_content(self, overlay_name: str, content: Any = None, force: bool = False) -> bool:
+        """Update overlay element content; force re-pushes content OBS already shows"""
+        try:
+            await self._refresh_overlay_content(overlay_name, content, force=force)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error updating overlay content: {str(e)}")
+            return False
+    
+    async def resync_overlays(self):
+        """Re-push every overlay's current content, e.g. after OBS reconnects"""
+        self._written_overlay_content.clear()
+        await asyncio.gather(*(
+            self.update_overlay_content(name, overlay.content, force=True)
+            for name, overlay in self.overlay_elements.items()
+            if overlay.content is not None
+        ))
+    
+    async def _refresh_overlay_content(
+        self,
+        overlay_name: str,
+        content: Any = None,
+        wait: bool = True,
+        force: bool = False
+    ):
+        """Update overlay content, raising on failure
+        
+        With wait, returns once the debounced OBS write is sent and raises if it failed.
+        """
+        overlay = self.overlay_elements.get(overlay_name)
+        if overlay is None:
+            return
+        
+        # Generate dynamic content if not provided
+        if content is None:
+            content = await self._generate_overlay_content(overlay_name)
+        
+        if content != overlay.content:
+            overlay.content = content
+            overlay._cached_dict = None
+            self._overlays_snapshot = None
+        
+        # Skip writes of content OBS is already known to show
+        written = self._written_overlay_content.get(overlay_name, _UNWRITTEN)
+        if not force and written is not _UNWRITTEN and written == content:
+            return
+        
+        write = self._schedule_overlay_write(overlay_name)
+        if wait:
+            await write
+    
+    def _schedule_overlay_write(self, overlay_name: str) -> asyncio.Future:
+        """Debounce the OBS write so bursts of updates collapse into one request"""
+        loop = asyncio.get_running_loop()
+        scheduler = self._timed_scheduler
+        scheduler.cancel(self._pending_overlay_writes.pop(overlay_name, None))
+        self._pending_overlay_writes[overlay_name] = scheduler.schedule(
+            partial(self._flush_overlay_write, overlay_name),
+            loop.time() + self.overlay_write_debounce
+        )
+        
+        waiter = self._overlay_write_waiters.get(overlay_name)
+        if waiter is None:
+            waiter = self._overlay_write_waiters[overlay_name] = loop.create_future()
+            waiter.add_done_callback(_consume_exception)
+        return waiter
+    
+    async def _flush_overlay_write(self, overlay_name: str):
+        """Send the latest overlay content once the debounce window closes"""
+        self._pending_overlay_writes.pop(overlay_name, None)
+        waiter = self._overlay_write_waiters.pop(overlay_name, None)
+        try:
+            await self._write_overlay_content(overlay_name)
+        except Exception as e:
+            # The writer task already logged and will retry; callers see the error
+            if waiter and not waiter.done():
+                waiter.set_exception(e)
+        else:
+            if waiter and not waiter.done():
+                waiter.set_result(None)
+    
+    async def _write_overlay_content(self, overlay_name: str):
+        """Write current overlay content to its OBS source"""
+        overlay = self.overlay_elements.get(overlay_name)
+        if overlay is None:
+            return
+        
+        content = overlay.content
         try:
-            if overlay_name not in self.overlay_elements:
-                return
-            
-            overlay = self.overlay_elements[overlay_name]
-            
-            # Generate dynamic content if not provided
-            if content is None:
-                content = await self._generate_overlay_content(overlay_name)
-            
             # Update content based on overlay type
             if overlay.type == "text":
                 await self._update_text_source(overlay.source_name, content)
             elif overlay.type == "browser_source":
                 await self._update_browser_source(overlay.source_name, content)
-            
-            overlay.content = content
-            
-        except Exception as e:
-            self.logger.error(f"Error updating overlay content: {str(e)}")
+        except Exception:
+            # OBS state is unknown after a failed write, so never skip the next one
+            self._written_overlay_content.pop(overlay_name, None)
+            raise
+        self._written_overlay_content[overlay_name] = content
+    
+    async def warm_overlays(self, overlay_names: Iterable[str]):
+        """Update several overlays concurrently, without waiting for the OBS writes"""
+        overlay_names = list(overlay_names)
+        results = await asyncio.gather(
+            *(self._refresh_overlay_content(name, wait=False) for name in overlay_names),
+            return_exceptions=True
+        )
+        for name, result in zip(overlay_names, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Error updating overlay content for {name}: {str(result)}")
     
     async def _generate_overlay_content(self, overlay_name: str) -> str:
         """Generate dynamic content for overlay"""
         try:
-            if overlay_name == "subscriber_count":
-                # This would fetch real subscriber count
-                return "Subscribers: 1,234"
-            elif overlay_name == "stream_timer":
-                # Calculate stream duration
-                return f"Stream Time: {datetime.utcnow().strftime('%H:%M:%S')}"
-            elif overlay_name == "recent_follower":
-                # This would fetch recent follower
-                return "Welcome, NewFollower123!"
-            else:
-                return "Dynamic Content"
+            generator = self._content_generators.get(overlay_name)
+            return await generator() if generator else "Dynamic Content"
                 
         except Exception as e:
             self.logger.error(f"Error generating overlay content: {str(e)}")
             return ""
     
+    async def _gen_subscriber_count(self) -> str:
+        # This would fetch real subscriber count
+        return "Subscribers: 1,234"
+    
+    async def _gen_stream_timer(self) -> str:
+        # Calculate stream duration
+        elapsed = int(time.monotonic() - self._stream_start)
+        hours, remainder = divmod(elapsed, 3600)
+        minutes, seconds = divmod(remainder, 60)
+        return f"Stream Time: {hours:02d}:{minutes:02d}:{seconds:02d}"
+    
+    async def _gen_recent_follower(self) -> str:
+        # This would fetch recent follower
+        return "Welcome, NewFollower123!"
+    
     async def _update_text_source(self, source_name: str, text: str):
         """Update text source content"""
-        try:
-            if self.livestream_manager:
-                await self.livestream_manager._send_obs_request("SetInputSettings", {
-                    "inputName": source_name,
-                    "inputSettings": {
-                        "text": text
-                    }
-                })
-        except Exception as e:
-            self.logger.error(f"Error updating text source: {str(e)}")
+        await (await self._enqueue_obs_write("SetInputSettings", {
+            "inputName": source_name,
+            "inputSettings": {"text": text}
+        }))
     
     async def _update_browser_source(self, source_name: str, url: str):
         """Update browser source URL"""
-        try:
-            if self.livestream_manager:
-                await self.livestream_manager._send_obs_request("SetInputSettings", {
-                    "inputName": source_name,
-                    "inputSettings": {
-                        "url": url
-                    }
-                })
-        except Exception as e:
-            self.logger.error(f"Error updating browser source: {str(e)}")
+        await (await self._enqueue_obs_write("SetInputSettings", {
+            "inputName": source_name,
+            "inputSettings": {"url": url}
+        }))
     
     async def trigger_event_scene(self, event_type: str, data: Dict[str, Any] = None):
         """Trigger scene change based on event"""
         try:
-            event_config = self.auto_switch_rules.get("event_triggered", {}).get(event_type)
+            if self._scene_indexes_dirty:
+                self._rebuild_scene_indexes()
+            
+            # Scenes declaring this trigger take precedence over auto-switch rules
+            trigger_scenes = self._trigger_to_scenes.get(event_type)
+            entry = (trigger_scenes[0], None) if trigger_scenes else self._event_scene_table.get(event_type)
             
-            if event_config:
-                scene_name = event_config["scene"]
-                duration = event_config.get("duration")
+            if entry:
+                scene_name, duration = entry
                 
                 if scene_name in self.scenes:
                     # Store current scene to return to
@@ -598,9 +1264,12 @@ class SceneController(BaseModule):
                     await self.switch_scene(scene_name)
                     
                     # Auto-return to previous scene
+                    self._timed_scheduler.cancel(self._return_handle)
+                    self._return_handle = None
                     if duration and previous_scene:
-                        asyncio.create_task(
-                            self._return_to_scene(duration, previous_scene)
+                        self._return_handle = self._timed_scheduler.schedule(
+                            partial(self._return_to_scene, previous_scene),
+                            asyncio.get_running_loop().time() + duration
                         )
                     
                     await self.log_activity("event_scene_triggered", {
@@ -613,42 +1282,30 @@ class SceneController(BaseModule):
         except Exception as e:
             self.logger.error(f"Error triggering event scene: {str(e)}")
     
-    async def _return_to_scene(self, delay: int, scene_name: str):
-        """Return to specified scene after delay"""
-        try:
-            await asyncio.sleep(delay)
-            await self.switch_scene(scene_name)
-        except Exception as e:
-            self.logger.error(f"Error returning to scene: {str(e)}")
+    async def _return_to_scene(self, scene_name: str):
+        """Return-timer job: switch back to the scene active before an event"""
+        self._return_handle = None
+        await self.switch_scene(scene_name)
+    
+    def _rebuild_scene_indexes(self):
+        """Index scenes by their event triggers and items by source name"""
+        self._trigger_to_scenes.clear()
+        self._source_to_scene_items.clear()
+        for scene in self.scenes.values():
+            for trigger in scene.triggers:
+                self._trigger_to_scenes[trigger].append(scene.name)
+            for item in scene.items:
+                self._source_to_scene_items[item.source_name].append((scene.name, item))
+        self._scene_indexes_dirty = False
     
     async def create_scene(self, scene_name: str, scene_config: Dict[str, Any]) -> bool:
         """Create new scene configuration"""
         try:
-            # Parse scene configuration
-            items = []
-            for item_config in scene_config.get("items", []):
-                item = SceneItem(
-                    name=item_config["name"],
-                    source_name=item_config["source_name"],
-                    visible=item_config.get("visible", True),
-                    position=tuple(item_config.get("position", [0, 0])),
-                    scale=tuple(item_config.get("scale", [1.0, 1.0])),
-                    rotation=item_config.get("rotation", 0),
-                    opacity=item_config.get("opacity", 100)
-                )
-                items.append(item)
-            
-            # Create scene
-            scene = Scene(
-                name=scene_name,
-                items=items,
-                transition=SceneTransition(scene_config.get("transition", "Fade")),
-                transition_duration=scene_config.get("transition_duration", 500),
-                auto_switch_after=scene_config.get("auto_switch_after"),
-                next_scene=scene_config.get("next_scene")
-            )
+            scene = self._build_scene(scene_name, scene_config)
+            self._register_scene(scene)
             
-            self.scenes[scene_name] = scene
+            # Resolve OBS scene item IDs up front
+            await self._resolve_scene_item_ids(scene)
             
             self.logger.info(f"Created scene: {scene_name}")
             return True
@@ -660,27 +1317,12 @@ class SceneController(BaseModule):
     async def create_overlay(self, overlay_name: str, overlay_config: Dict[str, Any]) -> bool:
         """Create new overlay element"""
         try:
-            overlay = OverlayElement(
-                name=overlay_name,
-                type=overlay_config["type"],
-                source_name=overlay_config["source_name"],
-                content=overlay_config.get("content"),
-                position=tuple(overlay_config.get("position", [0, 0])),
-                size=tuple(overlay_config.get("size", [100, 50])),
-                visible=overlay_config.get("visible", True),
-                animation=overlay_config.get("animation"),
-                auto_hide_after=overlay_config.get("auto_hide_after"),
-                update_frequency=overlay_config.get("update_frequency")
-            )
+            overlay = self._build_overlay(overlay_name, overlay_config)
+            self._register_overlay(overlay)
             
-            self.overlay_elements[overlay_name] = overlay
-            
-            # Start update task if needed
+            # Schedule periodic updates if needed
             if overlay.update_frequency:
-                task = asyncio.create_task(
-                    self._update_overlay_loop(overlay_name, overlay.update_frequency)
-                )
-                self.overlay_update_tasks[overlay_name] = task
+                self._schedule_overlay_update(overlay_name)
             
             self.logger.info(f"Created overlay: {overlay_name}")
             return True
@@ -689,23 +1331,38 @@ class SceneController(BaseModule):
             self.logger.error(f"Error creating overlay: {str(e)}")
             return False
     
-    def get_scenes(self) -> Dict[str, Dict[str, Any]]:
-        """Get all scene configurations"""
+    async def cleanup(self):
+        """Stop all timers and the OBS writer task"""
+        self._timed_scheduler.stop()
+        self._auto_switch_handle = None
+        self._return_handle = None
+        self._hide_handles.clear()
+        self._overlay_update_handles.clear()
+        self._pending_overlay_writes.clear()
+        for waiter in self._overlay_write_waiters.values():
+            waiter.cancel()
+        self._overlay_write_waiters.clear()
+        
+        if self._obs_writer_task and not self._obs_writer_task.done():
+            self._obs_writer_task.cancel()
+            try:
+                await self._obs_writer_task
+            except asyncio.CancelledError:
+                pass
+        self._obs_writer_task = None
+    
+    def get_scenes(self) -> Mapping[str, Dict[str, Any]]:
+        """Get all scene configurations (cached read-only view)"""
+        if self._scenes_snapshot is None:
+            self._scenes_snapshot = MappingProxyType(self._build_scenes_snapshot())
+        return self._scenes_snapshot
+    
+    def _build_scenes_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Serialize all scene configurations"""
         return {
             name: {
                 "name": scene.name,
-                "items": [
-                    {
-                        "name": item.name,
-                        "source_name": item.source_name,
-                        "visible": item.visible,
-                        "position": item.position,
-                        "scale": item.scale,
-                        "rotation": item.rotation,
-                        "opacity": item.opacity
-                    }
-                    for item in scene.items
-                ],
+                "items": [item.as_dict() for item in scene.items],
                 "transition": scene.transition.value,
                 "transition_duration": scene.transition_duration,
                 "auto_switch_after": scene.auto_switch_after,
@@ -714,34 +1371,29 @@ class SceneController(BaseModule):
             for name, scene in self.scenes.items()
         }
     
-    def get_overlays(self) -> Dict[str, Dict[str, Any]]:
-        """Get all overlay configurations"""
+    def get_overlays(self) -> Mapping[str, Dict[str, Any]]:
+        """Get all overlay configurations (cached read-only view)"""
+        if self._overlays_snapshot is None:
+            self._overlays_snapshot = MappingProxyType(self._build_overlays_snapshot())
+        return self._overlays_snapshot
+    
+    def _build_overlays_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Serialize all overlay configurations"""
         return {
-            name: {
-                "name": overlay.name,
-                "type": overlay.type,
-                "source_name": overlay.source_name,
-                "content": overlay.content,
-                "position": overlay.position,
-                "size": overlay.size,
-                "visible": overlay.visible,
-                "animation": overlay.animation,
-                "auto_hide_after": overlay.auto_hide_after,
-                "update_frequency": overlay.update_frequency,
-                "active": self.active_overlays.get(name, False)
-            }
+            name: {**overlay.as_dict(), "active": self.active_overlays.get(name, False)}
             for name, overlay in self.overlay_elements.items()
         }
     
     def get_scene_history(self) -> List[Dict[str, Any]]:
         """Get scene switch history"""
+        now = time.monotonic()
         return [
             {
                 "scene": scene,
-                "timestamp": timestamp.isoformat(),
-                "duration": (datetime.utcnow() - timestamp).total_seconds()
+                "timestamp": (self._stream_start_wall + timedelta(seconds=timestamp - self._stream_start)).isoformat(),
+                "duration": now - timestamp
             }
-            for scene, timestamp in self.scene_history[-10:]  # Last 10 switches
+            for scene, timestamp in list(islice(reversed(self.scene_history), 10))[::-1]  # Last 10 switches
         ]
     
     def get_controller_stats(self) -> Dict[str, Any]:
@@ -752,9 +1404,12 @@ class SceneController(BaseModule):
             "total_overlays": len(self.overlay_elements),
             "current_scene": self.current_scene,
             "active_overlays": len([name for name, active in self.active_overlays.items() if active]),
-            "running_timers": len(self.scene_timers),
-            "update_tasks": len(self.overlay_update_tasks),
-            "scene_switches": len(self.scene_history),
+            "running_timers": sum(
+                handle in self._timed_scheduler
+                for handle in (self._auto_switch_handle, self._return_handle, *self._hide_handles.values())
+            ),
+            "update_tasks": len(self._overlay_update_handles),
+            "scene_switches": self.scene_switch_count,
             "connected_to_obs": self.livestream_manager is not None and getattr(self.livestream_manager, 'obs_connection', {}).get('connected', False)
         })
         return stats
\ No newline at end of file
@@ -4,17 +4,158 @@ Comprehensive channel growth tracking, analytics, and prediction system
 """
 
 import asyncio
+import hashlib
 import logging
 import json
-import random
-from typing import Dict, List, Any, Optional, Tuple
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, Iterator, List, Any, NamedTuple, Optional, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
+from types import MappingProxyType
 import uuid
 import math
+import time
+import numpy as np
+
+# Optional JIT for the velocity scan
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Optional IIR filtering for exponential smoothing
+try:
+    from scipy.signal import lfilter
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Analysis timeframe -> days
+_TIMEFRAME_DAYS = {
+    '7d': 7,
+    '30d': 30,
+    '90d': 90,
+    '1y': 365,
+    '6m': 180
+}
+
+# Simulated ranking tiers: (minimum subscribers, global rank range, candidate grades)
+_RANKING_TIERS = (
+    (1000000, (1, 1000), ('A++', 'A+', 'A')),
+    (100000, (1000, 10000), ('A', 'B+', 'B')),
+    (10000, (10000, 100000), ('B', 'C+', 'C')),
+    (0, (100000, 1000000), ('C', 'D', 'F'))
+)
+
+# Growth forecast scenarios as multipliers on the smoothed daily trend
+_SCENARIO_NAMES = ('conservative', 'realistic', 'optimistic')
+_SCENARIO_MULTIPLIERS = np.array([0.6, 1.0, 1.4])
+
+# Milestone thresholds, sorted for binary search
+_SUBSCRIBER_MILESTONES = np.array([1000, 10000, 50000, 100000, 500000, 1000000])
+_VIEW_MILESTONES = np.array([100000, 1000000, 10000000, 100000000])
+
+# Comparison insight templates
+_TPL_GAP = "📊 Performance gap: Leader has {mult:.1f}x more {metric}"
+_TPL_GAP_ZERO = "📊 Leader has {leader:,.0f} {metric}; lowest has zero"
+_TPL_GROW = "🚀 Fastest growing: {cid} with {rate}% monthly growth"
+_TPL_AVG = "📈 Average {metric}: {avg:,.0f}"
+_TPL_DIST = "⚖️ {above}/{total} channels perform above average"
+
+# Shared read-only default for missing trend sections
+_EMPTY = MappingProxyType({})
+
+def _monthly_trend(comparison: Dict[str, Any]) -> Dict[str, Any]:
+    """Monthly growth trend of a comparison bundle, or an empty mapping"""
+    return comparison.get('growth_30d', _EMPTY).get('monthly', _EMPTY)
+
+def _milestone_position(milestones: np.ndarray, value: int) -> Tuple[List[int], Optional[int], float]:
+    """Achieved milestones, next milestone and percent progress toward it"""
+    index = int(np.searchsorted(milestones, value, side='right'))
+    if index == len(milestones):
+        return milestones.tolist(), None, 0
+    
+    next_milestone = int(milestones[index])
+    prev_milestone = int(milestones[index - 1]) if index > 0 else 0
+    progress = (value - prev_milestone) / (next_milestone - prev_milestone) * 100
+    return milestones[:index].tolist(), next_milestone, progress
+
+def _scan_velocities_loop(values):
+    """Single pass over day-over-day changes
+    
+    Returns mean, sample variance, max, min, last-7-day mean and prior-7-day mean.
+    """
+    n = values.shape[0] - 1
+    recent_start = n - 7
+    previous_start = max(n - 14, 0)
+    
+    total = 0.0
+    total_sq = 0.0
+    best = -np.inf
+    worst = np.inf
+    recent_total = 0.0
+    previous_total = 0.0
+    for i in range(n):
+        delta = float(values[i + 1] - values[i])
+        total += delta
+        total_sq += delta * delta
+        if delta > best:
+            best = delta
+        if delta < worst:
+            worst = delta
+        if i >= recent_start:
+            recent_total += delta
+        elif i >= previous_start:
+            previous_total += delta
+    
+    previous_count = recent_start - previous_start
+    previous_avg = previous_total / previous_count if previous_count > 0 else 0.0
+    variance = (total_sq - total * total / n) / (n - 1) if n > 1 else 0.0
+    return total / n, variance, best, worst, recent_total / min(n, 7), previous_avg
+
+def _scan_velocities_numpy(values):
+    """NumPy equivalent of _scan_velocities_loop"""
+    velocities = np.diff(values)
+    previous_week = velocities[-14:-7] if velocities.size >= 14 else velocities[:-7]
+    return (
+        velocities.mean(),
+        velocities.var(ddof=1) if velocities.size > 1 else 0.0,
+        velocities.max(),
+        velocities.min(),
+        velocities[-7:].mean(),
+        previous_week.mean() if previous_week.size else 0.0
+    )
+
+def _ewma(values: np.ndarray, alpha: float) -> np.ndarray:
+    """Exponentially weighted moving average seeded with the first value"""
+    values = np.asarray(values, dtype=np.float64)
+    if SCIPY_AVAILABLE:
+        # s[t] = alpha * x[t] + (1 - alpha) * s[t-1] as a first-order IIR filter
+        return lfilter([alpha], [1.0, alpha - 1.0], values, zi=[(1 - alpha) * values[0]])[0]
+    
+    smoothed = np.empty_like(values)
+    level = values[0]
+    for i, value in enumerate(values.tolist()):
+        level = alpha * value + (1 - alpha) * level
+        smoothed[i] = level
+    return smoothed
+
+def _double_exponential_smoothing(values, alpha: float) -> Tuple[float, float]:
+    """Brown's double exponential smoothing; returns (level, per-step trend)"""
+    first = _ewma(values, alpha)
+    first_level = first[-1]
+    second_level = _ewma(first, alpha)[-1]
+    
+    return float(2 * first_level - second_level), float(alpha / (1 - alpha) * (first_level - second_level))
+
+_scan_velocities = (
+    njit(cache=True, fastmath=True)(_scan_velocities_loop) if NUMBA_AVAILABLE else _scan_velocities_numpy
+)
+
 @dataclass
 class ChannelMetrics:
     """Channel metrics at a specific point in time"""
@@ -27,6 +168,108 @@ class ChannelMetrics:
     engagement_rate: float
     upload_frequency: float  # videos per week
 
+_METRIC_FIELDS = tuple(f.name for f in fields(ChannelMetrics))
+
+@dataclass
+class _ChannelSeries:
+    """Channel history stored column-wise, one array per ChannelMetrics field"""
+    timestamp: np.ndarray  # datetime64[D], one row per day
+    subscribers: np.ndarray
+    total_views: np.ndarray
+    video_count: np.ndarray
+    average_views: np.ndarray
+    estimated_earnings: np.ndarray
+    engagement_rate: np.ndarray
+    upload_frequency: np.ndarray
+    
+    @classmethod
+    def empty(cls) -> '_ChannelSeries':
+        return cls(np.array([], dtype='datetime64[D]'), *(np.array([]) for _ in _METRIC_FIELDS[1:]))
+    
+    def __len__(self) -> int:
+        return len(self.timestamp)
+    
+    def slice(self, start: int, stop: int) -> '_ChannelSeries':
+        """Row range as views onto the same arrays"""
+        return _ChannelSeries(*(getattr(self, name)[start:stop] for name in _METRIC_FIELDS))
+    
+    def metrics_at(self, index: int) -> ChannelMetrics:
+        """Materialize one row as ChannelMetrics"""
+        return ChannelMetrics(**self.row_dict(index))
+    
+    def row_dict(self, index: int) -> Dict[str, Any]:
+        """One row as a ChannelMetrics-shaped dict, without building the dataclass"""
+        row = {'timestamp': self.timestamp[index].astype('datetime64[us]').item()}
+        row.update((name, getattr(self, name)[index].item()) for name in _METRIC_FIELDS[1:])
+        return row
+
+@dataclass
+class _ComparisonColumns:
+    """Columnar view of the comparison bundle fields read by the analytics passes"""
+    ids: List[str]
+    values: np.ndarray
+    growth_rates: np.ndarray
+    velocities: List[str]
+    
+    def take(self, order: np.ndarray) -> '_ComparisonColumns':
+        """Columns reordered by an index array"""
+        return _ComparisonColumns(
+            ids=[self.ids[i] for i in order],
+            values=self.values[order],
+            growth_rates=self.growth_rates[order],
+            velocities=[self.velocities[i] for i in order]
+        )
+
+def _project_comparison(comparison_data: List[Dict[str, Any]], metric: str) -> _ComparisonColumns:
+    """Project comparison bundles into parallel columns for one metric"""
+    monthly = [_monthly_trend(c) for c in comparison_data]
+    return _ComparisonColumns(
+        ids=[c['channel_id'] for c in comparison_data],
+        values=np.array([c['current_metrics'].get(metric, 0) for c in comparison_data]),
+        growth_rates=np.array([m.get('subscriber_growth_rate', 0) for m in monthly], dtype=np.float64),
+        velocities=[m.get('growth_velocity', 'unknown') for m in monthly]
+    )
+
+def _relative_performance_batch(values: np.ndarray, best_value: float,
+                                round_output: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Relative percentage, gap to the leader and leading mask for every compared value"""
+    if best_value:
+        relative = values * (100.0 / best_value)
+        if round_output:
+            relative = relative.round(1)
+    else:
+        relative = np.zeros(values.shape)
+    
+    # The leader and channels level with it (even at zero) are at exactly 100%
+    leading = values >= best_value
+    relative[leading] = 100.0
+    return relative, best_value - values, leading
+
+def _comparison_insight_lines(metric: str, channel_count: int, leader_value: float, last_value: float,
+                              champion_id: Optional[str], champion_rate: float,
+                              avg: float, above_avg: int) -> Iterator[str]:
+    """Yield comparison insights from the aggregates they depend on"""
+    # Performance gap insight; a ratio against a zero last place says nothing
+    if last_value > 0:
+        yield _TPL_GAP.format(mult=leader_value / last_value, metric=metric)
+    elif leader_value > 0:
+        yield _TPL_GAP_ZERO.format(leader=leader_value, metric=metric)
+    
+    # Growth insights
+    if champion_id is not None:
+        yield _TPL_GROW.format(cid=champion_id, rate=champion_rate)
+    
+    # Average performance
+    yield _TPL_AVG.format(metric=metric, avg=avg)
+    
+    # Performance distribution
+    yield _TPL_DIST.format(above=above_avg, total=channel_count)
+
+@lru_cache(maxsize=256, typed=True)
+def _render_comparison_insights(*aggregates) -> Tuple[str, ...]:
+    """Memoized tuple of the comparison insights for one set of aggregates"""
+    return tuple(_comparison_insight_lines(*aggregates))
+
 @dataclass
 class GrowthTrend:
     """Growth trend analysis"""
@@ -50,15 +293,60 @@ class ChannelRanking:
     subscriber_rank: int
     view_rank: int
 
+class RelativePerformance(NamedTuple):
+    """Channel performance relative to the comparison leader"""
+    relative_percentage: float
+    gap_to_leader: float
+    performance_vs_leader: str  # leading, following
+
 class GrowthTracker:
     """Social Blade-inspired growth tracking system"""
     
+    # (signal, threshold, recommendations) applied when the signal falls below the threshold
+    _CONDITIONAL_RECOMMENDATIONS = (
+        ('recent_growth', 1, (
+            "📈 Focus on increasing upload frequency to boost growth",
+            "🎯 Analyze top-performing videos and create similar content"
+        )),
+        ('engagement_rate', 0.03, (
+            "💬 Improve engagement by asking questions and encouraging comments",
+            "👍 Add clear call-to-actions for likes and subscriptions"
+        )),
+        ('upload_frequency', 1, (
+            "⏰ Maintain consistent upload schedule (at least weekly)",
+        )),
+        ('views_per_subscriber', 0.1, (
+            "🔍 Optimize video titles and thumbnails for better click-through rates",
+            "📊 Use YouTube Analytics to understand audience retention"
+        ))
+    )
+    
+    _GENERAL_RECOMMENDATIONS = (
+        "🎨 A/B test thumbnails to improve click-through rates",
+        "📝 Optimize video descriptions with relevant keywords",
+        "🔗 Collaborate with other creators in your niche",
+        "📱 Optimize content for mobile viewing",
+        "⏰ Post at optimal times for your audience"
+    )
+    
+    _MAX_RECOMMENDATIONS = 8
+    
     def __init__(self):
-        self.channel_data = {}  # channel_id -> historical data
+        self.channel_data: Dict[str, _ChannelSeries] = {}  # channel_id -> historical data
         self.growth_predictions = {}
         self.ranking_data = {}
         self.milestones = {}
         
+        # Per-channel snapshots of current metrics and ranking: channel_id -> (monotonic time, result)
+        self.snapshot_ttl = 60  # seconds
+        self._metrics_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._ranking_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # Whole analyses per channel and window: channel_id -> {timeframe: (monotonic time, result)}
+        self._derived_cache: Dict[str, Dict[str, Tuple[float, Dict[str, Any]]]] = {}
+        
+        # Stable per-channel hash that seeds the simulated ranking
+        self._rank_hashes: Dict[str, int] = {}
+        
         # Growth rate thresholds
         self.growth_thresholds = {
             'explosive': 0.5,    # 50%+ growth
@@ -68,6 +356,16 @@ class GrowthTracker:
             'stagnant': 0.0,     # No growth
             'declining': -0.01   # Negative growth
         }
+        
+        # Velocity lookup table: sorted lower bounds, anything below the lowest is declining
+        velocity_bins = sorted(
+            (threshold, name) for name, threshold in self.growth_thresholds.items() if name != 'declining'
+        )
+        self._velocity_edges = [threshold for threshold, _ in velocity_bins]
+        self._velocity_labels = ['declining'] + [name for _, name in velocity_bins]
+        
+        # Smoothing factor for trend forecasts (higher reacts faster to recent days)
+        self.smoothing_alpha = 0.2
     
     async def track_channel_growth(self, channel_id: str, 
                                  timeframe: str = '30d') -> Dict[str, Any]:
@@ -82,9 +380,13 @@ class GrowthTracker:
             Complete growth analysis
         """
         try:
+            # Callers own the returned dict, so hand out copies of the cached analysis
+            cached = self._cached_snapshot(self._derived_cache.get(channel_id, {}), timeframe)
+            if cached is not None:
+                return dict(cached)
+            
             # Get or create channel data
-            if channel_id not in self.channel_data:
-                await self._initialize_channel_data(channel_id)
+            await self._ensure_channel_data(channel_id)
             
             # Calculate timeframe
             days = self._parse_timeframe(timeframe)
@@ -107,8 +409,9 @@ class GrowthTracker:
                 'recommendations': await self._generate_growth_recommendations(channel_id, historical_data),
                 'ranking': await self._get_channel_ranking(channel_id)
             }
+            self._derived_cache.setdefault(channel_id, {})[timeframe] = (time.monotonic(), growth_analysis)
             
-            return growth_analysis
+            return dict(growth_analysis)
             
         except Exception as e:
             logger.error(f"Growth tracking failed: {e}")
@@ -127,50 +430,89 @@ class GrowthTracker:
             Channel comparison analysis
         """
         try:
-            comparison_data = []
-            
-            for channel_id in channel_ids:
-                # Get current metrics
-                metrics = await self._get_current_metrics(channel_id)
-                growth_data = await self.track_channel_growth(channel_id, '30d')
-                
-                comparison_data.append({
-                    'channel_id': channel_id,
-                    'current_metrics': metrics,
-                    'growth_30d': growth_data.get('growth_trends', {}),
-                    'ranking': growth_data.get('ranking', {}),
-                    'performance_score': await self._calculate_performance_score(metrics, growth_data)
-                })
-            
-            # Sort by primary metric
-            comparison_data.sort(
-                key=lambda x: x['current_metrics'].get(metric, 0), 
-                reverse=True
-            )
-            
-            # Calculate relative performance
+            # Simulate history for all new channels in one batch
+            missing = [channel_id for channel_id in dict.fromkeys(channel_ids) if channel_id not in self.channel_data]
+            if missing:
+                await self._initialize_channels(missing)
+            
+            # Channels are independent, so collect them concurrently
+            comparison_data = list(await asyncio.gather(
+                *(self._get_compare_bundle(channel_id) for channel_id in channel_ids)
+            ))
+            
+            for data, score in zip(comparison_data, self._calculate_performance_scores(comparison_data)):
+                data['performance_score'] = score
+            
+            # Sort by primary metric on the projected column; a stable
+            # descending argsort keeps ties in request order like list.sort
+            columns = _project_comparison(comparison_data, metric)
+            order = np.argsort(-columns.values, kind='stable')
+            comparison_data = [comparison_data[i] for i in order]
+            columns = columns.take(order)
+            
+            # Calculate relative performance for all channels at once
             best_performer = comparison_data[0] if comparison_data else None
             
-            for i, data in enumerate(comparison_data):
-                data['rank'] = i + 1
-                data['relative_performance'] = await self._calculate_relative_performance(
-                    data, best_performer, metric
+            if best_performer:
+                relative, gap, leading = _relative_performance_batch(
+                    columns.values, columns.values[0], round_output=True
                 )
+                for i, (data, percentage, gap_to_leader, is_leading) in enumerate(
+                        zip(comparison_data, relative.tolist(), gap.tolist(), leading.tolist())):
+                    data['rank'] = i + 1
+                    data['relative_performance'] = RelativePerformance(
+                        percentage, gap_to_leader, 'leading' if is_leading else 'following'
+                    )
+            
+            # Champion and aggregates are shared by the response and its insights
+            stats = self._compute_comparison_stats(comparison_data, metric, columns)
             
+            rankings = [self._serialize_ranking(data) for data in comparison_data]
             return {
                 'comparison_metric': metric,
                 'channels_compared': len(channel_ids),
                 'analysis_date': datetime.now().isoformat(),
-                'rankings': comparison_data,
-                'leader': best_performer,
-                'growth_champion': await self._find_growth_champion(comparison_data),
-                'insights': await self._generate_comparison_insights(comparison_data, metric)
+                'rankings': rankings,
+                'leader': rankings[0] if rankings else None,
+                'growth_champion': stats['champion'],
+                'insights': self._generate_comparison_insights(comparison_data, metric, stats)
             }
             
         except Exception as e:
             logger.error(f"Channel comparison failed: {e}")
             return {'error': 'Channel comparison failed', 'details': str(e)}
     
+    @staticmethod
+    def _serialize_ranking(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Ranking entry with its RelativePerformance converted to a plain dict"""
+        performance = data.get('relative_performance')
+        if performance is None:
+            return data
+        return {**data, 'relative_performance': performance._asdict()}
+    
+    async def _get_compare_bundle(self, channel_id: str) -> Dict[str, Any]:
+        """Collect only the per-channel fields compare_channels reports"""
+        # compare_channels annotates the bundle in place, so hand out copies
+        cached = self._cached_snapshot(self._derived_cache.get(channel_id, {}), 'compare')
+        if cached is not None:
+            return dict(cached)
+        
+        metrics = await self._get_current_metrics(channel_id)
+        
+        end_date = datetime.now()
+        historical_data = await self._get_historical_data(channel_id, end_date - timedelta(days=30), end_date)
+        growth_trends = await self._calculate_growth_trends(historical_data)
+        
+        bundle = {
+            'channel_id': channel_id,
+            'current_metrics': metrics,
+            'growth_30d': growth_trends,
+            'ranking': await self._get_channel_ranking(channel_id)
+        }
+        self._derived_cache.setdefault(channel_id, {})['compare'] = (time.monotonic(), bundle)
+        
+        return dict(bundle)
+    
     async def predict_future_growth(self, channel_id: str, 
                                   prediction_days: int = 90) -> Dict[str, Any]:
         """
@@ -202,12 +544,8 @@ class GrowthTracker:
                 'channel_id': channel_id,
                 'prediction_period': f"{prediction_days} days",
                 'prediction_date': datetime.now().isoformat(),
-                'current_metrics': historical_data[-1] if historical_data else None,
-                'scenarios': {
-                    'conservative': await self._predict_conservative_growth(historical_data, prediction_days),
-                    'realistic': await self._predict_realistic_growth(historical_data, prediction_days),
-                    'optimistic': await self._predict_optimistic_growth(historical_data, prediction_days)
-                },
+                'current_metrics': historical_data.row_dict(-1) if len(historical_data) else None,
+                'scenarios': self._predict_growth_scenarios(historical_data, prediction_days),
                 'growth_patterns': growth_patterns,
                 'confidence_factors': await self._calculate_prediction_confidence(historical_data),
                 'milestone_predictions': await self._predict_milestones(channel_id, historical_data, prediction_days),
@@ -221,546 +559,505 @@ class GrowthTracker:
             logger.error(f"Growth prediction failed: {e}")
             return {'error': 'Growth prediction failed', 'details': str(e)}
     
+    async def _ensure_channel_data(self, channel_id: str):
+        """Initialize a channel's history once, on first use"""
+        # Initialization never yields to the event loop, so concurrent callers cannot race here
+        if channel_id not in self.channel_data:
+            await self._initialize_channel_data(channel_id)
+    
     async def _initialize_channel_data(self, channel_id: str):
         """Initialize channel data with simulated historical metrics"""
-        try:
-            # Generate 180 days of historical data
-            historical_data = []
-            base_date = datetime.now() - timedelta(days=180)
-            
-            # Starting metrics (simulate realistic channel)
-            base_subscribers = random.randint(1000, 100000)
-            base_views = random.randint(base_subscribers * 10, base_subscribers * 500)
-            base_videos = random.randint(50, 500)
-            
-            for day in range(180):
-                date = base_date + timedelta(days=day)
-                
-                # Simulate growth patterns with some randomness
-                growth_factor = 1 + random.uniform(-0.02, 0.05)  # -2% to +5% daily variance
-                
-                # Apply seasonal patterns
-                seasonal_factor = 1 + 0.1 * math.sin(2 * math.pi * day / 365)  # Yearly pattern
-                
-                subscribers = int(base_subscribers * (growth_factor ** day) * seasonal_factor)
-                views = int(base_views * (growth_factor ** day) * seasonal_factor * random.uniform(0.8, 1.5))
-                videos = base_videos + random.randint(0, 2) if day % 7 == 0 else base_videos  # New videos weekly
-                
-                metrics = ChannelMetrics(
-                    timestamp=date,
-                    subscribers=subscribers,
-                    total_views=views,
-                    video_count=videos,
-                    average_views=views / videos if videos > 0 else 0,
-                    estimated_earnings=views * random.uniform(0.001, 0.005),  # $1-5 per 1000 views
-                    engagement_rate=random.uniform(0.02, 0.08),  # 2-8% engagement
-                    upload_frequency=videos / (day + 1) * 7 if day > 0 else 0  # Videos per week
-                )
-                
-                historical_data.append(metrics)
-                base_videos = videos  # Update base for next iteration
-            
-            self.channel_data[channel_id] = historical_data
-            
-        except Exception as e:
-            logger.error(f"Failed to initialize channel data: {e}")
+        await self._initialize_channels([channel_id])
+    
+    async def _initialize_channels(self, channel_ids: List[str]):
+        """Simulate historical metrics for several channels in one batch
+        
+        Every series is a (channel, day) matrix, so random draws and growth
+        math run once for the whole batch.
+        """
+        count = len(channel_ids)
+        if not count:
+            return
+        
+        # Generate 180 days of historical data
+        days = np.arange(180)
+        shape = (count, days.size)
+        first_day = np.datetime64((datetime.now() - timedelta(days=180)).date(), 'D')
+        
+        # Starting metrics (simulate realistic channels)
+        base_subscribers = np.random.randint(1000, 100001, count)
+        base_views = np.random.randint(base_subscribers * 10, base_subscribers * 500 + 1)
+        base_videos = np.random.randint(50, 501, count)
+        
+        # Compounded daily growth (-2% to +5%) with a yearly seasonal pattern
+        growth_factor = np.cumprod(1 + np.random.uniform(-0.02, 0.05, shape), axis=1)
+        seasonal_factor = 1 + 0.1 * np.sin(2 * np.pi * days / 365)
+        trend = growth_factor * seasonal_factor
+        
+        subscribers = (base_subscribers[:, None] * trend).astype(np.int64)
+        views = (base_views[:, None] * trend * np.random.uniform(0.8, 1.5, shape)).astype(np.int64)
+        
+        # New videos weekly
+        new_videos = np.where(days % 7 == 0, np.random.randint(0, 3, shape), 0)
+        videos = base_videos[:, None] + np.cumsum(new_videos, axis=1)
+        
+        average_views = views / videos
+        estimated_earnings = views * np.random.uniform(0.001, 0.005, shape)  # $1-5 per 1000 views
+        engagement_rates = np.random.uniform(0.02, 0.08, shape)  # 2-8% engagement
+        upload_frequency = videos / (days + 1) * 7  # Videos per week
+        upload_frequency[:, 0] = 0
+        
+        timestamps = np.arange(first_day, first_day + days.size, dtype='datetime64[D]')
+        for row, channel_id in enumerate(channel_ids):
+            self._invalidate_channel_cache(channel_id)
+            self.channel_data[channel_id] = _ChannelSeries(
+                timestamp=timestamps,
+                subscribers=subscribers[row],
+                total_views=views[row],
+                video_count=videos[row],
+                average_views=average_views[row],
+                estimated_earnings=estimated_earnings[row],
+                engagement_rate=engagement_rates[row],
+                upload_frequency=upload_frequency[row]
+            )
+    
+    def _invalidate_channel_cache(self, channel_id: str):
+        """Drop cached results derived from a channel's history"""
+        self._metrics_cache.pop(channel_id, None)
+        self._ranking_cache.pop(channel_id, None)
+        self._derived_cache.pop(channel_id, None)
     
-    def _parse_timeframe(self, timeframe: str) -> int:
+    def _cached_snapshot(self, cache: Dict[str, Tuple[float, Dict[str, Any]]],
+                         key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached result if it is still fresh"""
+        entry = cache.get(key)
+        if entry and time.monotonic() - entry[0] < self.snapshot_ttl:
+            return entry[1]
+        return None
+    
+    @staticmethod
+    def _parse_timeframe(timeframe: str) -> int:
         """Parse timeframe string to days"""
-        timeframe_map = {
-            '7d': 7,
-            '30d': 30,
-            '90d': 90,
-            '1y': 365,
-            '6m': 180
-        }
-        return timeframe_map.get(timeframe, 30)
+        return _TIMEFRAME_DAYS.get(timeframe, 30)
     
     async def _get_historical_data(self, channel_id: str, 
                                  start_date: datetime, 
-                                 end_date: datetime) -> List[ChannelMetrics]:
+                                 end_date: datetime) -> _ChannelSeries:
         """Get historical data for specified period"""
-        try:
-            if channel_id not in self.channel_data:
-                await self._initialize_channel_data(channel_id)
-            
-            all_data = self.channel_data[channel_id]
-            
-            # Filter data by date range
-            filtered_data = [
-                metrics for metrics in all_data
-                if start_date <= metrics.timestamp <= end_date
-            ]
-            
-            return filtered_data
-            
-        except Exception as e:
-            logger.error(f"Failed to get historical data: {e}")
-            return []
+        await self._ensure_channel_data(channel_id)
+        
+        all_data = self.channel_data[channel_id]
+        
+        # Days are sorted, so the date range is one contiguous slice
+        start = np.searchsorted(all_data.timestamp, np.datetime64(start_date.date(), 'D'), side='left')
+        stop = np.searchsorted(all_data.timestamp, np.datetime64(end_date.date(), 'D'), side='right')
+        
+        return all_data.slice(start, stop)
     
     async def _get_current_metrics(self, channel_id: str) -> Dict[str, Any]:
         """Get current channel metrics"""
-        try:
-            if channel_id not in self.channel_data:
-                await self._initialize_channel_data(channel_id)
-            
-            latest_metrics = self.channel_data[channel_id][-1]
-            
-            return {
-                'subscribers': latest_metrics.subscribers,
-                'total_views': latest_metrics.total_views,
-                'video_count': latest_metrics.video_count,
-                'average_views': round(latest_metrics.average_views, 0),
-                'estimated_monthly_earnings': round(latest_metrics.estimated_earnings * 30, 2),
-                'engagement_rate': round(latest_metrics.engagement_rate, 4),
-                'upload_frequency': round(latest_metrics.upload_frequency, 2),
-                'last_updated': latest_metrics.timestamp.isoformat()
-            }
-            
-        except Exception as e:
-            logger.error(f"Failed to get current metrics: {e}")
-            return {}
+        cached = self._cached_snapshot(self._metrics_cache, channel_id)
+        if cached is not None:
+            return cached
+        
+        await self._ensure_channel_data(channel_id)
+        
+        latest_metrics = self.channel_data[channel_id].metrics_at(-1)
+        
+        current_metrics = {
+            'subscribers': latest_metrics.subscribers,
+            'total_views': latest_metrics.total_views,
+            'video_count': latest_metrics.video_count,
+            'average_views': round(latest_metrics.average_views, 0),
+            'estimated_monthly_earnings': round(latest_metrics.estimated_earnings * 30, 2),
+            'engagement_rate': round(latest_metrics.engagement_rate, 4),
+            'upload_frequency': round(latest_metrics.upload_frequency, 2),
+            'last_updated': latest_metrics.timestamp.isoformat()
+        }
+        self._metrics_cache[channel_id] = (time.monotonic(), current_metrics)
+        
+        return current_metrics
     
-    async def _calculate_growth_trends(self, historical_data: List[ChannelMetrics]) -> Dict[str, Any]:
+    async def _calculate_growth_trends(self, historical_data: _ChannelSeries) -> Dict[str, Any]:
         """Calculate growth trends for various timeframes"""
-        try:
-            if len(historical_data) < 2:
-                return {}
-            
-            latest = historical_data[-1]
-            
-            trends = {}
-            
-            # Calculate trends for different periods
-            periods = [
-                ('daily', 1),
-                ('weekly', 7),
-                ('monthly', 30)
-            ]
-            
-            for period_name, days in periods:
-                if len(historical_data) > days:
-                    past_data = historical_data[-(days+1)]
-                    
-                    subscriber_growth = latest.subscribers - past_data.subscribers
-                    subscriber_growth_rate = (subscriber_growth / past_data.subscribers) * 100 if past_data.subscribers > 0 else 0
-                    
-                    view_growth = latest.total_views - past_data.total_views
-                    view_growth_rate = (view_growth / past_data.total_views) * 100 if past_data.total_views > 0 else 0
-                    
-                    video_growth = latest.video_count - past_data.video_count
-                    
-                    engagement_change = latest.engagement_rate - past_data.engagement_rate
-                    
-                    # Determine growth velocity
-                    growth_velocity = self._determine_growth_velocity(subscriber_growth_rate)
-                    
-                    trends[period_name] = GrowthTrend(
-                        period=period_name,
-                        subscriber_growth=subscriber_growth,
-                        subscriber_growth_rate=round(subscriber_growth_rate, 2),
-                        view_growth=view_growth,
-                        view_growth_rate=round(view_growth_rate, 2),
-                        video_growth=video_growth,
-                        engagement_change=round(engagement_change, 4),
-                        growth_velocity=growth_velocity
-                    )
-            
-            return {period: asdict(trend) for period, trend in trends.items()}
-            
-        except Exception as e:
-            logger.error(f"Growth trends calculation failed: {e}")
+        if len(historical_data) < 2:
             return {}
+        
+        subscribers = historical_data.subscribers
+        total_views = historical_data.total_views
+        video_count = historical_data.video_count
+        engagement_rate = historical_data.engagement_rate
+        
+        trends = {}
+        
+        # Calculate trends for different periods
+        periods = [
+            ('daily', 1),
+            ('weekly', 7),
+            ('monthly', 30)
+        ]
+        
+        for period_name, days in periods:
+            if len(historical_data) > days:
+                past = -(days + 1)
+                past_subscribers = int(subscribers[past])
+                past_views = int(total_views[past])
+                
+                subscriber_growth = int(subscribers[-1]) - past_subscribers
+                subscriber_growth_rate = (subscriber_growth / past_subscribers) * 100 if past_subscribers > 0 else 0
+                
+                view_growth = int(total_views[-1]) - past_views
+                view_growth_rate = (view_growth / past_views) * 100 if past_views > 0 else 0
+                
+                video_growth = int(video_count[-1] - video_count[past])
+                
+                engagement_change = float(engagement_rate[-1] - engagement_rate[past])
+                
+                # Determine growth velocity
+                growth_velocity = self._determine_growth_velocity(subscriber_growth_rate)
+                
+                # Same fields as GrowthTrend, built as a dict directly
+                trends[period_name] = {
+                    'period': period_name,
+                    'subscriber_growth': subscriber_growth,
+                    'subscriber_growth_rate': round(subscriber_growth_rate, 2),
+                    'view_growth': view_growth,
+                    'view_growth_rate': round(view_growth_rate, 2),
+                    'video_growth': video_growth,
+                    'engagement_change': round(engagement_change, 4),
+                    'growth_velocity': growth_velocity
+                }
+        
+        return trends
     
     def _determine_growth_velocity(self, growth_rate: float) -> str:
         """Determine growth velocity category"""
-        growth_rate_decimal = growth_rate / 100
-        
-        if growth_rate_decimal >= self.growth_thresholds['explosive']:
-            return 'explosive'
-        elif growth_rate_decimal >= self.growth_thresholds['rapid']:
-            return 'rapid'
-        elif growth_rate_decimal >= self.growth_thresholds['steady']:
-            return 'steady'
-        elif growth_rate_decimal >= self.growth_thresholds['slow']:
-            return 'slow'
-        elif growth_rate_decimal >= self.growth_thresholds['stagnant']:
-            return 'stagnant'
-        else:
-            return 'declining'
+        return self._velocity_labels[bisect_right(self._velocity_edges, growth_rate / 100)]
     
     async def _generate_growth_predictions(self, channel_id: str, 
-                                         historical_data: List[ChannelMetrics]) -> Dict[str, Any]:
+                                         historical_data: _ChannelSeries) -> Dict[str, Any]:
         """Generate growth predictions"""
-        try:
-            if len(historical_data) < 10:
-                return {'error': 'Insufficient data for predictions'}
-            
-            # Calculate growth rates for the last 30 days
-            recent_data = historical_data[-30:]
-            
-            avg_daily_subscriber_growth = (recent_data[-1].subscribers - recent_data[0].subscribers) / 30
-            avg_daily_view_growth = (recent_data[-1].total_views - recent_data[0].total_views) / 30
-            
-            # Predict next 30 days
-            predictions = {
-                'next_30_days': {
-                    'predicted_subscribers': recent_data[-1].subscribers + int(avg_daily_subscriber_growth * 30),
-                    'predicted_views': recent_data[-1].total_views + int(avg_daily_view_growth * 30),
-                    'confidence': 'medium'
-                },
-                'next_90_days': {
-                    'predicted_subscribers': recent_data[-1].subscribers + int(avg_daily_subscriber_growth * 90),
-                    'predicted_views': recent_data[-1].total_views + int(avg_daily_view_growth * 90),
-                    'confidence': 'low'
-                },
-                'growth_trajectory': self._determine_growth_velocity(
-                    (avg_daily_subscriber_growth / recent_data[0].subscribers) * 100 * 30
-                )
+        if len(historical_data) < 10:
+            return {'error': 'Insufficient data for predictions'}
+        
+        # Smoothed level and daily trend over the last 30 days
+        recent_subscribers = historical_data.subscribers[-30:]
+        subscriber_level, avg_daily_subscriber_growth = _double_exponential_smoothing(
+            recent_subscribers, self.smoothing_alpha
+        )
+        view_level, avg_daily_view_growth = _double_exponential_smoothing(
+            historical_data.total_views[-30:], self.smoothing_alpha
+        )
+        baseline_subscribers = max(int(recent_subscribers[0]), 1)
+        
+        # Predict next 30 days
+        predictions = {
+            'next_30_days': {
+                'predicted_subscribers': int(subscriber_level + avg_daily_subscriber_growth * 30),
+                'predicted_views': int(view_level + avg_daily_view_growth * 30),
+                'confidence': 'medium'
+            },
+            'next_90_days': {
+                'predicted_subscribers': int(subscriber_level + avg_daily_subscriber_growth * 90),
+                'predicted_views': int(view_level + avg_daily_view_growth * 90),
+                'confidence': 'low'
+            },
+            'growth_trajectory': self._determine_growth_velocity(
+                (avg_daily_subscriber_growth / baseline_subscribers) * 100 * 30
+            )
+        }
+        
+        return predictions
+    
+    def _predict_growth_scenarios(self, historical_data: _ChannelSeries,
+                                  prediction_days: int) -> Dict[str, Any]:
+        """Project all growth scenarios from one smoothed trend"""
+        subscriber_level, subscriber_trend = _double_exponential_smoothing(
+            historical_data.subscribers[-30:], self.smoothing_alpha
+        )
+        view_level, view_trend = _double_exponential_smoothing(
+            historical_data.total_views[-30:], self.smoothing_alpha
+        )
+        
+        # (scenario, day) grids from broadcasting daily growth against the forecast horizon;
+        # a shrinking trend declines fastest in the conservative scenario
+        days = np.arange(1, prediction_days + 1)[None, :]
+        subscriber_growth = subscriber_trend * _SCENARIO_MULTIPLIERS[::1 if subscriber_trend >= 0 else -1]
+        view_growth = view_trend * _SCENARIO_MULTIPLIERS[::1 if view_trend >= 0 else -1]
+        subscribers = (subscriber_level + subscriber_growth[:, None] * days).astype(np.int64)
+        views = (view_level + view_growth[:, None] * days).astype(np.int64)
+        
+        return {
+            name: {
+                'daily_subscriber_growth': round(float(subscriber_growth[i]), 2),
+                'daily_view_growth': round(float(view_growth[i]), 2),
+                'predicted_subscribers': int(subscribers[i, -1]) if prediction_days > 0 else int(subscriber_level),
+                'predicted_views': int(views[i, -1]) if prediction_days > 0 else int(view_level),
+                'subscriber_series': subscribers[i].tolist(),
+                'view_series': views[i].tolist()
             }
-            
-            return predictions
-            
-        except Exception as e:
-            logger.error(f"Growth prediction failed: {e}")
-            return {}
+            for i, name in enumerate(_SCENARIO_NAMES)
+        }
     
     async def _track_milestones(self, channel_id: str, 
-                              historical_data: List[ChannelMetrics]) -> Dict[str, Any]:
+                              historical_data: _ChannelSeries) -> Dict[str, Any]:
         """Track milestone achievements and predict future milestones"""
-        try:
-            if not historical_data:
-                return {}
-            
-            current_subs = historical_data[-1].subscribers
-            current_views = historical_data[-1].total_views
-            
-            # Define milestone thresholds
-            subscriber_milestones = [1000, 10000, 50000, 100000, 500000, 1000000]
-            view_milestones = [100000, 1000000, 10000000, 100000000]
-            
-            # Find achieved milestones
-            achieved_sub_milestones = [m for m in subscriber_milestones if current_subs >= m]
-            achieved_view_milestones = [m for m in view_milestones if current_views >= m]
-            
-            # Find next milestones
-            next_sub_milestone = next((m for m in subscriber_milestones if m > current_subs), None)
-            next_view_milestone = next((m for m in view_milestones if m > current_views), None)
-            
-            # Calculate progress to next milestones
-            sub_progress = 0
-            view_progress = 0
-            
-            if next_sub_milestone:
-                prev_sub_milestone = max([m for m in subscriber_milestones if m <= current_subs] or [0])
-                sub_progress = (current_subs - prev_sub_milestone) / (next_sub_milestone - prev_sub_milestone) * 100
-            
-            if next_view_milestone:
-                prev_view_milestone = max([m for m in view_milestones if m <= current_views] or [0])
-                view_progress = (current_views - prev_view_milestone) / (next_view_milestone - prev_view_milestone) * 100
-            
-            return {
-                'achieved_subscriber_milestones': achieved_sub_milestones,
-                'achieved_view_milestones': achieved_view_milestones,
-                'next_subscriber_milestone': next_sub_milestone,
-                'next_view_milestone': next_view_milestone,
-                'subscriber_milestone_progress': round(sub_progress, 1),
-                'view_milestone_progress': round(view_progress, 1),
-                'subscribers_to_next_milestone': next_sub_milestone - current_subs if next_sub_milestone else 0,
-                'views_to_next_milestone': next_view_milestone - current_views if next_view_milestone else 0
-            }
-            
-        except Exception as e:
-            logger.error(f"Milestone tracking failed: {e}")
+        if not len(historical_data):
             return {}
+        
+        current_subs = int(historical_data.subscribers[-1])
+        current_views = int(historical_data.total_views[-1])
+        
+        # Find achieved milestones, next milestones and progress toward them
+        achieved_sub_milestones, next_sub_milestone, sub_progress = _milestone_position(
+            _SUBSCRIBER_MILESTONES, current_subs
+        )
+        achieved_view_milestones, next_view_milestone, view_progress = _milestone_position(
+            _VIEW_MILESTONES, current_views
+        )
+        
+        return {
+            'achieved_subscriber_milestones': achieved_sub_milestones,
+            'achieved_view_milestones': achieved_view_milestones,
+            'next_subscriber_milestone': next_sub_milestone,
+            'next_view_milestone': next_view_milestone,
+            'subscriber_milestone_progress': round(sub_progress, 1),
+            'view_milestone_progress': round(view_progress, 1),
+            'subscribers_to_next_milestone': next_sub_milestone - current_subs if next_sub_milestone else 0,
+            'views_to_next_milestone': next_view_milestone - current_views if next_view_milestone else 0
+        }
     
-    async def _analyze_performance(self, historical_data: List[ChannelMetrics]) -> Dict[str, Any]:
+    async def _analyze_performance(self, historical_data: _ChannelSeries) -> Dict[str, Any]:
         """Analyze channel performance patterns"""
-        try:
-            if len(historical_data) < 7:
-                return {}
-            
-            # Calculate various performance metrics
-            subscriber_velocities = []
-            view_velocities = []
-            engagement_rates = []
-            
-            for i in range(1, len(historical_data)):
-                prev = historical_data[i-1]
-                curr = historical_data[i]
-                
-                sub_velocity = curr.subscribers - prev.subscribers
-                view_velocity = curr.total_views - prev.total_views
-                
-                subscriber_velocities.append(sub_velocity)
-                view_velocities.append(view_velocity)
-                engagement_rates.append(curr.engagement_rate)
-            
-            # Calculate performance statistics
-            avg_daily_sub_growth = sum(subscriber_velocities) / len(subscriber_velocities)
-            avg_daily_view_growth = sum(view_velocities) / len(view_velocities)
-            avg_engagement = sum(engagement_rates) / len(engagement_rates)
-            
-            # Find best and worst performing days
-            best_sub_day = max(subscriber_velocities) if subscriber_velocities else 0
-            worst_sub_day = min(subscriber_velocities) if subscriber_velocities else 0
-            
-            # Calculate consistency score (lower variance = more consistent)
-            import statistics
-            sub_variance = statistics.variance(subscriber_velocities) if len(subscriber_velocities) > 1 else 0
-            consistency_score = max(0, 100 - (sub_variance / avg_daily_sub_growth * 100)) if avg_daily_sub_growth > 0 else 50
-            
-            return {
-                'average_daily_subscriber_growth': round(avg_daily_sub_growth, 2),
-                'average_daily_view_growth': round(avg_daily_view_growth, 2),
-                'average_engagement_rate': round(avg_engagement, 4),
-                'best_single_day_growth': best_sub_day,
-                'worst_single_day_growth': worst_sub_day,
-                'growth_consistency_score': round(consistency_score, 1),
-                'performance_grade': await self._calculate_performance_grade(historical_data),
-                'trending_direction': await self._calculate_trending_direction(subscriber_velocities)
-            }
-            
-        except Exception as e:
-            logger.error(f"Performance analysis failed: {e}")
+        if len(historical_data) < 7:
             return {}
+        
+        # Subscriber velocity statistics in one pass
+        (avg_daily_sub_growth, sub_variance, best_sub_day, worst_sub_day,
+         recent_week_avg, previous_week_avg) = map(float, _scan_velocities(historical_data.subscribers))
+        
+        total_views = historical_data.total_views
+        avg_daily_view_growth = float(total_views[-1] - total_views[0]) / (len(total_views) - 1)
+        engagement_rates = historical_data.engagement_rate[1:]
+        avg_engagement = float(engagement_rates.mean())
+        smoothed_engagement = float(_ewma(engagement_rates, self.smoothing_alpha)[-1])
+        
+        # Calculate consistency score (lower variance = more consistent)
+        consistency_score = max(0, 100 - (sub_variance / avg_daily_sub_growth * 100)) if avg_daily_sub_growth > 0 else 50
+        
+        return {
+            'average_daily_subscriber_growth': round(avg_daily_sub_growth, 2),
+            'average_daily_view_growth': round(avg_daily_view_growth, 2),
+            'average_engagement_rate': round(avg_engagement, 4),
+            'smoothed_engagement_rate': round(smoothed_engagement, 4),
+            'best_single_day_growth': int(best_sub_day),
+            'worst_single_day_growth': int(worst_sub_day),
+            'growth_consistency_score': round(consistency_score, 1),
+            'performance_grade': await self._calculate_performance_grade(historical_data),
+            'trending_direction': await self._calculate_trending_direction(
+                len(historical_data) - 1, recent_week_avg, previous_week_avg
+            )
+        }
     
-    async def _calculate_performance_grade(self, historical_data: List[ChannelMetrics]) -> str:
+    async def _calculate_performance_grade(self, historical_data: _ChannelSeries) -> str:
         """Calculate overall performance grade"""
-        try:
-            if len(historical_data) < 30:
-                return 'N/A'
-            
-            recent_30 = historical_data[-30:]
-            growth_rate = (recent_30[-1].subscribers - recent_30[0].subscribers) / recent_30[0].subscribers * 100
-            
-            if growth_rate >= 50:
-                return 'A++'
-            elif growth_rate >= 25:
-                return 'A+'
-            elif growth_rate >= 15:
-                return 'A'
-            elif growth_rate >= 10:
-                return 'B+'
-            elif growth_rate >= 5:
-                return 'B'
-            elif growth_rate >= 2:
-                return 'C+'
-            elif growth_rate >= 0:
-                return 'C'
-            elif growth_rate >= -5:
-                return 'D'
-            else:
-                return 'F'
-                
-        except Exception:
+        if len(historical_data) < 30:
             return 'N/A'
+        
+        recent_30 = historical_data.subscribers[-30:]
+        if recent_30[0] <= 0:
+            return 'N/A'
+        growth_rate = (int(recent_30[-1]) - int(recent_30[0])) / int(recent_30[0]) * 100
+        
+        if growth_rate >= 50:
+            return 'A++'
+        elif growth_rate >= 25:
+            return 'A+'
+        elif growth_rate >= 15:
+            return 'A'
+        elif growth_rate >= 10:
+            return 'B+'
+        elif growth_rate >= 5:
+            return 'B'
+        elif growth_rate >= 2:
+            return 'C+'
+        elif growth_rate >= 0:
+            return 'C'
+        elif growth_rate >= -5:
+            return 'D'
+        else:
+            return 'F'
     
-    async def _calculate_trending_direction(self, velocities: List[float]) -> str:
+    async def _calculate_trending_direction(self, velocity_count: int,
+                                          recent_avg: float, previous_avg: float) -> str:
         """Calculate if growth is trending up, down, or stable"""
-        try:
-            if len(velocities) < 7:
-                return 'stable'
-            
-            recent_week = velocities[-7:]
-            previous_week = velocities[-14:-7] if len(velocities) >= 14 else velocities[:-7]
-            
-            recent_avg = sum(recent_week) / len(recent_week)
-            previous_avg = sum(previous_week) / len(previous_week)
-            
-            change = recent_avg - previous_avg
-            change_percentage = (change / previous_avg * 100) if previous_avg != 0 else 0
-            
-            if change_percentage > 10:
-                return 'accelerating'
-            elif change_percentage < -10:
-                return 'declining'
-            else:
-                return 'stable'
-                
-        except Exception:
+        if velocity_count < 7:
+            return 'stable'
+        
+        change = recent_avg - previous_avg
+        change_percentage = (change / previous_avg * 100) if previous_avg != 0 else 0
+        
+        if change_percentage > 10:
+            return 'accelerating'
+        elif change_percentage < -10:
+            return 'declining'
+        else:
             return 'stable'
     
     async def _generate_growth_recommendations(self, channel_id: str, 
-                                             historical_data: List[ChannelMetrics]) -> List[str]:
+                                             historical_data: _ChannelSeries) -> List[str]:
         """Generate growth recommendations based on performance"""
         recommendations = []
         
-        try:
-            if not historical_data:
-                return ["No data available for recommendations"]
-            
-            current = historical_data[-1]
-            
-            # Analyze recent performance
-            if len(historical_data) >= 30:
-                recent_growth = (current.subscribers - historical_data[-30].subscribers) / 30
-                
-                if recent_growth < 1:
-                    recommendations.append("📈 Focus on increasing upload frequency to boost growth")
-                    recommendations.append("🎯 Analyze top-performing videos and create similar content")
-                
-                if current.engagement_rate < 0.03:
-                    recommendations.append("💬 Improve engagement by asking questions and encouraging comments")
-                    recommendations.append("👍 Add clear call-to-actions for likes and subscriptions")
-                
-                if current.upload_frequency < 1:
-                    recommendations.append("⏰ Maintain consistent upload schedule (at least weekly)")
-                
-                if current.average_views < current.subscribers * 0.1:
-                    recommendations.append("🔍 Optimize video titles and thumbnails for better click-through rates")
-                    recommendations.append("📊 Use YouTube Analytics to understand audience retention")
-            
-            # General recommendations
-            recommendations.extend([
-                "🎨 A/B test thumbnails to improve click-through rates",
-                "📝 Optimize video descriptions with relevant keywords",
-                "🔗 Collaborate with other creators in your niche",
-                "📱 Optimize content for mobile viewing",
-                "⏰ Post at optimal times for your audience"
-            ])
-            
-            return recommendations[:8]  # Limit to top 8
-            
-        except Exception as e:
-            logger.error(f"Recommendations generation failed: {e}")
-            return ["Unable to generate recommendations"]
+        if not len(historical_data):
+            return ["No data available for recommendations"]
+        
+        # Analyze recent performance
+        if len(historical_data) >= 30:
+            current = historical_data.metrics_at(-1)
+            signals = {
+                'recent_growth': (current.subscribers - int(historical_data.subscribers[-30])) / 30,
+                'engagement_rate': current.engagement_rate,
+                'upload_frequency': current.upload_frequency,
+                'views_per_subscriber': (
+                    current.average_views / current.subscribers if current.subscribers > 0 else math.inf
+                )
+            }
+            for signal, threshold, texts in self._CONDITIONAL_RECOMMENDATIONS:
+                if signals[signal] < threshold:
+                    recommendations.extend(texts)
+        
+        # Fill up with general recommendations, limited to the top 8 overall
+        general_slots = max(0, self._MAX_RECOMMENDATIONS - len(recommendations))
+        recommendations.extend(self._GENERAL_RECOMMENDATIONS[:general_slots])
+        
+        return recommendations
     
     async def _get_channel_ranking(self, channel_id: str) -> Dict[str, Any]:
         """Get channel ranking information (simulated)"""
-        try:
-            current_metrics = await self._get_current_metrics(channel_id)
-            subscribers = current_metrics.get('subscribers', 0)
-            
-            # Simulate ranking based on subscriber count
-            if subscribers >= 1000000:
-                global_rank = random.randint(1, 1000)
-                grade = random.choice(['A++', 'A+', 'A'])
-            elif subscribers >= 100000:
-                global_rank = random.randint(1000, 10000)
-                grade = random.choice(['A', 'B+', 'B'])
-            elif subscribers >= 10000:
-                global_rank = random.randint(10000, 100000)
-                grade = random.choice(['B', 'C+', 'C'])
-            else:
-                global_rank = random.randint(100000, 1000000)
-                grade = random.choice(['C', 'D', 'F'])
-            
-            return {
-                'global_rank': global_rank,
-                'country_rank': global_rank // 10,  # Approximate country rank
-                'category_rank': global_rank // 50,  # Approximate category rank
-                'grade': grade,
-                'growth_grade': await self._calculate_performance_grade(self.channel_data.get(channel_id, [])),
-                'subscriber_rank': global_rank,
-                'view_rank': global_rank + random.randint(-500, 500)
-            }
-            
-        except Exception as e:
-            logger.error(f"Ranking calculation failed: {e}")
-            return {}
-    
-    async def _calculate_performance_score(self, metrics: Dict[str, Any], 
-                                         growth_data: Dict[str, Any]) -> float:
-        """Calculate overall performance score"""
-        try:
-            # Weight different factors
-            subscriber_score = min(100, math.log10(max(1, metrics.get('subscribers', 1))) * 15)
-            engagement_score = metrics.get('engagement_rate', 0) * 1000
-            growth_score = growth_data.get('growth_trends', {}).get('monthly', {}).get('subscriber_growth_rate', 0)
-            
-            total_score = (subscriber_score * 0.4 + engagement_score * 0.3 + growth_score * 0.3)
-            
-            return round(total_score, 2)
-            
-        except Exception:
-            return 0.0
+        cached = self._cached_snapshot(self._ranking_cache, channel_id)
+        if cached is not None:
+            return cached
+        
+        current_metrics = await self._get_current_metrics(channel_id)
+        subscribers = current_metrics.get('subscribers', 0)
+        
+        # Simulate ranking based on subscriber count, deterministically per channel
+        channel_hash = self._rank_hashes.get(channel_id)
+        if channel_hash is None:
+            digest = hashlib.blake2b(channel_id.encode(), digest_size=8).digest()
+            channel_hash = self._rank_hashes[channel_id] = int.from_bytes(digest, 'big')
+        
+        (lower, upper), grades = next(
+            (rank_range, grades) for minimum, rank_range, grades in _RANKING_TIERS if subscribers >= minimum
+        )
+        global_rank = lower + channel_hash % (upper - lower + 1)
+        grade = grades[(channel_hash >> 32) % len(grades)]
+        view_offset = (channel_hash >> 48) % 1001 - 500
+        
+        ranking = {
+            'global_rank': global_rank,
+            'country_rank': global_rank // 10,  # Approximate country rank
+            'category_rank': global_rank // 50,  # Approximate category rank
+            'grade': grade,
+            'growth_grade': await self._calculate_performance_grade(
+                self.channel_data.get(channel_id) or _ChannelSeries.empty()
+            ),
+            'subscriber_rank': global_rank,
+            'view_rank': global_rank + view_offset
+        }
+        self._ranking_cache[channel_id] = (time.monotonic(), ranking)
+        
+        return ranking
     
-    async def _calculate_relative_performance(self, channel_data: Dict[str, Any], 
-                                            best_performer: Dict[str, Any], 
-                                            metric: str) -> Dict[str, Any]:
-        """Calculate relative performance compared to best performer"""
-        try:
-            if not best_performer:
-                return {}
-            
-            current_value = channel_data['current_metrics'].get(metric, 0)
-            best_value = best_performer['current_metrics'].get(metric, 1)
-            
-            relative_percentage = (current_value / best_value * 100) if best_value > 0 else 0
-            gap = best_value - current_value
-            
-            return {
-                'relative_percentage': round(relative_percentage, 1),
-                'gap_to_leader': gap,
-                'performance_vs_leader': 'leading' if current_value >= best_value else 'following'
-            }
-            
-        except Exception:
-            return {}
+    @staticmethod
+    def _calculate_performance_scores(comparison_data: List[Dict[str, Any]]) -> List[float]:
+        """Calculate overall performance scores for all compared channels at once"""
+        subscribers = np.array([c['current_metrics'].get('subscribers', 1) for c in comparison_data], dtype=np.float64)
+        engagement_rates = np.array([c['current_metrics'].get('engagement_rate', 0) for c in comparison_data], dtype=np.float64)
+        growth_rates = np.array([
+            _monthly_trend(c).get('subscriber_growth_rate', 0) for c in comparison_data
+        ], dtype=np.float64)
+        
+        # Weight different factors
+        subscriber_scores = np.minimum(100, np.log10(np.maximum(1, subscribers)) * 15)
+        total_scores = subscriber_scores * 0.4 + engagement_rates * 1000 * 0.3 + growth_rates * 0.3
+        
+        return np.round(total_scores, 2).tolist()
     
-    async def _find_growth_champion(self, comparison_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _find_growth_champion(self, comparison_data: List[Dict[str, Any]],
+                              columns: Optional[_ComparisonColumns] = None) -> Dict[str, Any]:
         """Find the channel with the highest growth rate"""
-        try:
-            if not comparison_data:
-                return {}
-            
-            # Sort by monthly growth rate
-            sorted_by_growth = sorted(
-                comparison_data,
-                key=lambda x: x.get('growth_30d', {}).get('monthly', {}).get('subscriber_growth_rate', 0),
-                reverse=True
-            )
-            
-            growth_champion = sorted_by_growth[0]
-            
-            return {
-                'channel_id': growth_champion['channel_id'],
-                'growth_rate': growth_champion.get('growth_30d', {}).get('monthly', {}).get('subscriber_growth_rate', 0),
-                'growth_velocity': growth_champion.get('growth_30d', {}).get('monthly', {}).get('growth_velocity', 'unknown')
-            }
-            
-        except Exception:
+        if not comparison_data:
             return {}
+        
+        if columns is None:
+            columns = _project_comparison(comparison_data, 'subscribers')
+        
+        # Highest monthly growth rate (first one wins ties)
+        index = int(columns.growth_rates.argmax())
+        
+        return {
+            'channel_id': columns.ids[index],
+            'growth_rate': _monthly_trend(comparison_data[index]).get('subscriber_growth_rate', 0),
+            'growth_velocity': columns.velocities[index]
+        }
     
-    async def _generate_comparison_insights(self, comparison_data: List[Dict[str, Any]], 
-                                          metric: str) -> List[str]:
-        """Generate insights from channel comparison"""
-        insights = []
+    def _compute_comparison_stats(self, comparison_data: List[Dict[str, Any]], 
+                                  metric: str,
+                                  columns: Optional[_ComparisonColumns] = None) -> Dict[str, Any]:
+        """Aggregate the compared metric and the growth champion once per comparison"""
+        if columns is None:
+            columns = _project_comparison(comparison_data, metric)
+        champion = self._find_growth_champion(comparison_data, columns)
         
+        # The list is sorted leader first
+        values = columns.values
+        if not values.size:
+            return {'total': 0.0, 'avg': 0.0, 'above_avg': 0,
+                    'leader_value': 0.0, 'last_value': 0.0, 'champion': champion}
+        
+        # Compensated summation: subscriber counts can span many orders of magnitude
+        total = math.fsum(values.tolist())
+        avg = total / values.size
+        
+        return {
+            'total': total,
+            'avg': avg,
+            'above_avg': int((values > avg).sum()),
+            'leader_value': float(values[0]),
+            'last_value': float(values[-1]),
+            'champion': champion
+        }
+    
+    def _generate_comparison_insights(self, comparison_data: List[Dict[str, Any]], 
+                                    metric: str,
+                                    stats: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Generate insights from channel comparison"""
         try:
             if len(comparison_data) < 2:
                 return ["Need at least 2 channels for meaningful comparison"]
             
-            leader = comparison_data[0]
-            last_place = comparison_data[-1]
-            
-            # Performance gap insight
-            leader_value = leader['current_metrics'].get(metric, 0)
-            last_value = last_place['current_metrics'].get(metric, 0)
-            
-            if leader_value > 0:
-                gap_multiplier = leader_value / last_value if last_value > 0 else float('inf')
-                insights.append(f"📊 Performance gap: Leader has {gap_multiplier:.1f}x more {metric}")
-            
-            # Growth insights
-            fastest_grower = await self._find_growth_champion(comparison_data)
-            if fastest_grower:
-                insights.append(f"🚀 Fastest growing: {fastest_grower['channel_id']} with {fastest_grower['growth_rate']}% monthly growth")
+            if stats is None:
+                stats = self._compute_comparison_stats(comparison_data, metric)
             
-            # Average performance
-            avg_metric = sum(c['current_metrics'].get(metric, 0) for c in comparison_data) / len(comparison_data)
-            insights.append(f"📈 Average {metric}: {avg_metric:,.0f}")
+            # Dashboards re-poll the same comparison, so the text is memoized on its inputs
+            return list(_render_comparison_insights(*self._insight_aggregates(comparison_data, metric, stats)))
             
-            # Performance distribution
-            above_avg = len([c for c in comparison_data if c['current_metrics'].get(metric, 0) > avg_metric])
-            insights.append(f"⚖️ {above_avg}/{len(comparison_data)} channels perform above average")
-            
-            return insights
-            
-        except Exception as e:
+        except (KeyError, TypeError) as e:
             logger.error(f"Comparison insights failed: {e}")
             return ["Unable to generate insights"]
+    
+    @staticmethod
+    def _insight_aggregates(comparison_data: List[Dict[str, Any]], metric: str,
+                            stats: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Arguments for the insight renderers, in _comparison_insight_lines order"""
+        fastest_grower = stats['champion']
+        return (
+            metric, len(comparison_data), stats['leader_value'], stats['last_value'],
+            fastest_grower.get('channel_id'), fastest_grower.get('growth_rate'),
+            stats['avg'], stats['above_avg']
+        )
 
 # Global instance
 growth_tracker = GrowthTracker()
\ No newline at end of file
@@ -2,6 +2,6 @@
 Stock Content Module
 """
 
-from .integrator import StockContentIntegrator
+from .integrator import StockContentIntegrator, StockVideo, StockImage
 
-__all__ = ['StockContentIntegrator']
\ No newline at end of file
+__all__ = ['StockContentIntegrator', 'StockVideo', 'StockImage']
\ No newline at end of file
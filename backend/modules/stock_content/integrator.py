@@ -6,21 +6,220 @@ Fetches real video clips and images from Pexels and Pixabay APIs
 import asyncio
 import logging
 import os
+import time
 import aiohttp
+import aiofiles
 import json
-from typing import Dict, List, Any, Optional
+import heapq
+import operator
+import re
+import sys
+from collections import OrderedDict
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import dataclass
+from typing import ClassVar, Dict, List, Any, Optional, Union
 from datetime import datetime
 from pathlib import Path
 import hashlib
-from urllib.parse import urlparse
 
 from ..base import BaseModule
 
+# Optional faster JSON parsing for provider responses
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional asynchronous DNS resolution for the shared connector
+try:
+    import aiodns  # noqa: F401
+    AIODNS_AVAILABLE = True
+except ImportError:
+    AIODNS_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+_json_dumps = orjson.dumps if ORJSON_AVAILABLE else (lambda obj: json.dumps(obj).encode())
+
+# File extensions routed to the video cache
+_VIDEO_EXTS = frozenset({".mp4", ".mov", ".avi", ".webm", ".mkv", ".m4v"})
+
+# Bump when formatted result fields change, so stale cached searches miss
+_RESULT_FORMAT_VERSION = 3
+
+# Ranking key: resolution, then popularity, then usage
+_rank_key = operator.attrgetter("pixels", "views", "downloads")
+
+# Extension of the last path segment, ignoring any query string or fragment
+_SUFFIX_RE = re.compile(r'(?<!/)/[^/?#]*(\.[A-Za-z0-9]{1,5})(?:[?#]|$)')
+
+class _StockResult:
+    """Dict-style access for callers that still index results by key"""
+    
+    __slots__ = ()
+    
+    def __getitem__(self, key: str) -> Any:
+        value = getattr(self, key, None)
+        if value is None:
+            raise KeyError(key)
+        return value
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None)
+        return default if value is None else value
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict, leaving out fields the provider does not supply"""
+        values = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if value is not None:
+                values[name] = value
+        return values
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class StockVideo(_StockResult):
+    """Stock video search result"""
+    kind: ClassVar[str] = "video"
+    
+    id: str
+    provider: str
+    title: str
+    description: str
+    url: str
+    thumbnail_url: str
+    duration: int
+    width: int
+    height: int
+    pixels: int
+    views: int = 0
+    downloads: int = 0
+    quality: Optional[str] = None
+    file_type: Optional[str] = None
+    photographer: Optional[str] = None
+    photographer_url: Optional[str] = None
+    user: Optional[str] = None
+    tags: Optional[str] = None
+    license: str
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class StockImage(_StockResult):
+    """Stock image search result"""
+    kind: ClassVar[str] = "image"
+    
+    id: str
+    provider: str
+    title: str
+    description: str
+    url: str
+    thumbnail_url: str
+    width: int
+    height: int
+    pixels: int
+    views: int = 0
+    downloads: int = 0
+    photographer: Optional[str] = None
+    photographer_url: Optional[str] = None
+    user: Optional[str] = None
+    tags: Optional[str] = None
+    license: str
+    avg_color: Optional[str] = None
+
+_RESULT_TYPES = {cls.kind: cls for cls in (StockVideo, StockImage)}
+
+StockResult = Union[StockVideo, StockImage]
+
+class AIMDController:
+    """Adaptive concurrency limit for one provider (additive increase, multiplicative decrease)"""
+    
+    def __init__(self, max_concurrency: int = 8, min_concurrency: int = 1,
+                 increase: float = 0.5, decrease: float = 0.5):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.increase = increase
+        self.decrease = decrease
+        self.concurrency = float(max_concurrency)
+        self.in_flight = 0
+        self._resume_at = 0.0
+        self._condition = asyncio.Condition()
+    
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.concurrency))
+            self.in_flight += 1
+        
+        # Hold the slot through any provider-requested pause
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+    
+    def record(self, success: bool):
+        """Grow the limit after a success, shrink it after throttling or a server error"""
+        if success:
+            self.concurrency = min(self.max_concurrency, self.concurrency + self.increase)
+        else:
+            self.concurrency = max(self.min_concurrency, self.concurrency * self.decrease)
+    
+    def pause(self, delay: float):
+        """Hold off new requests for the given number of seconds"""
+        self._resume_at = max(self._resume_at, time.monotonic() + delay)
+
 class StockContentIntegrator(BaseModule):
     """Integration with stock content providers"""
     
+    # Shared instance per event loop, handed out through instance()
+    _instance = None
+    _instance_loop = None
+    _instance_lock = None
+    
+    @classmethod
+    async def instance(cls) -> 'StockContentIntegrator':
+        """Get the shared, initialized integrator so callers reuse one session and cache"""
+        # Direct construction still works (e.g. in tests); the owner of the shared
+        # instance awaits its cleanup() on application shutdown
+        loop = asyncio.get_running_loop()
+        if cls._instance_loop is not loop:
+            # The lock and the instance's HTTP session belong to the loop that created them
+            previous, previous_loop = cls._instance, cls._instance_loop
+            cls._instance_loop = loop
+            cls._instance_lock = asyncio.Lock()
+            cls._instance = None
+            if previous is not None:
+                cls._release_stale_instance(previous, previous_loop)
+        
+        if cls._instance is None:
+            async with cls._instance_lock:
+                if cls._instance is None:
+                    integrator = cls()
+                    await integrator.initialize()
+                    cls._instance = integrator
+        return cls._instance
+    
+    @staticmethod
+    def _release_stale_instance(integrator: 'StockContentIntegrator', loop: asyncio.AbstractEventLoop):
+        """Clean up a shared instance left behind by another event loop, or log that it leaked"""
+        session = integrator._session
+        if session is None or session.closed:
+            return
+        
+        # The session can only be closed on its own loop
+        if loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(integrator.cleanup(), loop)
+            logger.info("Closing shared stock content session of a previous event loop")
+        else:
+            logger.warning(
+                "Shared stock content integrator was not cleaned up before its event loop "
+                "closed; its HTTP session is left open"
+            )
+    
     def __init__(self):
         super().__init__()
         self.module_name = "stock_content"
@@ -39,6 +238,19 @@ class StockContentIntegrator(BaseModule):
         self.cache_dir = "assets/stock_cache"
         self.videos_cache_dir = "assets/stock_cache/videos"
         self.images_cache_dir = "assets/stock_cache/images"
+        self._videos_cache_path = Path(self.videos_cache_dir)
+        self._images_cache_path = Path(self.images_cache_dir)
+        self.cache_manifest_file = "assets/stock_cache/manifest.json"
+        self.download_chunk_size = 1 << 20
+        self.download_queue_size = 4  # Chunks buffered between network and disk
+        
+        # Download dedup indexes: URL hash -> path and content hash -> path
+        self._url_index: Dict[str, str] = {}
+        self._content_index: Dict[str, str] = {}
+        # Manifest writes are coalesced like search index writes
+        self.cache_manifest_flush_delay = 5
+        self._cache_manifest_flush: Optional[asyncio.Task] = None
+        self._cache_manifest_dirty = False
         
         # Search categories
         self.search_categories = {
@@ -52,6 +264,14 @@ class StockContentIntegrator(BaseModule):
             "travel": ["travel", "city", "architecture", "landmark", "transportation"]
         }
         
+        # Category keywords are static, so the query suffixes are built once
+        self._category_suffix = {
+            category: " " + " ".join(keywords) for category, keywords in self.search_categories.items()
+        }
+        self._category_keyword_sets = {
+            category: set(keywords) for category, keywords in self.search_categories.items()
+        }
+        
         # Content filters
         self.content_filters = {
             "safe_search": True,
@@ -61,6 +281,202 @@ class StockContentIntegrator(BaseModule):
             "video_max_duration": 30,
             "preferred_orientations": ["horizontal", "landscape"]
         }
+        
+        # Shared HTTP session, created on first use so connections are kept alive
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Per-provider concurrency, adapted to throttling and rate-limit headers
+        self._provider_limits = {
+            "pexels": AIMDController(max_concurrency=8),
+            "pixabay": AIMDController(max_concurrency=8)
+        }
+        self.rate_limit_low_ratio = 0.1
+        self.rate_limit_max_wait = 60
+        
+        # Parsed search results: cache key -> (stored at, results), least recently used first.
+        # Persisted to search_index_file so warm queries survive restarts.
+        self._search_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self.search_cache_ttl = 3600
+        self.search_cache_max_entries = 512
+        self.search_index_file = "assets/stock_cache/search_index.json"
+        self.search_index_flush_delay = 5
+        self._search_index_flush: Optional[asyncio.Task] = None
+        self._search_index_dirty = False
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.cleanup()
+    
+    async def cleanup(self):
+        """Write out pending cache changes and close the shared HTTP session"""
+        if self._search_index_flush and not self._search_index_flush.done():
+            self._search_index_flush.cancel()
+            await self._write_search_index()
+        self._search_index_flush = None
+        
+        if self._cache_manifest_flush and not self._cache_manifest_flush.done():
+            self._cache_manifest_flush.cancel()
+            await self._write_cache_manifest()
+        self._cache_manifest_flush = None
+        
+        # Must be awaited on shutdown so the connector's pooled sockets are drained
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it if needed"""
+        if self._session is None or self._session.closed:
+            # Keep provider sockets warm across bursts and resolve each host once per TTL
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=20,
+                    use_dns_cache=True,
+                    ttl_dns_cache=600,
+                    force_close=False,
+                    enable_cleanup_closed=True,
+                    keepalive_timeout=75,
+                    resolver=aiohttp.AsyncResolver() if AIODNS_AVAILABLE else None
+                ),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+    
+    @asynccontextmanager
+    async def _provider_get(self, provider: str, url: str, **kwargs):
+        """GET from a provider under its adaptive concurrency limit"""
+        session = await self._get_session()
+        limiter = self._provider_limits.get(provider)
+        
+        async with limiter or nullcontext():
+            try:
+                async with session.get(url, **kwargs) as response:
+                    if limiter:
+                        limiter.record(response.status != 429 and response.status < 500)
+                        delay = self._rate_limit_delay(response.headers)
+                        if delay > 0:
+                            limiter.pause(min(delay, self.rate_limit_max_wait))
+                    yield response
+            except aiohttp.ClientError:
+                if limiter:
+                    limiter.record(False)
+                raise
+    
+    def _search_cache_key(self, provider: str, endpoint: str, params: Dict[str, Any]) -> str:
+        """Stable key for one provider search request"""
+        raw = f"{_RESULT_FORMAT_VERSION}|{provider}|{endpoint}|{sorted(params.items())}"
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+    
+    def _get_cached_search(self, cache_key: str) -> Optional[List[StockResult]]:
+        """Cached search results, or None if missing or expired"""
+        entry = self._search_cache.get(cache_key)
+        if entry is None:
+            return None
+        
+        stored_at, results = entry
+        if time.time() - stored_at > self.search_cache_ttl:
+            del self._search_cache[cache_key]
+            return None
+        
+        self._search_cache.move_to_end(cache_key)
+        # Results are immutable, so only the list needs copying
+        return list(results)
+    
+    def _store_search(self, cache_key: str, results: List[StockResult]):
+        """Cache search results, evicting the least recently used entries"""
+        self._search_cache[cache_key] = (time.time(), list(results))
+        self._search_cache.move_to_end(cache_key)
+        while len(self._search_cache) > self.search_cache_max_entries:
+            self._search_cache.popitem(last=False)
+        
+        # Coalesce bursts of inserts into one write
+        self._search_index_dirty = True
+        if self._search_index_flush is None or self._search_index_flush.done():
+            self._search_index_flush = asyncio.create_task(self._flush_search_index())
+    
+    def _load_search_index(self):
+        """Load unexpired search results persisted by a previous run"""
+        try:
+            with open(self.search_index_file, 'rb') as f:
+                index = _json_loads(f.read())
+            
+            # Entries are stored least recently used first; ones from an older
+            # result format carry no kind and could never be hit again
+            now = time.time()
+            fresh = [
+                (key, entry) for key, entry in index.items()
+                if now - entry["t"] <= self.search_cache_ttl
+                and (entry.get("kind") in _RESULT_TYPES or not entry["results"])
+            ]
+            loaded = [
+                (key, entry["t"], [_RESULT_TYPES[entry["kind"]](**result) for result in entry["results"]])
+                for key, entry in fresh[-self.search_cache_max_entries:]
+            ]
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            self.logger.warning(f"Ignoring unreadable search index: {str(e)}")
+            return
+        
+        for key, stored_at, results in loaded:
+            self._search_cache[key] = (stored_at, results)
+    
+    async def _flush_search_index(self):
+        """Persist the search cache after a short delay"""
+        # Inserts that land during a write trigger another round
+        while self._search_index_dirty:
+            await asyncio.sleep(self.search_index_flush_delay)
+            await self._write_search_index()
+    
+    async def _write_search_index(self):
+        """Write the search cache to disk atomically"""
+        self._search_index_dirty = False
+        index = {
+            key: {
+                "t": stored_at,
+                "kind": results[0].kind if results else None,
+                "results": [result.to_dict() for result in results]
+            }
+            for key, (stored_at, results) in self._search_cache.items()
+        }
+        
+        # A unique temp file, so an interrupted write never clobbers a later one
+        temp_path = Path(f"{self.search_index_file}.{os.getpid()}.{time.monotonic_ns()}.tmp")
+        try:
+            async with aiofiles.open(temp_path, 'wb') as f:
+                await f.write(_json_dumps(index))
+            os.replace(temp_path, self.search_index_file)
+        except OSError as e:
+            self.logger.warning(f"Failed to save search index: {str(e)}")
+        finally:
+            temp_path.unlink(missing_ok=True)
+    
+    def _rate_limit_delay(self, headers) -> float:
+        """Seconds to hold off a provider, from Retry-After or a nearly spent quota"""
+        retry_after = headers.get("Retry-After")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        
+        try:
+            limit = int(headers["X-Ratelimit-Limit"])
+            remaining = int(headers["X-Ratelimit-Remaining"])
+            reset = float(headers.get("X-Ratelimit-Reset", 0))
+        except (KeyError, ValueError):
+            return 0.0
+        
+        if limit <= 0 or remaining >= limit * self.rate_limit_low_ratio:
+            return 0.0
+        
+        # Pexels reports the reset as a UNIX timestamp, Pixabay as seconds remaining
+        if reset > 1e9:
+            reset -= time.time()
+        return max(0.0, reset)
     
     async def _setup_module(self):
         """Initialize stock content integrator"""
@@ -71,6 +487,9 @@ class StockContentIntegrator(BaseModule):
             for directory in [self.cache_dir, self.videos_cache_dir, self.images_cache_dir]:
                 Path(directory).mkdir(parents=True, exist_ok=True)
             
+            self._load_cache_manifest()
+            self._load_search_index()
+            
             # Check API keys
             if not self.pexels_api_key and not self.pixabay_api_key:
                 self.logger.warning("No stock content API keys found - functionality will be limited")
@@ -88,37 +507,41 @@ class StockContentIntegrator(BaseModule):
         count: int = 5,
         duration_preference: str = "short",
         **kwargs
-    ) -> List[Dict[str, Any]]:
+    ) -> List[StockVideo]:
         """Search for stock videos"""
         
         try:
             self.logger.info(f"Searching for videos: {query}")
             
-            # Enhance query with category keywords
-            enhanced_query = await self._enhance_search_query(query, category)
+            # Enhance query with category keywords; repeated queries share one string
+            enhanced_query = sys.intern(
+                self._enhance_search_query(query, category) if category else query.lower().strip()
+            )
             
-            # Search both providers
-            results = []
+            # Search both providers concurrently
+            searches = []
             
             # Search Pexels videos
             if self.pexels_api_key:
-                pexels_results = await self._search_pexels_videos(
+                searches.append(self._search_pexels_videos(
                     enhanced_query, count // 2 + 1, duration_preference, **kwargs
-                )
-                results.extend(pexels_results)
+                ))
             
             # Search Pixabay videos
             if self.pixabay_api_key:
-                pixabay_results = await self._search_pixabay_videos(
+                searches.append(self._search_pixabay_videos(
                     enhanced_query, count // 2 + 1, duration_preference, **kwargs
-                )
-                results.extend(pixabay_results)
+                ))
             
-            # Filter and sort results
-            filtered_results = await self._filter_video_results(results, **kwargs)
+            results = []
+            for provider_results in await asyncio.gather(*searches, return_exceptions=True):
+                if isinstance(provider_results, Exception):
+                    self.logger.warning(f"Video provider search failed: {str(provider_results)}")
+                    continue
+                results.extend(provider_results)
             
-            # Limit to requested count
-            return filtered_results[:count]
+            # Filter results and keep the best ones up to the requested count
+            return self._filter_video_results(results, count=count, **kwargs)
             
         except Exception as e:
             self.logger.error(f"Video search failed: {str(e)}")
@@ -131,56 +554,62 @@ class StockContentIntegrator(BaseModule):
         count: int = 10,
         orientation: str = "horizontal",
         **kwargs
-    ) -> List[Dict[str, Any]]:
+    ) -> List[StockImage]:
         """Search for stock images"""
         
         try:
             self.logger.info(f"Searching for images: {query}")
             
-            # Enhance query with category keywords
-            enhanced_query = await self._enhance_search_query(query, category)
+            # Enhance query with category keywords; repeated queries share one string
+            enhanced_query = sys.intern(
+                self._enhance_search_query(query, category) if category else query.lower().strip()
+            )
             
-            # Search both providers
-            results = []
+            # Search both providers concurrently
+            searches = []
             
             # Search Pexels images
             if self.pexels_api_key:
-                pexels_results = await self._search_pexels_images(
+                searches.append(self._search_pexels_images(
                     enhanced_query, count // 2 + 1, orientation, **kwargs
-                )
-                results.extend(pexels_results)
+                ))
             
             # Search Pixabay images
             if self.pixabay_api_key:
-                pixabay_results = await self._search_pixabay_images(
+                searches.append(self._search_pixabay_images(
                     enhanced_query, count // 2 + 1, orientation, **kwargs
-                )
-                results.extend(pixabay_results)
+                ))
             
-            # Filter and sort results
-            filtered_results = await self._filter_image_results(results, **kwargs)
+            results = []
+            for provider_results in await asyncio.gather(*searches, return_exceptions=True):
+                if isinstance(provider_results, Exception):
+                    self.logger.warning(f"Image provider search failed: {str(provider_results)}")
+                    continue
+                results.extend(provider_results)
             
-            # Limit to requested count
-            return filtered_results[:count]
+            # Filter results and keep the best ones up to the requested count
+            return self._filter_image_results(results, count=count, **kwargs)
             
         except Exception as e:
             self.logger.error(f"Image search failed: {str(e)}")
             return []
     
-    async def _enhance_search_query(self, query: str, category: Optional[str]) -> str:
+    def _enhance_search_query(self, query: str, category: Optional[str]) -> str:
         """Enhance search query with category-specific keywords"""
         
-        enhanced_query = query.lower()
+        enhanced_query = query.lower().strip()
         
-        if category and category in self.search_categories:
-            category_keywords = self.search_categories[category]
-            
-            # Add relevant keywords that aren't already in the query
-            for keyword in category_keywords:
-                if keyword not in enhanced_query:
-                    enhanced_query += f" {keyword}"
+        keyword_set = self._category_keyword_sets.get(category)
+        if not keyword_set:
+            return enhanced_query
         
-        return enhanced_query.strip()
+        # Add relevant keywords that aren't already words of the query
+        query_words = set(enhanced_query.split())
+        if query_words.isdisjoint(keyword_set):
+            return (enhanced_query + self._category_suffix[category]).strip()
+        
+        missing = " ".join(keyword for keyword in self.search_categories[category] if keyword not in query_words)
+        return f"{enhanced_query} {missing}".strip()
     
     async def _search_pexels_videos(
         self,
@@ -188,7 +617,7 @@ class StockContentIntegrator(BaseModule):
         count: int,
         duration_preference: str,
         **kwargs
-    ) -> List[Dict[str, Any]]:
+    ) -> List[StockVideo]:
         """Search Pexels for videos"""
         
         try:
@@ -205,28 +634,30 @@ class StockContentIntegrator(BaseModule):
                 "page": 1
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.pexels_video_api_url}/search",
-                    headers=headers,
-                    params=params
-                ) as response:
+            cache_key = self._search_cache_key("pexels", f"{self.pexels_video_api_url}/search", params)
+            cached = self._get_cached_search(cache_key)
+            if cached is not None:
+                return cached
+            
+            async with self._provider_get(
+                "pexels",
+                f"{self.pexels_video_api_url}/search",
+                headers=headers,
+                params=params
+            ) as response:
+                
+                if response.status == 200:
+                    data = _json_loads(await response.read())
+                    videos = data.get("videos", [])
                     
-                    if response.status == 200:
-                        data = await response.json()
-                        videos = data.get("videos", [])
-                        
-                        results = []
-                        for video in videos:
-                            result = await self._format_pexels_video(video, duration_preference)
-                            if result:
-                                results.append(result)
-                        
-                        self.logger.info(f"Found {len(results)} Pexels videos for '{query}'")
-                        return results
-                    else:
-                        self.logger.warning(f"Pexels API error: {response.status}")
-                        return []
+                    results = [result for result in (self._format_pexels_video(video, duration_preference) for video in videos) if result]
+                    
+                    self._store_search(cache_key, results)
+                    self.logger.info(f"Found {len(results)} Pexels videos for '{query}'")
+                    return results
+                else:
+                    self.logger.warning(f"Pexels API error: {response.status}")
+                    return []
             
         except Exception as e:
             self.logger.error(f"Pexels video search failed: {str(e)}")
@@ -238,7 +669,7 @@ class StockContentIntegrator(BaseModule):
         count: int,
         orientation: str,
         **kwargs
-    ) -> List[Dict[str, Any]]:
+    ) -> List[StockImage]:
         """Search Pexels for images"""
         
         try:
@@ -256,28 +687,30 @@ class StockContentIntegrator(BaseModule):
                 "orientation": orientation if orientation in ["landscape", "portrait", "square"] else "landscape"
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.pexels_api_url}/search",
-                    headers=headers,
-                    params=params
-                ) as response:
+            cache_key = self._search_cache_key("pexels", f"{self.pexels_api_url}/search", params)
+            cached = self._get_cached_search(cache_key)
+            if cached is not None:
+                return cached
+            
+            async with self._provider_get(
+                "pexels",
+                f"{self.pexels_api_url}/search",
+                headers=headers,
+                params=params
+            ) as response:
+                
+                if response.status == 200:
+                    data = _json_loads(await response.read())
+                    photos = data.get("photos", [])
                     
-                    if response.status == 200:
-                        data = await response.json()
-                        photos = data.get("photos", [])
-                        
-                        results = []
-                        for photo in photos:
-                            result = await self._format_pexels_image(photo)
-                            if result:
-                                results.append(result)
-                        
-                        self.logger.info(f"Found {len(results)} Pexels images for '{query}'")
-                        return results
-                    else:
-                        self.logger.warning(f"Pexels API error: {response.status}")
-                        return []
+                    results = [result for result in (self._format_pexels_image(photo) for photo in photos) if result]
+                    
+                    self._store_search(cache_key, results)
+                    self.logger.info(f"Found {len(results)} Pexels images for '{query}'")
+                    return results
+                else:
+                    self.logger.warning(f"Pexels API error: {response.status}")
+                    return []
             
         except Exception as e:
             self.logger.error(f"Pexels image search failed: {str(e)}")
@@ -289,7 +722,7 @@ class StockContentIntegrator(BaseModule):
         count: int,
         duration_preference: str,
         **kwargs
-    ) -> List[Dict[str, Any]]:
+    ) -> List[StockVideo]:
         """Search Pixabay for videos"""
         
         try:
@@ -306,27 +739,29 @@ class StockContentIntegrator(BaseModule):
                 "min_height": self.content_filters["min_height"]
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    self.pixabay_video_api_url,
-                    params=params
-                ) as response:
+            cache_key = self._search_cache_key("pixabay", self.pixabay_video_api_url, params)
+            cached = self._get_cached_search(cache_key)
+            if cached is not None:
+                return cached
+            
+            async with self._provider_get(
+                "pixabay",
+                self.pixabay_video_api_url,
+                params=params
+            ) as response:
+                
+                if response.status == 200:
+                    data = _json_loads(await response.read())
+                    videos = data.get("hits", [])
                     
-                    if response.status == 200:
-                        data = await response.json()
-                        videos = data.get("hits", [])
-                        
-                        results = []
-                        for video in videos:
-                            result = await self._format_pixabay_video(video, duration_preference)
-                            if result:
-                                results.append(result)
-                        
-                        self.logger.info(f"Found {len(results)} Pixabay videos for '{query}'")
-                        return results
-                    else:
-                        self.logger.warning(f"Pixabay API error: {response.status}")
-                        return []
+                    results = [result for result in (self._format_pixabay_video(video, duration_preference) for video in videos) if result]
+                    
+                    self._store_search(cache_key, results)
+                    self.logger.info(f"Found {len(results)} Pixabay videos for '{query}'")
+                    return results
+                else:
+                    self.logger.warning(f"Pixabay API error: {response.status}")
+                    return []
             
         except Exception as e:
             self.logger.error(f"Pixabay video search failed: {str(e)}")
@@ -338,7 +773,7 @@ class StockContentIntegrator(BaseModule):
         count: int,
         orientation: str,
         **kwargs
-    ) -> List[Dict[str, Any]]:
+    ) -> List[StockImage]:
         """Search Pixabay for images"""
         
         try:
@@ -361,33 +796,35 @@ class StockContentIntegrator(BaseModule):
             elif orientation == "vertical":
                 params["orientation"] = "vertical"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    self.pixabay_api_url,
-                    params=params
-                ) as response:
+            cache_key = self._search_cache_key("pixabay", self.pixabay_api_url, params)
+            cached = self._get_cached_search(cache_key)
+            if cached is not None:
+                return cached
+            
+            async with self._provider_get(
+                "pixabay",
+                self.pixabay_api_url,
+                params=params
+            ) as response:
+                
+                if response.status == 200:
+                    data = _json_loads(await response.read())
+                    images = data.get("hits", [])
                     
-                    if response.status == 200:
-                        data = await response.json()
-                        images = data.get("hits", [])
-                        
-                        results = []
-                        for image in images:
-                            result = await self._format_pixabay_image(image)
-                            if result:
-                                results.append(result)
-                        
-                        self.logger.info(f"Found {len(results)} Pixabay images for '{query}'")
-                        return results
-                    else:
-                        self.logger.warning(f"Pixabay API error: {response.status}")
-                        return []
+                    results = [result for result in (self._format_pixabay_image(image) for image in images) if result]
+                    
+                    self._store_search(cache_key, results)
+                    self.logger.info(f"Found {len(results)} Pixabay images for '{query}'")
+                    return results
+                else:
+                    self.logger.warning(f"Pixabay API error: {response.status}")
+                    return []
             
         except Exception as e:
             self.logger.error(f"Pixabay image search failed: {str(e)}")
             return []
     
-    async def _format_pexels_video(self, video: Dict[str, Any], duration_preference: str) -> Optional[Dict[str, Any]]:
+    def _format_pexels_video(self, video: Dict[str, Any], duration_preference: str) -> Optional[StockVideo]:
         """Format Pexels video data"""
         
         try:
@@ -395,63 +832,62 @@ class StockContentIntegrator(BaseModule):
             if not video_files:
                 return None
             
-            # Choose best quality video file
-            best_file = None
-            for file in video_files:
-                if file.get("quality") == "hd":
-                    best_file = file
-                    break
-            
-            if not best_file:
-                best_file = video_files[0]  # Fallback to first available
+            # Choose best quality video file, falling back to the first available
+            best_file = next((file for file in video_files if file.get("quality") == "hd"), video_files[0])
+            width = best_file.get("width", 0)
+            height = best_file.get("height", 0)
             
-            return {
-                "id": f"pexels_{video['id']}",
-                "provider": "pexels",
-                "title": f"Pexels Video {video['id']}",
-                "description": f"Stock video from Pexels",
-                "url": best_file["link"],
-                "thumbnail_url": video.get("image", ""),
-                "duration": video.get("duration", 0),
-                "width": best_file.get("width", 0),
-                "height": best_file.get("height", 0),
-                "quality": best_file.get("quality", ""),
-                "file_type": best_file.get("file_type", "mp4"),
-                "photographer": video.get("user", {}).get("name", "Unknown"),
-                "photographer_url": video.get("user", {}).get("url", ""),
-                "license": "Pexels License (Free for commercial use)"
-            }
+            return StockVideo(
+                id=f"pexels_{video['id']}",
+                provider="pexels",
+                title=f"Pexels Video {video['id']}",
+                description=f"Stock video from Pexels",
+                url=best_file["link"],
+                thumbnail_url=video.get("image", ""),
+                duration=video.get("duration", 0),
+                width=width,
+                height=height,
+                pixels=width * height,
+                quality=best_file.get("quality", ""),
+                file_type=best_file.get("file_type", "mp4"),
+                photographer=video.get("user", {}).get("name", "Unknown"),
+                photographer_url=video.get("user", {}).get("url", ""),
+                license="Pexels License (Free for commercial use)"
+            )
             
         except Exception as e:
             self.logger.warning(f"Failed to format Pexels video: {str(e)}")
             return None
     
-    async def _format_pexels_image(self, photo: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _format_pexels_image(self, photo: Dict[str, Any]) -> Optional[StockImage]:
         """Format Pexels image data"""
         
         try:
             src = photo.get("src", {})
+            width = photo.get("width", 0)
+            height = photo.get("height", 0)
             
-            return {
-                "id": f"pexels_{photo['id']}",
-                "provider": "pexels",
-                "title": photo.get("alt", f"Pexels Image {photo['id']}"),
-                "description": photo.get("alt", "Stock image from Pexels"),
-                "url": src.get("large2x", src.get("large", src.get("medium", ""))),
-                "thumbnail_url": src.get("medium", src.get("small", "")),
-                "width": photo.get("width", 0),
-                "height": photo.get("height", 0),
-                "photographer": photo.get("photographer", "Unknown"),
-                "photographer_url": photo.get("photographer_url", ""),
-                "license": "Pexels License (Free for commercial use)",
-                "avg_color": photo.get("avg_color", "#000000")
-            }
+            return StockImage(
+                id=f"pexels_{photo['id']}",
+                provider="pexels",
+                title=photo.get("alt", f"Pexels Image {photo['id']}"),
+                description=photo.get("alt", "Stock image from Pexels"),
+                url=src.get("large2x", src.get("large", src.get("medium", ""))),
+                thumbnail_url=src.get("medium", src.get("small", "")),
+                width=width,
+                height=height,
+                pixels=width * height,
+                photographer=photo.get("photographer", "Unknown"),
+                photographer_url=photo.get("photographer_url", ""),
+                license="Pexels License (Free for commercial use)",
+                avg_color=photo.get("avg_color", "#000000")
+            )
             
         except Exception as e:
             self.logger.warning(f"Failed to format Pexels image: {str(e)}")
             return None
     
-    async def _format_pixabay_video(self, video: Dict[str, Any], duration_preference: str) -> Optional[Dict[str, Any]]:
+    def _format_pixabay_video(self, video: Dict[str, Any], duration_preference: str) -> Optional[StockVideo]:
         """Format Pixabay video data"""
         
         try:
@@ -469,105 +905,94 @@ class StockContentIntegrator(BaseModule):
             if not video_url:
                 return None
             
-            return {
-                "id": f"pixabay_{video['id']}",
-                "provider": "pixabay",
-                "title": video.get("tags", f"Pixabay Video {video['id']}"),
-                "description": f"Stock video from Pixabay - {video.get('tags', '')}",
-                "url": video_url,
-                "thumbnail_url": video.get("picture_id", ""),
-                "duration": video.get("duration", 0),
-                "width": video.get("width", 0),
-                "height": video.get("height", 0),
-                "views": video.get("views", 0),
-                "downloads": video.get("downloads", 0),
-                "user": video.get("user", "Unknown"),
-                "tags": video.get("tags", ""),
-                "license": "Pixabay License (Free for commercial use)"
-            }
+            width = video.get("width", 0)
+            height = video.get("height", 0)
+            
+            return StockVideo(
+                id=f"pixabay_{video['id']}",
+                provider="pixabay",
+                title=video.get("tags", f"Pixabay Video {video['id']}"),
+                description=f"Stock video from Pixabay - {video.get('tags', '')}",
+                url=video_url,
+                thumbnail_url=video.get("picture_id", ""),
+                duration=video.get("duration", 0),
+                width=width,
+                height=height,
+                pixels=width * height,
+                views=video.get("views", 0),
+                downloads=video.get("downloads", 0),
+                user=video.get("user", "Unknown"),
+                tags=video.get("tags", ""),
+                license="Pixabay License (Free for commercial use)"
+            )
             
         except Exception as e:
             self.logger.warning(f"Failed to format Pixabay video: {str(e)}")
             return None
     
-    async def _format_pixabay_image(self, image: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _format_pixabay_image(self, image: Dict[str, Any]) -> Optional[StockImage]:
         """Format Pixabay image data"""
         
         try:
-            return {
-                "id": f"pixabay_{image['id']}",
-                "provider": "pixabay",
-                "title": image.get("tags", f"Pixabay Image {image['id']}"),
-                "description": f"Stock image from Pixabay - {image.get('tags', '')}",
-                "url": image.get("largeImageURL", image.get("webformatURL", "")),
-                "thumbnail_url": image.get("previewURL", ""),
-                "width": image.get("imageWidth", 0),
-                "height": image.get("imageHeight", 0),
-                "views": image.get("views", 0),
-                "downloads": image.get("downloads", 0),
-                "user": image.get("user", "Unknown"),
-                "tags": image.get("tags", ""),
-                "license": "Pixabay License (Free for commercial use)"
-            }
+            width = image.get("imageWidth", 0)
+            height = image.get("imageHeight", 0)
+            
+            return StockImage(
+                id=f"pixabay_{image['id']}",
+                provider="pixabay",
+                title=image.get("tags", f"Pixabay Image {image['id']}"),
+                description=f"Stock image from Pixabay - {image.get('tags', '')}",
+                url=image.get("largeImageURL", image.get("webformatURL", "")),
+                thumbnail_url=image.get("previewURL", ""),
+                width=width,
+                height=height,
+                pixels=width * height,
+                views=image.get("views", 0),
+                downloads=image.get("downloads", 0),
+                user=image.get("user", "Unknown"),
+                tags=image.get("tags", ""),
+                license="Pixabay License (Free for commercial use)"
+            )
             
         except Exception as e:
             self.logger.warning(f"Failed to format Pixabay image: {str(e)}")
             return None
     
-    async def _filter_video_results(self, results: List[Dict[str, Any]], **kwargs) -> List[Dict[str, Any]]:
+    def _meets_resolution(self, result: StockResult) -> bool:
+        """Check minimum resolution; Pixabay already applies it server-side"""
+        if result.provider == "pixabay":
+            return True
+        return (result.width >= self.content_filters["min_width"]
+                and result.height >= self.content_filters["min_height"])
+    
+    @staticmethod
+    def _rank_results(filtered: List[StockResult], count: Optional[int]) -> List[StockResult]:
+        """Order results by quality/views, keeping only the top count when given"""
+        if count is None:
+            return sorted(filtered, key=_rank_key, reverse=True)
+        return heapq.nlargest(count, filtered, key=_rank_key)
+    
+    def _filter_video_results(self, results: List[StockVideo], count: Optional[int] = None,
+                              **kwargs) -> List[StockVideo]:
         """Filter video results based on criteria"""
+        min_duration = self.content_filters["video_min_duration"]
+        max_duration = self.content_filters["video_max_duration"]
         
-        filtered = []
+        filtered = [
+            result for result in results
+            if min_duration <= result.duration <= max_duration and self._meets_resolution(result)
+        ]
         
-        for result in results:
-            # Duration filter
-            duration = result.get("duration", 0)
-            if duration < self.content_filters["video_min_duration"]:
-                continue
-            if duration > self.content_filters["video_max_duration"]:
-                continue
-            
-            # Resolution filter
-            width = result.get("width", 0)
-            height = result.get("height", 0)
-            if width < self.content_filters["min_width"] or height < self.content_filters["min_height"]:
-                continue
-            
-            filtered.append(result)
-        
-        # Sort by quality/views
-        filtered.sort(key=lambda x: (
-            x.get("width", 0) * x.get("height", 0),  # Resolution
-            x.get("views", 0),  # Popularity
-            x.get("downloads", 0)  # Usage
-        ), reverse=True)
-        
-        return filtered
+        return self._rank_results(filtered, count)
     
-    async def _filter_image_results(self, results: List[Dict[str, Any]], **kwargs) -> List[Dict[str, Any]]:
+    def _filter_image_results(self, results: List[StockImage], count: Optional[int] = None,
+                              **kwargs) -> List[StockImage]:
         """Filter image results based on criteria"""
+        filtered = [result for result in results if self._meets_resolution(result)]
         
-        filtered = []
-        
-        for result in results:
-            # Resolution filter
-            width = result.get("width", 0)
-            height = result.get("height", 0)
-            if width < self.content_filters["min_width"] or height < self.content_filters["min_height"]:
-                continue
-            
-            filtered.append(result)
-        
-        # Sort by quality/views
-        filtered.sort(key=lambda x: (
-            x.get("width", 0) * x.get("height", 0),  # Resolution
-            x.get("views", 0),  # Popularity
-            x.get("downloads", 0)  # Usage
-        ), reverse=True)
-        
-        return filtered
+        return self._rank_results(filtered, count)
     
-    async def download_content(self, content_item: Dict[str, Any]) -> str:
+    async def download_content(self, content_item: Union[StockResult, Dict[str, Any]]) -> str:
         """Download content item to local cache"""
         
         try:
@@ -576,17 +1001,24 @@ class StockContentIntegrator(BaseModule):
             provider = content_item["provider"]
             
             # Determine file extension
-            parsed_url = urlparse(content_url)
-            file_ext = Path(parsed_url.path).suffix or ".mp4"
+            suffix_match = _SUFFIX_RE.search(content_url)
+            file_ext = suffix_match.group(1).lower() if suffix_match else ".mp4"
             
             # Create cache filename
             cache_filename = f"{provider}_{content_id}{file_ext}"
             
             # Determine cache directory
-            if "video" in content_item.get("file_type", "") or file_ext in [".mp4", ".mov", ".avi"]:
-                cache_path = Path(self.videos_cache_dir) / cache_filename
+            if content_item.get("file_type", "").startswith("video") or file_ext in _VIDEO_EXTS:
+                cache_path = self._videos_cache_path / cache_filename
             else:
-                cache_path = Path(self.images_cache_dir) / cache_filename
+                cache_path = self._images_cache_path / cache_filename
+            
+            # Same URL already downloaded, possibly for another item
+            url_key = hashlib.sha256(content_url.encode()).hexdigest()
+            indexed_path = self._url_index.get(url_key)
+            if indexed_path and Path(indexed_path).exists():
+                self.logger.info(f"Content already cached: {indexed_path}")
+                return indexed_path
             
             # Check if already cached
             if cache_path.exists():
@@ -596,48 +1028,189 @@ class StockContentIntegrator(BaseModule):
             # Download content
             self.logger.info(f"Downloading content: {content_url}")
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(content_url) as response:
-                    if response.status == 200:
-                        cache_path.parent.mkdir(parents=True, exist_ok=True)
-                        
-                        with open(cache_path, 'wb') as f:
-                            async for chunk in response.content.iter_chunked(8192):
-                                f.write(chunk)
+            # Large files may take longer than the API timeout; only bound stalls
+            async with self._provider_get(
+                provider,
+                content_url,
+                timeout=aiohttp.ClientTimeout(total=None, sock_read=30)
+            ) as response:
+                if response.status == 200:
+                    cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    
+                    # Write to a partial file so an interrupted download is never served from cache
+                    part_path = cache_path.with_suffix(cache_path.suffix + ".part")
+                    content_hash = hashlib.sha256()
+                    try:
+                        async with aiofiles.open(part_path, 'wb') as f:
+                            if response.content_length and hasattr(os, "posix_fallocate"):
+                                try:
+                                    os.posix_fallocate(f.fileno(), 0, response.content_length)
+                                except OSError:
+                                    pass
+                            
+                            # Decouple network reads from disk writes so a slow disk
+                            # only stalls the socket once the queue is full
+                            chunks: asyncio.Queue = asyncio.Queue(maxsize=self.download_queue_size)
+                            
+                            async def read_chunks():
+                                async for chunk in response.content.iter_chunked(self.download_chunk_size):
+                                    await chunks.put(chunk)
+                                await chunks.put(None)
+                            
+                            async def write_chunks():
+                                while True:
+                                    chunk = await chunks.get()
+                                    if chunk is None:
+                                        break
+                                    content_hash.update(chunk)
+                                    await f.write(chunk)
+                            
+                            reader = asyncio.ensure_future(read_chunks())
+                            writer = asyncio.ensure_future(write_chunks())
+                            try:
+                                await asyncio.gather(reader, writer)
+                            finally:
+                                # Either side failing must not leave the other blocked on the queue
+                                reader.cancel()
+                                writer.cancel()
+                            
+                            # Drop any preallocated space the body did not fill
+                            await f.truncate()
                         
-                        self.logger.info(f"Content downloaded: {cache_path}")
-                        return str(cache_path)
-                    else:
-                        raise RuntimeError(f"Download failed: HTTP {response.status}")
+                        os.replace(part_path, cache_path)
+                    except BaseException:
+                        part_path.unlink(missing_ok=True)
+                        raise
+                    
+                    stored_path = self._dedupe_download(cache_path, content_hash.hexdigest())
+                    self._url_index[url_key] = stored_path
+                    self._save_cache_manifest()
+                    
+                    self.logger.info(f"Content downloaded: {stored_path}")
+                    return stored_path
+                else:
+                    raise RuntimeError(f"Download failed: HTTP {response.status}")
             
         except Exception as e:
             self.logger.error(f"Content download failed: {str(e)}")
             raise
     
+    async def download_many(
+        self,
+        content_items: List[Union[StockResult, Dict[str, Any]]],
+        concurrency: int = 6
+    ) -> List[Union[str, BaseException]]:
+        """Download several content items concurrently, in input order"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def download_one(content_item):
+            async with semaphore:
+                return await self.download_content(content_item)
+        
+        # Items with the same URL share one transfer
+        downloads = {}
+        for content_item in content_items:
+            url = content_item.get("url")
+            if url not in downloads:
+                downloads[url] = asyncio.ensure_future(download_one(content_item))
+        
+        return list(await asyncio.gather(
+            *(downloads[content_item.get("url")] for content_item in content_items),
+            return_exceptions=True
+        ))
+    
+    def _dedupe_download(self, cache_path: Path, content_hash: str) -> str:
+        """Keep one copy of identical content, linking duplicates to it"""
+        existing = self._content_index.get(content_hash)
+        if not existing or existing == str(cache_path) or not Path(existing).exists():
+            self._content_index[content_hash] = str(cache_path)
+            return str(cache_path)
+        
+        cache_path.unlink()
+        try:
+            os.link(existing, cache_path)
+            return str(cache_path)
+        except OSError:
+            return existing
+    
+    def _load_cache_manifest(self):
+        """Load the download dedup indexes from disk"""
+        try:
+            with open(self.cache_manifest_file) as f:
+                manifest = json.load(f)
+            self._url_index = manifest.get("urls", {})
+            self._content_index = manifest.get("contents", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable cache manifest: {str(e)}")
+    
+    def _save_cache_manifest(self):
+        """Schedule the download dedup indexes to be persisted"""
+        # Coalesce bursts of downloads into one write
+        self._cache_manifest_dirty = True
+        if self._cache_manifest_flush is None or self._cache_manifest_flush.done():
+            self._cache_manifest_flush = asyncio.create_task(self._flush_cache_manifest())
+    
+    async def _flush_cache_manifest(self):
+        """Persist the download dedup indexes after a short delay"""
+        # Downloads that land during a write trigger another round
+        while self._cache_manifest_dirty:
+            await asyncio.sleep(self.cache_manifest_flush_delay)
+            await self._write_cache_manifest()
+    
+    async def _write_cache_manifest(self):
+        """Write the download dedup indexes to disk atomically"""
+        self._cache_manifest_dirty = False
+        manifest = _json_dumps({"urls": self._url_index, "contents": self._content_index})
+        
+        # A unique temp file, so an interrupted write never clobbers a later one
+        temp_path = Path(f"{self.cache_manifest_file}.{os.getpid()}.{time.monotonic_ns()}.tmp")
+        try:
+            async with aiofiles.open(temp_path, 'wb') as f:
+                await f.write(manifest)
+            os.replace(temp_path, self.cache_manifest_file)
+        except OSError as e:
+            self.logger.warning(f"Failed to save cache manifest: {str(e)}")
+        finally:
+            temp_path.unlink(missing_ok=True)
+    
     async def get_b_roll_content(
         self,
         topic: str,
         num_videos: int = 3,
         num_images: int = 5,
-        category: Optional[str] = None
+        category: Optional[str] = None,
+        download: bool = False
     ) -> Dict[str, List[Dict[str, Any]]]:
-        """Get B-roll content for a topic"""
+        """Get B-roll content for a topic, optionally downloading it as well"""
         
         try:
-            # Search for videos and images
-            videos = await self.search_videos(
-                query=topic,
-                category=category,
-                count=num_videos,
-                duration_preference="short"
+            # Search for videos and images at the same time
+            videos, images = await asyncio.gather(
+                self.search_videos(
+                    query=topic,
+                    category=category,
+                    count=num_videos,
+                    duration_preference="short"
+                ),
+                self.search_images(
+                    query=topic,
+                    category=category,
+                    count=num_images,
+                    orientation="horizontal"
+                )
             )
             
-            images = await self.search_images(
-                query=topic,
-                category=category,
-                count=num_images,
-                orientation="horizontal"
-            )
+            # The response is a plain payload; downloads annotate its items
+            videos = [video.to_dict() for video in videos]
+            images = [image.to_dict() for image in images]
+            
+            if download:
+                # Failed downloads are left without a local path
+                items = videos + images
+                for item, path in zip(items, await self.download_many(items)):
+                    item["local_path"] = path if isinstance(path, str) else None
             
             return {
                 "videos": videos,
@@ -668,9 +1241,26 @@ class StockContentIntegrator(BaseModule):
         """Get cache directory sizes"""
         try:
             def get_dir_size(directory):
-                if not Path(directory).exists():
+                if not os.path.isdir(directory):
                     return 0
-                return sum(f.stat().st_size for f in Path(directory).rglob('*') if f.is_file())
+                
+                total = 0
+                seen_links = set()
+                stack = [directory]
+                while stack:
+                    with os.scandir(stack.pop()) as entries:
+                        for entry in entries:
+                            if entry.is_file(follow_symlinks=False):
+                                stat = entry.stat(follow_symlinks=False)
+                                # Deduplicated downloads are hard links; count their data once
+                                if stat.st_nlink > 1:
+                                    if (stat.st_dev, stat.st_ino) in seen_links:
+                                        continue
+                                    seen_links.add((stat.st_dev, stat.st_ino))
+                                total += stat.st_size
+                            elif entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                return total
             
             videos_size = get_dir_size(self.videos_cache_dir)
             images_size = get_dir_size(self.images_cache_dir)
@@ -6,13 +6,96 @@ Handles voice synthesis for YouTube automation
 import os
 import logging
 import asyncio
+import ctypes
+import ctypes.util
+import hashlib
+import io
+import re
 import tempfile
+import threading
+import time
+import wave
+from collections import OrderedDict
+from contextlib import nullcontext
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Disk cache entries are named by their SHA-256 request key
+_CACHE_FILE_RE = re.compile(r'^[0-9a-f]{64}\.wav$')
+
+class _EspeakLibrary:
+    """In-process libespeak-ng synthesis, avoiding a fork/exec per request"""
+    
+    AUDIO_OUTPUT_SYNCHRONOUS = 2
+    POS_CHARACTER = 1
+    CHARS_UTF8 = 1
+    RATE = 1
+    SYNTH_CALLBACK = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(ctypes.c_short), ctypes.c_int, ctypes.c_void_p)
+    
+    def __init__(self, library_path: str):
+        self._lib = ctypes.CDLL(library_path)
+        self._lib.espeak_SetVoiceByName.argtypes = [ctypes.c_char_p]
+        self._lib.espeak_Synth.argtypes = [
+            ctypes.c_char_p, ctypes.c_size_t, ctypes.c_uint, ctypes.c_int,
+            ctypes.c_uint, ctypes.c_uint, ctypes.c_void_p, ctypes.c_void_p
+        ]
+        
+        # Synchronous mode hands the samples to the callback before espeak_Synth returns
+        self.sample_rate = self._lib.espeak_Initialize(self.AUDIO_OUTPUT_SYNCHRONOUS, 0, None, 0)
+        if self.sample_rate <= 0:
+            raise OSError("espeak initialization failed")
+        
+        self._chunks: List[bytes] = []
+        # Keep a reference so the callback is not garbage collected
+        self._callback = self.SYNTH_CALLBACK(self._collect)
+        self._lib.espeak_SetSynthCallback(self._callback)
+        # The library keeps global state, so one synthesis runs at a time
+        self._lock = threading.Lock()
+    
+    def _collect(self, wav, num_samples, events) -> int:
+        if num_samples > 0:
+            self._chunks.append(ctypes.string_at(wav, num_samples * 2))
+        return 0
+    
+    def synthesize(self, text: str, voice_name: str, rate: int, output_path: str):
+        """Synthesize text into a 16-bit mono WAV file"""
+        data = text.encode()
+        with self._lock:
+            self._chunks = []
+            if self._lib.espeak_SetVoiceByName(voice_name.encode()) != 0:
+                raise RuntimeError(f"espeak voice not available: {voice_name}")
+            self._lib.espeak_SetParameter(self.RATE, rate, 0)
+            
+            result = self._lib.espeak_Synth(data, len(data) + 1, 0, self.POS_CHARACTER, 0, self.CHARS_UTF8, None, None)
+            if result != 0:
+                raise RuntimeError(f"espeak synthesis failed with code {result}")
+            audio = b"".join(self._chunks)
+        
+        with wave.open(output_path, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.sample_rate)
+            wav_file.writeframes(audio)
+
+_espeak_library: Optional[_EspeakLibrary] = None
+_espeak_library_loaded = False
+
+def _get_espeak_library() -> Optional[_EspeakLibrary]:
+    """Load libespeak-ng once per process, or None if it is not installed"""
+    global _espeak_library, _espeak_library_loaded
+    if not _espeak_library_loaded:
+        _espeak_library_loaded = True
+        library_path = ctypes.util.find_library("espeak-ng") or ctypes.util.find_library("espeak")
+        if library_path:
+            try:
+                _espeak_library = _EspeakLibrary(library_path)
+            except (OSError, AttributeError) as e:
+                logger.warning(f"Failed to load espeak library: {str(e)}")
+    return _espeak_library
+
 class TTSProvider(Enum):
     """TTS Provider options"""
     OPENAI = "openai"
@@ -31,12 +114,37 @@ class TTSVoice(Enum):
 class TTSSynthesizer:
     """Text-to-Speech Synthesizer"""
     
+    # Provider limits: max concurrent requests, requests per second and burst size
+    _PROVIDER_LIMITS = {
+        TTSProvider.OPENAI: (5, 50 / 60, 5),
+        TTSProvider.ELEVENLABS: (2, 2.0, 2),  # Free tier concurrency
+        TTSProvider.GOOGLE: (10, 15.0, 10)
+    }
+    
     def __init__(self):
         self.provider = TTSProvider.SYSTEM  # Default to system TTS
         self.voice = TTSVoice.MALE_PROFESSIONAL
         self.output_dir = Path("assets/audio")
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
+        # Hot tier in front of the disk cache: request key -> WAV bytes
+        self._mem_cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._mem_cache_bytes = 0
+        self.mem_cache_max_entries = 128
+        self.mem_cache_max_bytes = 32 * 1024 * 1024
+        
+        # Token buckets per provider: rate, burst size and current state
+        self._provider_buckets = {
+            provider: {"rate": rate, "capacity": burst, "tokens": float(burst), "updated": 0.0}
+            for provider, (_, rate, burst) in self._PROVIDER_LIMITS.items()
+        }
+        
+        # Semaphores bind to the event loop they are first used in, so they are
+        # created lazily and rebuilt if the synthesizer is used from another loop
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._provider_semaphores: Dict[TTSProvider, asyncio.Semaphore] = {}
+        self._system_tts_slots: Optional[asyncio.Semaphore] = None  # concurrent espeak processes
+        
         # API configurations
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
         self.elevenlabs_api_key = os.getenv('ELEVENLABS_API_KEY')
@@ -56,23 +164,62 @@ class TTSSynthesizer:
             voice = voice or self.voice
             provider = provider or self.provider
             
-            if not output_path:
-                import time
-                filename = f"tts_{int(time.time())}.wav"
-                output_path = str(self.output_dir / filename)
+            # Identical requests (intros, outros, ...) reuse earlier audio
+            key = self._cache_key(text, voice, provider)
+            cache_path = self.output_dir / f"{key}.wav"
+            if os.getenv("TTS_NO_CACHE") != "1":
+                audio = self._mem_cache.get(key)
+                if audio is not None:
+                    self._mem_cache.move_to_end(key)
+                    logger.info(f"TTS memory cache hit: {cache_path}")
+                    return self._deliver_audio(audio, cache_path, output_path)
+                
+                audio = self._read_cached_audio(cache_path)
+                if audio is not None:
+                    self._remember_audio(key, audio)
+                    logger.info(f"TTS disk cache hit: {cache_path}")
+                    return self._deliver_audio(audio, cache_path, output_path)
             
             logger.info(f"Synthesizing text with {provider.value} voice {voice.value}")
             
-            # Choose synthesis method based on provider
-            if provider == TTSProvider.OPENAI:
-                await self._synthesize_openai(text, voice, output_path)
-            elif provider == TTSProvider.ELEVENLABS:
-                await self._synthesize_elevenlabs(text, voice, output_path)
-            elif provider == TTSProvider.GOOGLE:
-                await self._synthesize_google(text, voice, output_path)
-            else:
-                await self._synthesize_system(text, voice, output_path)
+            # Synthesize to a temporary file so a failed run never lands in the cache
+            fd, part_path = tempfile.mkstemp(dir=self.output_dir, suffix=".wav.part")
+            os.close(fd)
+            try:
+                # Throttle up front rather than retrying after 429s
+                async with self._bind_semaphores().get(provider) or nullcontext():
+                    await self._acquire_token(provider)
+                    
+                    # Choose synthesis method based on provider
+                    if provider == TTSProvider.OPENAI:
+                        placeholder = await self._synthesize_openai(text, voice, part_path)
+                    elif provider == TTSProvider.ELEVENLABS:
+                        placeholder = await self._synthesize_elevenlabs(text, voice, part_path)
+                    elif provider == TTSProvider.GOOGLE:
+                        placeholder = await self._synthesize_google(text, voice, part_path)
+                    else:
+                        placeholder = await self._synthesize_system(text, voice, part_path)
+                
+                # Placeholder audio must never be served as a cached result for this text
+                if placeholder:
+                    if output_path and Path(output_path) != cache_path:
+                        target = output_path
+                    else:
+                        target = str(self.output_dir / f"placeholder_{key}.wav")
+                    os.replace(part_path, target)
+                else:
+                    os.replace(part_path, cache_path)
+            except BaseException:
+                Path(part_path).unlink(missing_ok=True)
+                raise
             
+            if placeholder:
+                logger.warning(f"TTS produced placeholder audio (not cached): {target}")
+                return target
+            
+            audio = cache_path.read_bytes()
+            self._remember_audio(key, audio)
+            output_path = self._deliver_audio(audio, cache_path, output_path)
             logger.info(f"TTS synthesis completed: {output_path}")
             return output_path
             
@@ -80,7 +227,96 @@ class TTSSynthesizer:
             logger.error(f"TTS synthesis failed: {str(e)}")
             raise
     
-    async def _synthesize_openai(self, text: str, voice: TTSVoice, output_path: str):
+    def _bind_semaphores(self) -> Dict[TTSProvider, asyncio.Semaphore]:
+        """Provider semaphores for the running loop, creating them on first use there"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore_loop = loop
+            self._provider_semaphores = {
+                provider: asyncio.Semaphore(concurrency)
+                for provider, (concurrency, _, _) in self._PROVIDER_LIMITS.items()
+            }
+            self._system_tts_slots = asyncio.Semaphore(os.cpu_count() or 2)
+        return self._provider_semaphores
+    
+    async def _acquire_token(self, provider: TTSProvider):
+        """Wait for the provider's rate limit to allow another request"""
+        bucket = self._provider_buckets.get(provider)
+        if bucket is None:
+            return
+        
+        now = time.monotonic()
+        bucket["tokens"] = min(bucket["capacity"], bucket["tokens"] + (now - bucket["updated"]) * bucket["rate"])
+        bucket["updated"] = now
+        
+        # Reserve a token now and wait out any deficit, so waiters are spaced evenly
+        bucket["tokens"] -= 1
+        if bucket["tokens"] < 0:
+            await asyncio.sleep(-bucket["tokens"] / bucket["rate"])
+    
+    @staticmethod
+    def _cache_key(text: str, voice: TTSVoice, provider: TTSProvider) -> str:
+        """Content address of the audio for one synthesis request"""
+        return hashlib.sha256(f"{provider.value}|{voice.value}|{text}".encode()).hexdigest()
+    
+    @staticmethod
+    def _read_cached_audio(path: Path) -> Optional[bytes]:
+        """Read a cached file, or None if it is missing or not valid WAV"""
+        try:
+            audio = path.read_bytes()
+            with wave.open(io.BytesIO(audio), 'rb'):
+                return audio
+        except (OSError, EOFError, wave.Error):
+            return None
+    
+    @staticmethod
+    def _deliver_audio(audio: bytes, cache_path: Path, output_path: Optional[str]) -> str:
+        """Write audio to the requested path, or hand out the cached file itself"""
+        if output_path and Path(output_path) != cache_path:
+            Path(output_path).write_bytes(audio)
+            return output_path
+        
+        # The disk tier may have been cleared while the audio stayed hot
+        if not cache_path.exists():
+            cache_path.write_bytes(audio)
+        return str(cache_path)
+    
+    def _remember_audio(self, key: str, audio: bytes):
+        """Keep audio in the hot tier, evicting the least recently used entries"""
+        previous = self._mem_cache.pop(key, None)
+        if previous is not None:
+            self._mem_cache_bytes -= len(previous)
+        
+        if len(audio) > self.mem_cache_max_bytes:
+            return
+        
+        self._mem_cache[key] = audio
+        self._mem_cache_bytes += len(audio)
+        while len(self._mem_cache) > self.mem_cache_max_entries or self._mem_cache_bytes > self.mem_cache_max_bytes:
+            _, evicted = self._mem_cache.popitem(last=False)
+            self._mem_cache_bytes -= len(evicted)
+    
+    def clear_cache(self, tier: str = "all"):
+        """Clear cached synthesis results ("hot", "disk" or "all")"""
+        if tier not in ("hot", "disk", "all"):
+            raise ValueError(f"Unknown cache tier: {tier}")
+        
+        if tier in ("hot", "all"):
+            self._mem_cache.clear()
+            self._mem_cache_bytes = 0
+        
+        if tier in ("disk", "all"):
+            # Only cache entries; caller-named outputs share the directory
+            removed = 0
+            for entry in os.scandir(self.output_dir):
+                if _CACHE_FILE_RE.match(entry.name):
+                    Path(entry.path).unlink(missing_ok=True)
+                    removed += 1
+            logger.info(f"Removed {removed} cached TTS files")
+    
+    # Provider methods return True when they wrote placeholder audio instead of speech
+    
+    async def _synthesize_openai(self, text: str, voice: TTSVoice, output_path: str) -> bool:
         """Synthesize using OpenAI TTS"""
         if not self.openai_api_key:
             raise ValueError("OpenAI API key not configured")
@@ -88,8 +324,9 @@ class TTSSynthesizer:
         # Mock implementation - would use actual OpenAI TTS API
         await self._create_mock_audio(text, output_path)
         logger.info("Mock OpenAI TTS synthesis completed")
+        return True
     
-    async def _synthesize_elevenlabs(self, text: str, voice: TTSVoice, output_path: str):
+    async def _synthesize_elevenlabs(self, text: str, voice: TTSVoice, output_path: str) -> bool:
         """Synthesize using ElevenLabs TTS"""
         if not self.elevenlabs_api_key:
             raise ValueError("ElevenLabs API key not configured")
@@ -97,35 +334,51 @@ class TTSSynthesizer:
         # Mock implementation - would use actual ElevenLabs API
         await self._create_mock_audio(text, output_path)
         logger.info("Mock ElevenLabs TTS synthesis completed")
+        return True
     
-    async def _synthesize_google(self, text: str, voice: TTSVoice, output_path: str):
+    async def _synthesize_google(self, text: str, voice: TTSVoice, output_path: str) -> bool:
         """Synthesize using Google Cloud TTS"""
         # Mock implementation - would use Google Cloud TTS
         await self._create_mock_audio(text, output_path)
         logger.info("Mock Google TTS synthesis completed")
+        return True
     
-    async def _synthesize_system(self, text: str, voice: TTSVoice, output_path: str):
+    async def _synthesize_system(self, text: str, voice: TTSVoice, output_path: str) -> bool:
         """Synthesize using system TTS (espeak/pico2wave)"""
+        # Prefer the shared library, which is loaded once and kept warm
+        library = _get_espeak_library()
+        if library:
+            try:
+                await asyncio.to_thread(library.synthesize, text, 'en+m3', 150, output_path)
+                logger.info("System TTS (libespeak) synthesis completed")
+                return False
+            except (OSError, RuntimeError) as e:
+                logger.warning(f"espeak library synthesis failed: {str(e)}")
+        
         try:
-            # Try to use system TTS tools
-            import subprocess
-            
-            # Try espeak first
-            result = subprocess.run([
-                'espeak', '-s', '150', '-v', 'en+m3', '-w', output_path, text
-            ], capture_output=True, text=True)
+            # Try espeak without blocking the event loop
+            self._bind_semaphores()
+            async with self._system_tts_slots:
+                process = await asyncio.create_subprocess_exec(
+                    'espeak', '-s', '150', '-v', 'en+m3', '-w', output_path, text,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
+                await process.wait()
             
-            if result.returncode == 0:
+            if process.returncode == 0:
                 logger.info("System TTS (espeak) synthesis completed")
-                return
+                return False
             
             # Fall back to mock audio
             await self._create_mock_audio(text, output_path)
+            return True
             
         except FileNotFoundError:
             # espeak not available, create mock audio
             await self._create_mock_audio(text, output_path)
             logger.info("System TTS not available, created mock audio")
+            return True
     
     async def _create_mock_audio(self, text: str, output_path: str):
         """Create mock audio file for testing"""
@@ -0,0 +1,165 @@
+"""
+Unit tests for Social Blade-style growth tracking and channel comparison
+"""
+
+import asyncio
+
+import pytest
+
+from modules.socialblade_integration.growth_tracker import GrowthTracker
+
+
+class TestChannelInitialization:
+    """Test channel history initialization"""
+
+    @pytest.fixture
+    def growth_tracker(self):
+        """Create growth tracker instance"""
+        return GrowthTracker()
+
+    def test_concurrent_requests_initialize_once(self, growth_tracker):
+        """Test racing requests for a new channel share one simulated history"""
+        initialized = []
+        initialize_channels = growth_tracker._initialize_channels
+
+        async def counting_initialize(channel_ids):
+            initialized.extend(channel_ids)
+            await initialize_channels(channel_ids)
+
+        growth_tracker._initialize_channels = counting_initialize
+
+        async def run():
+            await asyncio.gather(*(growth_tracker._ensure_channel_data("UC_test") for _ in range(5)))
+
+        asyncio.run(run())
+
+        assert initialized == ["UC_test"]
+
+
+class TestDerivedCache:
+    """Test caching and invalidation of per-channel analyses"""
+
+    @pytest.fixture
+    def growth_tracker(self):
+        """Create growth tracker instance"""
+        return GrowthTracker()
+
+    def test_cached_analysis_is_copied(self, growth_tracker):
+        """Test callers mutating a result do not corrupt the cached analysis"""
+        async def run():
+            first = await growth_tracker.track_channel_growth("UC_test")
+            first['recommendations'] = []
+            first['extra'] = True
+            return first, await growth_tracker.track_channel_growth("UC_test")
+
+        first, second = asyncio.run(run())
+
+        assert second is not first
+        assert 'extra' not in second
+        assert second['recommendations']
+
+    def test_cached_until_history_changes(self, growth_tracker):
+        """Test analyses are reused until the channel history is re-simulated"""
+        async def run():
+            first = await growth_tracker.track_channel_growth("UC_test")
+            cached = await growth_tracker.track_channel_growth("UC_test")
+            await growth_tracker._initialize_channels(["UC_test"])
+            return first, cached, await growth_tracker.track_channel_growth("UC_test")
+
+        first, cached, refreshed = asyncio.run(run())
+
+        assert cached['analysis_date'] == first['analysis_date']
+        assert refreshed['current_metrics'] is not first['current_metrics']
+
+    def test_expired_analysis_recomputed(self, growth_tracker):
+        """Test analyses older than the snapshot TTL are recomputed"""
+        growth_tracker.snapshot_ttl = 0
+
+        async def run():
+            first = await growth_tracker.track_channel_growth("UC_test")
+            return first, await growth_tracker.track_channel_growth("UC_test")
+
+        first, second = asyncio.run(run())
+
+        assert second['current_metrics'] is not first['current_metrics']
+
+
+class TestRelativePerformance:
+    """Test relative performance in channel comparisons"""
+
+    @pytest.fixture
+    def growth_tracker(self):
+        """Create growth tracker instance"""
+        return GrowthTracker()
+
+    def _compare(self, growth_tracker, subscribers):
+        """Compare channels whose current subscriber counts are fixed"""
+        async def run():
+            channel_ids = list(subscribers)
+            await growth_tracker._initialize_channels(channel_ids)
+            for channel_id, count in subscribers.items():
+                metrics = await growth_tracker._get_current_metrics(channel_id)
+                metrics['subscribers'] = count
+            return await growth_tracker.compare_channels(channel_ids)
+
+        return asyncio.run(run())
+
+    def test_leader_and_followers(self, growth_tracker):
+        """Test the leader is at 100% and followers are relative to it"""
+        result = self._compare(growth_tracker, {"UC_a": 500, "UC_b": 2000, "UC_c": 1000})
+
+        performances = {
+            data['channel_id']: data['relative_performance'] for data in result['rankings']
+        }
+        assert performances["UC_b"] == {
+            'relative_percentage': 100.0, 'gap_to_leader': 0, 'performance_vs_leader': 'leading'
+        }
+        assert performances["UC_c"] == {
+            'relative_percentage': 50.0, 'gap_to_leader': 1000, 'performance_vs_leader': 'following'
+        }
+        assert performances["UC_a"]['relative_percentage'] == 25.0
+
+    def test_zero_leader(self, growth_tracker):
+        """Test channels level with a zero-valued leader are all leading at 100%"""
+        result = self._compare(growth_tracker, {"UC_a": 0, "UC_b": 0})
+
+        assert [data['relative_performance'] for data in result['rankings']] == [
+            {'relative_percentage': 100.0, 'gap_to_leader': 0, 'performance_vs_leader': 'leading'}
+        ] * 2
+
+    def test_leader_matches_first_ranking(self, growth_tracker):
+        """Test the reported leader is the serialized first ranking entry"""
+        result = self._compare(growth_tracker, {"UC_a": 500, "UC_b": 2000})
+
+        assert result['leader'] == result['rankings'][0]
+        assert isinstance(result['leader']['relative_performance'], dict)
+
+
+class TestComparisonInsights:
+    """Test comparison insight generation"""
+
+    @pytest.fixture
+    def growth_tracker(self):
+        """Create growth tracker instance"""
+        return GrowthTracker()
+
+    def test_single_channel(self, growth_tracker):
+        """Test comparisons of one channel explain why there are no insights"""
+        assert growth_tracker._generate_comparison_insights([{}], 'subscribers') == [
+            "Need at least 2 channels for meaningful comparison"
+        ]
+
+    def test_insights_returned_as_fresh_list(self, growth_tracker):
+        """Test memoized insights are handed out as independent lists"""
+        async def run():
+            channel_ids = ["UC_a", "UC_b"]
+            await growth_tracker._initialize_channels(channel_ids)
+            return await growth_tracker.compare_channels(channel_ids)
+
+        comparison = asyncio.run(run())
+        first = growth_tracker._generate_comparison_insights(comparison['rankings'], 'subscribers')
+        first.clear()
+        second = growth_tracker._generate_comparison_insights(comparison['rankings'], 'subscribers')
+
+        assert second == comparison['insights']
+        assert len(second) >= 3
@@ -0,0 +1,334 @@
+"""
+Unit tests for niche intelligence caching and market research storage
+"""
+
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+
+import aiosqlite
+import pytest
+
+from modules.niche_intelligence import market_researcher as market_researcher_module
+from modules.niche_intelligence.market_researcher import MarketResearchEngine
+from modules.niche_intelligence.niche_analyzer import NicheIntelligenceEngine
+
+
+class TestNicheAnalysisCache:
+    """Test niche analysis caching and research-commit invalidation"""
+
+    @pytest.fixture
+    def market_researcher(self):
+        """Create market researcher that counts trend analyses"""
+        researcher = MarketResearchEngine()
+        researcher.analyses = 0
+
+        async def analyze_market_trends(niche_id):
+            researcher.analyses += 1
+            return {"niche_id": niche_id, "run": researcher.analyses}
+
+        researcher.analyze_market_trends = analyze_market_trends
+        return researcher
+
+    @pytest.fixture
+    def niche_engine(self, market_researcher):
+        """Create niche intelligence engine subscribed to the researcher"""
+        engine = NicheIntelligenceEngine()
+        engine.market_researcher = market_researcher
+        market_researcher.subscribe_research_events(engine._on_research_event)
+        return engine
+
+    def test_analysis_cached(self, niche_engine, market_researcher):
+        """Test repeated analyses of a niche are served from cache"""
+        async def run():
+            await niche_engine.analyze_niche("niche_1")
+            return await niche_engine.analyze_niche("niche_1")
+
+        result = asyncio.run(run())
+
+        assert result["analysis"]["run"] == 1
+        assert market_researcher.analyses == 1
+
+    def test_research_commit_invalidates_niche(self, niche_engine, market_researcher):
+        """Test committed research drops only the matching niche's analysis"""
+        async def run():
+            await niche_engine.analyze_niche("niche_1")
+            await niche_engine.analyze_niche("niche_2")
+            market_researcher._publish_research_event("research", "niche_1")
+            return (
+                await niche_engine.analyze_niche("niche_1"),
+                await niche_engine.analyze_niche("niche_2")
+            )
+
+        first, second = asyncio.run(run())
+
+        assert first["analysis"]["run"] == 3
+        assert second["analysis"]["run"] == 2
+
+    def test_cached_analysis_is_copied(self, niche_engine, market_researcher):
+        """Test callers mutating a result do not corrupt the cached analysis"""
+        async def run():
+            first = await niche_engine.analyze_niche("niche_1")
+            first["analysis"]["run"] = 99
+            first["analysis"]["extra"] = True
+            return await niche_engine.analyze_niche("niche_1")
+
+        second = asyncio.run(run())
+
+        assert second["analysis"] == {"niche_id": "niche_1", "run": 1}
+        assert market_researcher.analyses == 1
+
+    def test_keyword_niche_id_invalidated(self, niche_engine, market_researcher):
+        """Test analyses requested by niche_id are dropped by that niche's research events"""
+        async def run():
+            await niche_engine.analyze_niche(niche_id="niche_1")
+            market_researcher._publish_research_event("research", "niche_1")
+            return await niche_engine.analyze_niche(niche_id="niche_1")
+
+        assert asyncio.run(run())["analysis"]["run"] == 2
+
+    def test_expired_analysis_recomputed(self, niche_engine, market_researcher):
+        """Test analyses older than the cache TTL are recomputed"""
+        niche_engine.cache_ttl = 0
+
+        async def run():
+            await niche_engine.analyze_niche("niche_1")
+            return await niche_engine.analyze_niche("niche_1")
+
+        assert asyncio.run(run())["analysis"]["run"] == 2
+
+    def test_cleanup_unsubscribes(self, niche_engine, market_researcher):
+        """Test cleanup stops research events reaching the engine"""
+        asyncio.run(niche_engine.cleanup())
+
+        assert market_researcher._research_subscribers == []
+
+    def test_failing_subscriber_isolated(self, niche_engine, market_researcher):
+        """Test one failing subscriber does not stop the others"""
+        def failing_subscriber(topic, niche_id):
+            raise RuntimeError("subscriber failed")
+
+        market_researcher._research_subscribers.insert(0, failing_subscriber)
+        niche_engine.trend_cache["niche_1"] = (0.0, {})
+
+        market_researcher._publish_research_event("research", "niche_1")
+
+        assert "niche_1" not in niche_engine.trend_cache
+
+
+MARKET_RESEARCH_SCHEMA = """
+    CREATE TABLE market_research_data (
+        id TEXT PRIMARY KEY, niche_id TEXT, research_type TEXT, data_source TEXT,
+        research_date TEXT, market_size_data TEXT, audience_demographics TEXT,
+        behavior_patterns TEXT, content_preferences TEXT, monetization_data TEXT,
+        growth_trends TEXT, competitive_landscape_snapshot TEXT, recommendations TEXT,
+        confidence_score REAL, data_quality_score REAL
+    )
+"""
+
+
+def make_report(research_id, niche_id, market_size, research_date="2026-01-01T00:00:00"):
+    """Build a minimal research report"""
+    return {
+        "research_id": research_id,
+        "niche_id": niche_id,
+        "research_date": research_date,
+        "market_size_analysis": {"size": market_size},
+        "audience_analysis": {"age": "18-34", "behavioral_patterns": {"binge": True}},
+        "content_analysis": {"format": "shorts"},
+        "monetization_analysis": {},
+        "growth_analysis": {"trend": "up"},
+        "competitive_analysis": {},
+        "strategic_recommendations": ["post daily"],
+        "metadata": {"research_quality_score": 0.9}
+    }
+
+
+class TestResearchBlobStore:
+    """Test content-addressed research storage"""
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        """Create a research database with the market research schema"""
+        path = str(tmp_path / "research.db")
+
+        async def create():
+            async with aiosqlite.connect(path) as db:
+                await db.execute(MARKET_RESEARCH_SCHEMA)
+                await db.commit()
+
+        asyncio.run(create())
+        return path
+
+    def make_researcher(self, db_path):
+        """Create market researcher writing to the test database"""
+        researcher = MarketResearchEngine()
+        researcher.db_ext = SimpleNamespace(db_path=db_path)
+        researcher.use_rapsqlite = False
+        return researcher
+
+    def count_blobs(self, db_path):
+        """Count stored blobs"""
+        async def count():
+            async with aiosqlite.connect(db_path) as db:
+                async with db.execute("SELECT COUNT(*) FROM blob_store") as cursor:
+                    return (await cursor.fetchone())[0]
+
+        return asyncio.run(count())
+
+    def test_round_trip(self, db_path):
+        """Test saved reports load back unchanged, with shared columns stored once"""
+        writer = self.make_researcher(db_path)
+        first = make_report("r1", "niche_1", 100)
+        second = make_report("r2", "niche_2", 200)
+
+        async def save():
+            await writer._ensure_blob_store()
+            return [await writer._save_research_to_database(report) for report in (first, second)]
+
+        assert asyncio.run(save()) == [True, True]
+
+        reader = self.make_researcher(db_path)
+        asyncio.run(reader._load_research_cache())
+
+        assert reader.research_cache == {"niche_1": first, "niche_2": second}
+        # Seven distinct payloads per report (empty dicts dedupe), only market size differs
+        assert self.count_blobs(db_path) == 8
+
+    def test_load_beyond_bound_variable_limit(self, db_path, monkeypatch):
+        """Test loading more blob references than SQLite can bind in one statement"""
+        rows = 2000
+        connect = sqlite3.connect
+
+        def limited_connect(*args, **kwargs):
+            connection = connect(*args, **kwargs)
+            connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+            return connection
+
+        monkeypatch.setattr(sqlite3, "connect", limited_connect)
+        writer = self.make_researcher(db_path)
+
+        async def populate():
+            await writer._ensure_blob_store()
+            async with aiosqlite.connect(db_path) as db:
+                await db.executemany(
+                    "INSERT INTO blob_store (sha256, payload) VALUES (?, ?)",
+                    [(f"{index:064x}", f'{{"size": {index}}}') for index in range(rows)]
+                )
+                await db.executemany(
+                    "INSERT INTO market_research_data (id, niche_id, research_date, market_size_data) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(f"r{index}", f"niche_{index}", "2026-01-01", f"sha256:{index:064x}")
+                     for index in range(rows)]
+                )
+                await db.commit()
+
+        asyncio.run(populate())
+
+        reader = self.make_researcher(db_path)
+        asyncio.run(reader._load_research_cache())
+
+        assert len(reader.research_cache) == rows
+        assert reader.research_cache["niche_1999"]["market_size_analysis"] == {"size": 1999}
+        assert reader._cache_watermark == "2026-01-01"
+
+    def test_load_inline_json_columns(self, db_path):
+        """Test rows written before blob storage still load their inline JSON"""
+        async def populate():
+            await self.make_researcher(db_path)._ensure_blob_store()
+            async with aiosqlite.connect(db_path) as db:
+                await db.execute(
+                    "INSERT INTO market_research_data (id, niche_id, research_date, market_size_data) "
+                    "VALUES ('r1', 'niche_1', '2026-01-01', '{\"size\": 5}')"
+                )
+                await db.commit()
+
+        asyncio.run(populate())
+
+        reader = self.make_researcher(db_path)
+        asyncio.run(reader._load_research_cache())
+
+        assert reader.research_cache["niche_1"]["market_size_analysis"] == {"size": 5}
+        assert reader.research_cache["niche_1"]["strategic_recommendations"] == []
+
+    def test_replaced_report_blobs_pruned(self, db_path):
+        """Test blobs only referenced by a replaced report are pruned on setup"""
+        researcher = self.make_researcher(db_path)
+
+        async def save():
+            await researcher._ensure_blob_store()
+            await researcher._save_research_to_database(make_report("r1", "niche_1", 100))
+            await researcher._save_research_to_database(make_report("r1", "niche_1", 200))
+
+        asyncio.run(save())
+        assert self.count_blobs(db_path) == 8
+
+        asyncio.run(self.make_researcher(db_path)._ensure_blob_store())
+        assert self.count_blobs(db_path) == 7
+
+    def test_only_large_reports_use_executor(self, db_path, monkeypatch):
+        """Test reports are serialized inline unless estimated above the size threshold"""
+        researcher = self.make_researcher(db_path)
+        offloaded = []
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            run_in_executor = loop.run_in_executor
+
+            def counting_run_in_executor(executor, func, *args):
+                offloaded.append(args[0]["research_id"])
+                return run_in_executor(executor, func, *args)
+
+            monkeypatch.setattr(loop, "run_in_executor", counting_run_in_executor)
+            await researcher._ensure_blob_store()
+            large = make_report("r2", "niche_2", 200)
+            large["content_analysis"] = {"notes": "x" * researcher.executor_serialize_threshold}
+            return [
+                await researcher._save_research_to_database(report)
+                for report in (make_report("r1", "niche_1", 100), large)
+            ]
+
+        assert asyncio.run(run()) == [True, True]
+        assert offloaded == ["r2"]
+
+    def test_incomplete_rapsqlite_falls_back(self, db_path, monkeypatch):
+        """Test a rapsqlite connection without the async writer API falls back to aiosqlite"""
+        class LimitedConnection:
+            def __init__(self, path):
+                self.path = path
+
+            async def execute(self, sql, parameters=()):
+                raise AssertionError("rapsqlite should not be used")
+
+        monkeypatch.setattr(market_researcher_module, "RapSQLiteConnection", LimitedConnection, raising=False)
+        researcher = self.make_researcher(db_path)
+        researcher.use_rapsqlite = True
+
+        async def save():
+            await researcher._ensure_blob_store()
+            return await researcher._save_research_to_database(make_report("r1", "niche_1", 100))
+
+        assert asyncio.run(save()) is True
+        assert researcher.use_rapsqlite is False
+        assert self.count_blobs(db_path) == 7
+
+    def test_tuning_attempted_once(self, tmp_path, monkeypatch):
+        """Test failed storage tuning is not retried on every init"""
+        researcher = self.make_researcher(str(tmp_path / "missing_schema.db"))
+        attempts = []
+        connect = aiosqlite.connect
+
+        def counting_connect(*args, **kwargs):
+            attempts.append(args[0])
+            return connect(*args, **kwargs)
+
+        monkeypatch.setattr(aiosqlite, "connect", counting_connect)
+
+        async def run():
+            # market_research_data does not exist, so the index creation fails
+            await researcher._tune_research_storage()
+            await researcher._tune_research_storage()
+
+        asyncio.run(run())
+
+        assert len(attempts) == 1
@@ -0,0 +1,359 @@
+"""
+Unit tests for OBS scene controller scene switching and overlay management
+"""
+
+import asyncio
+import dataclasses
+import json
+import time
+
+import pytest
+
+from modules.obs_integration.scene_controller import Scene, SceneController, SceneItem, SceneTransition
+
+
+class TestViewerCountSwitching:
+    """Test viewer-count auto-switch rule lookups"""
+
+    @pytest.fixture
+    def scene_controller(self):
+        """Create scene controller without an OBS connection"""
+        return SceneController()
+
+    def test_default_low_and_high_rules(self, scene_controller):
+        """Test low_viewers applies below its threshold and high_viewers at or above"""
+        scenes = [scene_controller.scene_for_viewer_count(count) for count in (1, 4, 5, 50, 100, 500)]
+
+        assert scenes == [
+            "waiting_for_viewers", "waiting_for_viewers", None, None,
+            "main_with_chat", "main_with_chat"
+        ]
+
+    def test_single_high_rule(self, scene_controller):
+        """Test a lone "at or above" rule never applies below its threshold"""
+        scene_controller.set_auto_switch_rules({
+            "viewer_count_threshold": {
+                "high_viewers": {"threshold": 100, "scene": "main_with_chat"}
+            }
+        })
+
+        scenes = [scene_controller.scene_for_viewer_count(count) for count in (1, 50, 100, 500)]
+
+        assert scenes == [None, None, "main_with_chat", "main_with_chat"]
+
+    def test_single_low_rule(self, scene_controller):
+        """Test a lone low_viewers rule only applies below its threshold"""
+        scene_controller.set_auto_switch_rules({
+            "viewer_count_threshold": {
+                "low_viewers": {"threshold": 5, "scene": "waiting_for_viewers"}
+            }
+        })
+
+        scenes = [scene_controller.scene_for_viewer_count(count) for count in (0, 4, 5, 500)]
+
+        assert scenes == ["waiting_for_viewers", "waiting_for_viewers", None, None]
+
+    def test_two_above_rules(self, scene_controller):
+        """Test the highest reached threshold wins when every rule is "at or above\""""
+        scene_controller.set_auto_switch_rules({
+            "viewer_count_threshold": {
+                "medium_viewers": {"threshold": 10, "scene": "main"},
+                "high_viewers": {"threshold": 100, "scene": "main_with_chat"}
+            }
+        })
+
+        scenes = [scene_controller.scene_for_viewer_count(count) for count in (1, 10, 99, 100)]
+
+        assert scenes == [None, "main", "main", "main_with_chat"]
+
+    def test_explicit_direction(self, scene_controller):
+        """Test an explicit direction overrides the rule-name default"""
+        scene_controller.set_auto_switch_rules({
+            "viewer_count_threshold": {
+                "quiet": {"threshold": 20, "scene": "break", "direction": "below"},
+                "low_viewers": {"threshold": 50, "scene": "main", "direction": "above"}
+            }
+        })
+
+        scenes = [scene_controller.scene_for_viewer_count(count) for count in (5, 20, 49, 50)]
+
+        assert scenes == ["break", None, None, "main"]
+
+    def test_invalid_direction(self, scene_controller):
+        """Test unknown rule directions are rejected"""
+        with pytest.raises(ValueError):
+            scene_controller.set_auto_switch_rules({
+                "viewer_count_threshold": {
+                    "high_viewers": {"threshold": 100, "scene": "main", "direction": "sideways"}
+                }
+            })
+
+
+class FakeLivestreamManager:
+    """Record OBS requests, optionally failing every send"""
+
+    def __init__(self):
+        self.sent = []
+        self.fail = False
+
+    async def _send_obs_request(self, request_type, request_data):
+        if self.fail:
+            raise ConnectionError("OBS unavailable")
+        self.sent.append((request_type, request_data))
+
+
+class TestOverlayWriteFailures:
+    """Test OBS write failures reach the periodic overlay updater"""
+
+    @pytest.fixture
+    def livestream_manager(self):
+        """Create a fake livestream manager"""
+        return FakeLivestreamManager()
+
+    @pytest.fixture
+    def scene_controller(self, livestream_manager):
+        """Create scene controller with a single periodic text overlay"""
+        controller = SceneController(livestream_manager)
+        controller.overlay_write_debounce = 0
+        controller.obs_write_retry_delay = 0.01
+        controller.overlay_elements.clear()
+        controller._register_overlay(controller._build_overlay("ticker", {
+            "type": "text", "source_name": "Ticker", "update_frequency": 10
+        }))
+        counter = iter(range(1000))
+
+        async def generate():
+            return f"tick {next(counter)}"
+
+        controller._content_generators["ticker"] = generate
+        return controller
+
+    def test_write_failure_backs_off(self, scene_controller, livestream_manager):
+        """Test a failed OBS write counts as an update failure"""
+        async def run():
+            livestream_manager.fail = True
+            await scene_controller._run_overlay_update("ticker")
+            failures = dict(scene_controller._overlay_failures)
+            await scene_controller.cleanup()
+            return failures
+
+        assert asyncio.run(run()) == {"ticker": 1}
+
+    def test_write_success_resets_failures(self, scene_controller, livestream_manager):
+        """Test a successful OBS write clears the failure count"""
+        async def run():
+            scene_controller._overlay_failures["ticker"] = 3
+            await scene_controller._run_overlay_update("ticker")
+            failures = dict(scene_controller._overlay_failures)
+            await scene_controller.cleanup()
+            return failures
+
+        assert asyncio.run(run()) == {}
+        assert livestream_manager.sent == [
+            ("SetInputSettings", {"inputName": "Ticker", "inputSettings": {"text": "tick 0"}})
+        ]
+
+    def test_unchanged_content_skipped(self, scene_controller, livestream_manager):
+        """Test content OBS already shows is not written again"""
+        async def run():
+            first = await scene_controller.update_overlay_content("ticker", "hello")
+            second = await scene_controller.update_overlay_content("ticker", "hello")
+            await scene_controller.cleanup()
+            return first, second
+
+        assert asyncio.run(run()) == (True, True)
+        assert len(livestream_manager.sent) == 1
+
+    def test_force_repushes_unchanged_content(self, scene_controller, livestream_manager):
+        """Test force writes content even when OBS already shows it"""
+        async def run():
+            await scene_controller.update_overlay_content("ticker", "hello")
+            await scene_controller.update_overlay_content("ticker", "hello", force=True)
+            await scene_controller.cleanup()
+
+        asyncio.run(run())
+        assert len(livestream_manager.sent) == 2
+
+    def test_failed_write_not_remembered(self, scene_controller, livestream_manager):
+        """Test the same content is retried after a failed write"""
+        async def run():
+            livestream_manager.fail = True
+            failed = await scene_controller.update_overlay_content("ticker", "hello")
+            livestream_manager.fail = False
+            retried = await scene_controller.update_overlay_content("ticker", "hello")
+            await scene_controller.cleanup()
+            return failed, retried
+
+        assert asyncio.run(run()) == (False, True)
+        assert livestream_manager.sent[-1][1]["inputSettings"] == {"text": "hello"}
+
+    def test_failed_write_dropped_after_retries(self, scene_controller, livestream_manager):
+        """Test a write that exhausts its retries is never sent later"""
+        attempts = []
+        send_request = livestream_manager._send_obs_request
+
+        async def counting_send(request_type, request_data):
+            attempts.append(request_type)
+            await send_request(request_type, request_data)
+
+        livestream_manager._send_obs_request = counting_send
+
+        async def run():
+            livestream_manager.fail = True
+            failed = await scene_controller.update_overlay_content("ticker", "hello")
+            livestream_manager.fail = False
+            await scene_controller._set_transition(SceneTransition.CUT, 750)
+            await scene_controller.cleanup()
+            return failed
+
+        assert asyncio.run(run()) is False
+        assert len(attempts) == 1 + scene_controller.obs_write_max_retries + 2
+        assert [request_type for request_type, _ in livestream_manager.sent] == [
+            "SetCurrentSceneTransition", "SetCurrentSceneTransitionDuration"
+        ]
+
+    def test_scene_writes_coalesce_with_queued_writes(self, scene_controller, livestream_manager):
+        """Test scene configuration shares the writer queue, so it supersedes a queued visibility write"""
+        scene = Scene(name="main", items=[SceneItem(name="ticker", source_name="Ticker")])
+        scene.pack_items()
+        scene._item_ids[0] = 7
+
+        async def run():
+            await scene_controller._enqueue_obs_write("SetSceneItemEnabled", {
+                "sceneName": "main", "sceneItemId": 7, "sceneItemEnabled": False
+            })
+            await scene_controller._apply_scene_configuration(scene)
+            await scene_controller.cleanup()
+
+        asyncio.run(run())
+        assert livestream_manager.sent == [
+            ("SetSceneItemEnabled", {"sceneName": "main", "sceneItemId": 7, "sceneItemEnabled": True})
+        ]
+
+    def test_resync_after_scene_collection_change(self, scene_controller, livestream_manager):
+        """Test a scene collection change forgets what OBS shows and resync re-pushes it"""
+        async def run():
+            await scene_controller.update_overlay_content("ticker", "hello")
+            await scene_controller.handle_obs_event("CurrentSceneCollectionChanged")
+            await scene_controller.update_overlay_content("ticker", "hello")
+            await scene_controller.resync_overlays()
+            await scene_controller.cleanup()
+
+        asyncio.run(run())
+        assert len(livestream_manager.sent) == 3
+
+
+class RawFrameLivestreamManager(FakeLivestreamManager):
+    """Fake livestream manager that also accepts pre-serialized websocket frames"""
+
+    def __init__(self):
+        super().__init__()
+        self.frames = []
+
+    async def _send_obs_raw(self, frame):
+        self.frames.append(json.loads(frame))
+
+
+class TestTransitionFrames:
+    """Test pre-serialized transition requests"""
+
+    def test_frames_follow_transition_changes(self):
+        """Test raw frames carry fresh request IDs and the requested transition settings"""
+        livestream_manager = RawFrameLivestreamManager()
+        scene_controller = SceneController(livestream_manager)
+
+        async def run():
+            await scene_controller._set_transition(SceneTransition.FADE, 300)
+            await scene_controller._set_transition(SceneTransition.CUT, 750)
+            await scene_controller.cleanup()
+
+        asyncio.run(run())
+
+        frames = [frame["d"] for frame in livestream_manager.frames]
+        assert [frame["requestData"] for frame in frames] == [
+            {"transitionName": "Fade"}, {"transitionDuration": 300},
+            {"transitionName": "Cut"}, {"transitionDuration": 750}
+        ]
+        assert len({frame["requestId"] for frame in frames}) == 4
+        assert livestream_manager.sent == []
+
+    def test_request_api_fallback(self):
+        """Test managers without raw sends get regular requests"""
+        livestream_manager = FakeLivestreamManager()
+        scene_controller = SceneController(livestream_manager)
+
+        async def run():
+            await scene_controller._set_transition(SceneTransition.CUT, 750)
+            await scene_controller.cleanup()
+
+        asyncio.run(run())
+
+        assert livestream_manager.sent == [
+            ("SetCurrentSceneTransition", {"transitionName": "Cut"}),
+            ("SetCurrentSceneTransitionDuration", {"transitionDuration": 750})
+        ]
+
+    def test_failed_raw_frame_falls_back(self):
+        """Test a failed raw send is retried through the regular request API"""
+        livestream_manager = RawFrameLivestreamManager()
+        scene_controller = SceneController(livestream_manager)
+
+        async def failing_raw(frame):
+            raise ConnectionError("raw send unavailable")
+
+        livestream_manager._send_obs_raw = failing_raw
+
+        async def run():
+            await scene_controller._set_transition(SceneTransition.CUT, 750)
+            await scene_controller.cleanup()
+
+        asyncio.run(run())
+
+        assert [request_type for request_type, _ in livestream_manager.sent] == [
+            "SetCurrentSceneTransition", "SetCurrentSceneTransitionDuration"
+        ]
+
+
+class TestSceneItems:
+    """Test scene item immutability keeps derived scene state consistent"""
+
+    def test_scene_item_is_immutable(self):
+        """Test scene items reject mutation, so cached dicts and arrays stay valid"""
+        item = SceneItem(name="webcam", source_name="Webcam", position=(10, 20))
+        assert item.as_dict()["position"] == (10, 20)
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            item.position = (30, 40)
+
+    def test_scene_item_is_hashable(self):
+        """Test scene items can be hashed and used as dict keys"""
+        item = SceneItem(name="webcam", source_name="Webcam", crop=(("left", 10),), filters=("blur",))
+        same = SceneItem(name="webcam", source_name="Webcam", crop=(("left", 10),), filters=("blur",))
+
+        assert hash(item) == hash(same)
+        assert {item: "webcam"}[same] == "webcam"
+
+    def test_pack_items_freezes_item_list(self):
+        """Test registered scenes hold an item tuple matching their parallel arrays"""
+        scene = Scene(name="main", items=[
+            SceneItem(name="webcam", source_name="Webcam", position=(10, 20), rotation=5)
+        ])
+        scene.pack_items()
+
+        assert isinstance(scene.items, tuple)
+        assert list(scene._positions) == [10, 20]
+        assert list(scene._rotations) == [5]
+
+
+class TestSceneHistory:
+    """Test scene history reporting"""
+
+    def test_history_returns_last_ten_in_order(self):
+        """Test only the ten most recent switches are reported, oldest first"""
+        scene_controller = SceneController()
+        for index in range(25):
+            scene_controller.scene_history.append((f"scene_{index}", time.monotonic()))
+
+        history = scene_controller.get_scene_history()
+
+        assert [entry["scene"] for entry in history] == [f"scene_{index}" for index in range(15, 25)]
@@ -0,0 +1,109 @@
+"""
+Unit tests for the shared stock content integrator
+"""
+
+import asyncio
+import json
+import logging
+
+import pytest
+
+from modules.stock_content.integrator import StockContentIntegrator
+
+
+class TestSharedInstance:
+    """Test the per-event-loop shared integrator"""
+
+    @pytest.fixture(autouse=True)
+    def reset_shared_instance(self, tmp_path, monkeypatch):
+        """Run in a scratch directory with no shared instance"""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(StockContentIntegrator, "_instance", None)
+        monkeypatch.setattr(StockContentIntegrator, "_instance_loop", None)
+        monkeypatch.setattr(StockContentIntegrator, "_instance_lock", None)
+
+    async def get_shared(self):
+        """Request the shared instance concurrently, then clean it up"""
+        first, second = await asyncio.gather(
+            StockContentIntegrator.instance(), StockContentIntegrator.instance()
+        )
+        await first.cleanup()
+        return first, second
+
+    def test_concurrent_callers_share_instance(self):
+        """Test racing callers in one loop get the same integrator"""
+        first, second = asyncio.run(self.get_shared())
+
+        assert first is second
+
+    def test_new_instance_per_event_loop(self):
+        """Test a new event loop gets its own integrator and lock"""
+        first, _ = asyncio.run(self.get_shared())
+        second, _ = asyncio.run(self.get_shared())
+
+        assert first is not second
+
+    def test_stale_session_reported_on_new_loop(self, caplog):
+        """Test an instance left open by a closed loop is reported when a new loop rebinds"""
+        async def leak():
+            integrator = await StockContentIntegrator.instance()
+            await integrator._get_session()
+            return integrator
+
+        leaked = asyncio.run(leak())
+        with caplog.at_level(logging.WARNING):
+            second, _ = asyncio.run(self.get_shared())
+
+        assert second is not leaked
+        assert "not cleaned up" in caplog.text
+
+
+class TestCacheManifest:
+    """Test persistence of the download dedup manifest"""
+
+    @pytest.fixture
+    def integrator(self, tmp_path, monkeypatch):
+        """Create integrator writing its manifest into a temporary directory"""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "assets" / "stock_cache").mkdir(parents=True)
+        integrator = StockContentIntegrator()
+        integrator.cache_manifest_flush_delay = 0
+        return integrator
+
+    def test_downloads_coalesced_into_one_write(self, integrator, tmp_path):
+        """Test a burst of manifest saves produces a single atomic write"""
+        writes = []
+        write_cache_manifest = integrator._write_cache_manifest
+
+        async def counting_write():
+            writes.append(dict(integrator._url_index))
+            await write_cache_manifest()
+
+        integrator._write_cache_manifest = counting_write
+
+        async def run():
+            for index in range(3):
+                integrator._url_index[f"url_{index}"] = f"file_{index}"
+                integrator._save_cache_manifest()
+            await integrator._cache_manifest_flush
+
+        asyncio.run(run())
+
+        manifest_dir = tmp_path / "assets" / "stock_cache"
+        assert len(writes) == 1
+        assert json.loads((manifest_dir / "manifest.json").read_text())["urls"] == writes[0]
+        assert [path.name for path in manifest_dir.iterdir()] == ["manifest.json"]
+
+    def test_cleanup_writes_pending_manifest(self, integrator, tmp_path):
+        """Test cleanup persists a manifest change still waiting for its flush"""
+        integrator.cache_manifest_flush_delay = 60
+
+        async def run():
+            integrator._url_index["url"] = "file"
+            integrator._save_cache_manifest()
+            await integrator.cleanup()
+
+        asyncio.run(run())
+
+        manifest = json.loads((tmp_path / "assets" / "stock_cache" / "manifest.json").read_text())
+        assert manifest["urls"] == {"url": "file"}
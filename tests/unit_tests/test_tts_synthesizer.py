@@ -0,0 +1,132 @@
+"""
+Unit tests for TTS synthesis caching
+"""
+
+import asyncio
+import wave
+
+import pytest
+
+from modules.tts import synthesizer as synthesizer_module
+from modules.tts.synthesizer import TTSProvider, TTSSynthesizer
+
+
+def write_wav(path, frames=b"\x00\x00" * 100):
+    """Write a short silent mono WAV file"""
+    with wave.open(path, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(16000)
+        wav_file.writeframes(frames)
+
+
+class TestSynthesisCache:
+    """Test memory and disk caching of synthesized audio"""
+
+    @pytest.fixture
+    def tts_synthesizer(self, tmp_path, monkeypatch):
+        """Create synthesizer writing into a temporary directory"""
+        monkeypatch.chdir(tmp_path)
+        return TTSSynthesizer()
+
+    def cache_files(self, tts_synthesizer):
+        """Names of content-addressed cache files on disk"""
+        return [
+            path.name for path in tts_synthesizer.output_dir.iterdir()
+            if synthesizer_module._CACHE_FILE_RE.match(path.name)
+        ]
+
+    def test_real_audio_cached(self, tts_synthesizer):
+        """Test synthesized speech is reused from the memory and disk tiers"""
+        calls = []
+
+        async def synthesize_system(text, voice, output_path):
+            calls.append(text)
+            write_wav(output_path)
+            return False
+
+        tts_synthesizer._synthesize_system = synthesize_system
+
+        async def run():
+            first = await tts_synthesizer.synthesize("hello")
+            tts_synthesizer.clear_cache("hot")
+            second = await tts_synthesizer.synthesize("hello")
+            third = await tts_synthesizer.synthesize("hello")
+            return first, second, third
+
+        first, second, third = asyncio.run(run())
+
+        assert calls == ["hello"]
+        assert first == second == third
+        assert len(self.cache_files(tts_synthesizer)) == 1
+
+    def test_placeholder_audio_not_cached(self, tts_synthesizer, monkeypatch):
+        """Test mock fallback audio never enters either cache tier"""
+        monkeypatch.setattr(synthesizer_module, "_get_espeak_library", lambda: None)
+
+        async def missing_espeak(*args, **kwargs):
+            raise FileNotFoundError("espeak")
+
+        monkeypatch.setattr(asyncio, "create_subprocess_exec", missing_espeak)
+
+        async def run():
+            return [await tts_synthesizer.synthesize("hello") for _ in range(2)]
+
+        paths = asyncio.run(run())
+
+        assert all("placeholder_" in path for path in paths)
+        assert tts_synthesizer._mem_cache == {}
+        assert self.cache_files(tts_synthesizer) == []
+
+    def test_placeholder_written_to_requested_path(self, tts_synthesizer, tmp_path):
+        """Test placeholder audio still reaches a caller-named output file"""
+        output_path = str(tmp_path / "intro.wav")
+
+        async def run():
+            return await tts_synthesizer.synthesize(
+                "hello", provider=TTSProvider.GOOGLE, output_path=output_path
+            )
+
+        assert asyncio.run(run()) == output_path
+        with wave.open(output_path, "rb") as wav_file:
+            assert wav_file.getnframes() > 0
+        assert self.cache_files(tts_synthesizer) == []
+
+
+class TestProviderThrottling:
+    """Test provider concurrency limits and rate limiting"""
+
+    @pytest.fixture
+    def tts_synthesizer(self, tmp_path, monkeypatch):
+        """Create synthesizer with an ElevenLabs key and no rate limit delay"""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("ELEVENLABS_API_KEY", "test-key")
+        synthesizer = TTSSynthesizer()
+        synthesizer._provider_buckets[TTSProvider.ELEVENLABS]["rate"] = 1000.0
+
+        async def synthesize_elevenlabs(text, voice, output_path):
+            # Hold the provider semaphore long enough for requests to queue on it
+            await asyncio.sleep(0.01)
+            write_wav(output_path)
+            return False
+
+        synthesizer._synthesize_elevenlabs = synthesize_elevenlabs
+        return synthesizer
+
+    def test_usable_from_several_event_loops(self, tts_synthesizer):
+        """Test contended semaphores are rebuilt for each event loop"""
+        async def run(batch):
+            return await asyncio.gather(*(
+                tts_synthesizer.synthesize(f"line {batch}-{index}", provider=TTSProvider.ELEVENLABS)
+                for index in range(4)
+            ))
+
+        assert len(asyncio.run(run(1))) == 4
+        assert len(asyncio.run(run(2))) == 4
+
+    def test_limits_are_per_instance(self, tts_synthesizer):
+        """Test synthesizers do not share throttling state"""
+        other = TTSSynthesizer()
+
+        assert other._provider_buckets is not tts_synthesizer._provider_buckets
+        assert other._provider_buckets[TTSProvider.ELEVENLABS]["rate"] == 2.0